@@ -13,16 +13,29 @@ __all__ = (
     "I18nInvalidFormat",
 
     "t",
+    "get_translator",
+    "compile_key",
+    "at",
+    "aload_everything",
+    "ensure_loaded",
+    "start_preload",
+    "warm_from_manifest",
+    "write_manifest",
     "add_translation",
     "add_function",
+    "stats",
+    "reset_stats",
 
     "set",
     "get",
+    "locale_scope",
+    "bind_locale",
+    "reset_locale",
 
     "load_path",
 )
 
-from typing import List
+from typing import Any, List, TYPE_CHECKING
 
 from .resource_loader import (
     Loader,
@@ -39,13 +52,43 @@ from .errors import (
     I18nInvalidStaticRef,
     I18nInvalidFormat,
 )
-from .translator import t
+from .translator import t, get_translator, compile_key
 from .translations import add as add_translation
 from .custom_functions import add_function
-from .config import set, get
+from .config import set, get, locale_scope, bind_locale, reset_locale
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .aio import at, aload_everything, ensure_loaded
+    from .metrics import stats, reset_stats
+    from .preload import start_preload
+    from .manifest import warm_from_manifest, write_manifest
 
 init_default_loaders()
 
 load_path: List[str] = get("load_path")
 
-del List
+
+# modules of optional features, they're imported only when needed
+_LAZY = {
+    "at": "aio",
+    "aload_everything": "aio",
+    "ensure_loaded": "aio",
+    "stats": "metrics",
+    "reset_stats": "metrics",
+    "start_preload": "preload",
+    "warm_from_manifest": "manifest",
+    "write_manifest": "manifest",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        from importlib import import_module
+
+        value = getattr(import_module("." + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+del List, TYPE_CHECKING
@@ -0,0 +1,57 @@
+"""
+Command line tools
+
+Usage: `python -m i18n extract PATH [PATH ...] [--output FILE] [--function NAME]`
+"""
+
+import sys
+from argparse import ArgumentParser
+from typing import List, Optional
+
+from .extract import FUNCTIONS, extract_keys
+
+
+def extract(paths: List[str], output: str, functions: List[str]) -> None:
+    manifest = extract_keys(paths, FUNCTIONS + tuple(functions))
+    manifest.save(output)
+    print(
+        "{} keys, {} prefixes and {} dynamic keys saved to {}".format(
+            len(manifest.keys),
+            len(manifest.prefixes),
+            len(manifest.dynamic),
+            output,
+        ),
+    )
+    for location in manifest.dynamic:
+        print("dynamic key:", location)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m i18n", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    extract_parser = commands.add_parser(
+        "extract",
+        help="find translation keys in Python files and save them to manifest",
+    )
+    extract_parser.add_argument("paths", nargs="+", help="files and directories to scan")
+    extract_parser.add_argument(
+        "-o",
+        "--output",
+        default="i18n_keys.json",
+        help="manifest file (default: i18n_keys.json)",
+    )
+    extract_parser.add_argument(
+        "-f",
+        "--function",
+        action="append",
+        default=[],
+        help="additional name of translation function, can be repeated",
+    )
+    options = parser.parse_args(args)
+
+    extract(options.paths, options.output, options.function)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
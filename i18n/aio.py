@@ -0,0 +1,138 @@
+__all__ = ("aload_everything", "ensure_loaded", "at")
+
+import asyncio
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import config, translations, metrics, load_trace
+from . import resource_loader
+from .resource_loader import TranslationFile
+from .translator import translate, handle_missing, LazyTranslationTuple
+
+
+_pending: Dict[Tuple[asyncio.AbstractEventLoop, TranslationFile], "asyncio.Task[None]"] = {}
+
+
+async def _read_and_add(file: TranslationFile, after: Optional["asyncio.Task[None]"]) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        content = await loop.run_in_executor(None, resource_loader.read_translation_file, file)
+        if after is not None:
+            # keep the same order as synchronous loading,
+            # so that later files override earlier ones
+            await asyncio.wait((after,))
+        resource_loader.add_translation_file(file, content)
+    finally:
+        # e.g. if the task was cancelled
+        load_trace.discard(file)
+
+
+def _load_file(
+    file: TranslationFile,
+    after: Optional["asyncio.Task[None]"] = None,
+) -> "asyncio.Task[None]":
+    loop = asyncio.get_running_loop()
+    task_key = (loop, file)
+    task = _pending.get(task_key)
+    if task is None:
+        task = _pending[task_key] = loop.create_task(_read_and_add(file, after))
+        task.add_done_callback(partial(_forget, task_key))
+    return task
+
+
+def _forget(task_key: Tuple[asyncio.AbstractEventLoop, TranslationFile], _: Any) -> None:
+    _pending.pop(task_key, None)
+
+
+async def _load_files(files: List[TranslationFile]) -> None:
+    tasks = []
+    previous = None
+    for file in files:
+        previous = _load_file(file, previous)
+        tasks.append(previous)
+    # tasks may be shared with other callers, so they shouldn't be cancelled
+    await asyncio.gather(*map(asyncio.shield, tasks))
+
+
+async def aload_everything(locale: Optional[str] = None, *, lock: bool = False) -> None:
+    """
+    Asynchronous version of `load_everything()`
+
+    Files are searched, read and parsed in the default executor,
+    translations are added in the event loop thread
+
+    :param locale: Locale (optional)
+    :param lock: Whether to lock translations after loading
+    """
+
+    resource_loader._ensure_not_locked(locale)
+
+    loop = asyncio.get_running_loop()
+    files = await loop.run_in_executor(
+        None,
+        lambda: list(resource_loader.iter_translation_files(locale)),
+    )
+    await _load_files(files)
+
+    if lock:
+        resource_loader._lock(locale)
+
+
+async def ensure_loaded(key_or_namespace: str, locale: Optional[str] = None) -> None:
+    """
+    Loads files that may contain the key or namespace without blocking the event loop
+
+    Concurrent requests for the same file are handled by one task
+
+    :param key_or_namespace: Translation key or namespace
+    :param locale: Locale (optional)
+    """
+
+    if not locale:
+        locale = config.current_locale()
+    if resource_loader._check_locked(locale):
+        return
+
+    loop = asyncio.get_running_loop()
+    files = await loop.run_in_executor(
+        None,
+        resource_loader.find_translation_files,
+        key_or_namespace.split(config.get("namespace_delimiter")),
+        locale,
+    )
+    await _load_files(files)
+
+
+async def at(
+    key: str,
+    /,
+    locale: Optional[str] = None,
+    **kwargs: Any,
+) -> Union[str, LazyTranslationTuple]:
+    """
+    Asynchronous version of `t()`
+
+    Missing translations are loaded with `ensure_loaded()`
+    See `t()` for description of parameters and return value
+    """
+
+    if not locale:
+        locale = config.current_locale()
+    eviction = resource_loader._eviction
+    if eviction is not None and eviction.enabled:
+        eviction.touch(locale)
+    if not translations.has(key, locale):
+        await ensure_loaded(key, locale)
+        if not translations.has(key, locale):
+            fallback = config.get("fallback")
+            if fallback:
+                if not translations.has(key, fallback):
+                    await ensure_loaded(key, fallback)
+                if translations.has(key, fallback):
+                    if metrics.observing:
+                        metrics.observe("fallback_hits", key, locale)
+                    return translate(key, fallback, kwargs)
+            return handle_missing(key, locale, kwargs)
+    if metrics.observing:
+        metrics.observe("hits", key, locale)
+    return translate(key, locale, kwargs)
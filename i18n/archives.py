@@ -0,0 +1,222 @@
+__all__ = ("Archive", "load_path", "location", "find", "isfile", "isdir", "listdir")
+
+import os
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+from . import config
+from .errors import I18nFileLoadError
+
+if TYPE_CHECKING:  # pragma: no cover
+    import zipfile
+
+
+class Archive(object):
+    """
+    Zip file used as a directory
+
+    It's opened once and its central directory is indexed in memory,
+    so finding and listing files don't need system calls
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Absolute path of the zip file
+        :raises I18nFileLoadError: If the file isn't a valid zip file
+        """
+
+        import zipfile
+
+        self.path = path
+        try:
+            stat = os.stat(path)
+            # modification time and size, archive is opened again when they change
+            self.version = (stat.st_mtime_ns, stat.st_size)
+            self._zip = zipfile.ZipFile(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise I18nFileLoadError("error opening archive {0}: {1}".format(path, e)) from e
+        self._lock = threading.Lock()
+        self.files: Dict[str, "zipfile.ZipInfo"] = {}
+        # names in every directory, "" is the root
+        # dicts are used as ordered sets
+        self.dirs: Dict[str, Dict[str, None]] = {"": {}}
+        for info in self._zip.infolist():
+            name = info.filename.rstrip("/")
+            if info.is_dir():
+                self.dirs.setdefault(name, {})
+            else:
+                self.files[name] = info
+            while name:
+                parent, _, base = name.rpartition("/")
+                children = self.dirs.setdefault(parent, {})
+                if base in children:
+                    # parents are already known
+                    break
+                children[base] = None
+                name = parent
+
+    def isfile(self, name: str) -> bool:
+        return name in self.files
+
+    def isdir(self, name: str) -> bool:
+        return name in self.dirs
+
+    def listdir(self, name: str) -> List[str]:
+        try:
+            return list(self.dirs[name])
+        except KeyError:
+            raise FileNotFoundError(os.path.join(self.path, name)) from None
+
+    def getinfo(self, name: str) -> "zipfile.ZipInfo":
+        try:
+            return self.files[name]
+        except KeyError:
+            raise I18nFileLoadError(
+                "error loading file {0}: no such file in archive".format(
+                    os.path.join(self.path, name),
+                ),
+            ) from None
+
+    def read(self, name: str) -> bytes:
+        """
+        Reads and decompresses file
+
+        :param name: Name of the file in the archive
+        :return: Content of the file
+        :raises I18nFileLoadError: If the file doesn't exist
+        """
+
+        info = self.getinfo(name)
+        with self._lock:
+            return self._zip.read(info)
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __repr__(self) -> str:
+        return "<{} {!r}>".format(self.__class__.__name__, self.path)
+
+
+# opened archives by absolute path
+_archives: Dict[str, Archive] = {}
+# `load_path` converted by `location()`, reset when it changes
+_locations: Optional[List[str]] = None
+_lock = threading.Lock()
+
+
+def load_path() -> List[str]:
+    """Gets `load_path` with every entry converted by `location()`"""
+
+    global _locations
+
+    locations = _locations
+    if locations is None:
+        locations = _locations = [location(entry) for entry in config.get("load_path")]
+    return locations
+
+
+def location(entry: Any) -> str:
+    """
+    Converts entry of `load_path` to path
+
+    Zip files and directories inside them are opened as archives.
+    Other files are returned unchanged, so nothing is found in them.
+    Besides strings, entry may be a path-like object or a result of `importlib.resources.files()`
+
+    :param entry: Entry of `load_path`
+    :return: Path that can be used with functions of this module
+    :raises TypeError: If the entry isn't supported
+    :raises I18nFileLoadError: If the zip file is damaged
+    """
+
+    if not isinstance(entry, str):
+        entry = _path_of(entry)
+    path = os.path.abspath(entry)
+    head = path
+    while not os.path.isdir(head) and head != os.path.dirname(head):
+        if os.path.isfile(head):
+            archive = _open(head)
+            if archive is None:
+                return entry
+            return archive.path + path[len(head):]
+        head = os.path.dirname(head)
+    return entry
+
+
+def _open(path: str) -> Optional[Archive]:
+    import zipfile
+
+    stat = os.stat(path)
+    with _lock:
+        archive = _archives.get(path)
+        if archive is not None and archive.version == (stat.st_mtime_ns, stat.st_size):
+            return archive
+        if not zipfile.is_zipfile(path):
+            return None
+        # the replaced archive is closed when it isn't used anymore
+        archive = _archives[path] = Archive(path)
+        return archive
+
+
+def _path_of(entry: Any) -> str:
+    if isinstance(entry, os.PathLike):
+        return os.fspath(entry)
+    import zipfile
+
+    # packages imported from zip files, archives in memory aren't supported
+    if isinstance(entry, zipfile.Path) and entry.root.filename is not None:
+        root = os.path.abspath(entry.root.filename)
+        return os.path.join(root, entry.at.replace("/", os.sep)).rstrip(os.sep)
+    raise TypeError("unsupported load_path entry: {!r}".format(entry))
+
+
+def find(path: str) -> Optional[Tuple[Archive, str]]:
+    """
+    Finds archive that contains the path
+
+    :param path: Path created from result of `location()`
+    :return: Archive and name inside it or `None` if the path is outside of archives
+    """
+
+    if not _archives:
+        return None
+    for archive in list(_archives.values()):
+        if path == archive.path or path.startswith(archive.path + os.sep):
+            return archive, path[len(archive.path):].strip(os.sep).replace(os.sep, "/")
+    return None
+
+
+def isfile(path: str) -> bool:
+    found = find(path)
+    return os.path.isfile(path) if found is None else found[0].isfile(found[1])
+
+
+def isdir(path: str) -> bool:
+    found = find(path)
+    return os.path.isdir(path) if found is None else found[0].isdir(found[1])
+
+
+def listdir(path: str) -> List[str]:
+    found = find(path)
+    return os.listdir(path) if found is None else found[0].listdir(found[1])
+
+
+def close() -> None:
+    """Closes opened archives, they're opened again when needed"""
+
+    global _locations
+
+    with _lock:
+        archives = list(_archives.values())
+        _archives.clear()
+        _locations = None
+    for archive in archives:
+        archive.close()
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global _locations
+
+    if "load_path" in changed:
+        _locations = None
@@ -0,0 +1,27 @@
+__all__ = (
+    "CatalogBackend",
+    "CatalogView",
+    "DictBackend",
+    "FrozenBackend",
+    "SqliteBackend",
+)
+
+from typing import Any
+from importlib import import_module
+
+from .backend import CatalogBackend, CatalogView
+from .dict_backend import DictBackend
+
+# backends with heavy dependencies are imported on first use
+_LAZY = {
+    "FrozenBackend": "frozen_backend",
+    "SqliteBackend": "sqlite_backend",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module("." + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
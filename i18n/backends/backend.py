@@ -0,0 +1,104 @@
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..translations import TranslationType
+
+
+class CatalogBackend(object):
+    """
+    Base class for storages of loaded translations
+
+    Set `catalog_backend` setting to an instance of a subclass to use it.
+    All access to translations goes through `i18n.translations`, which calls these methods
+    """
+
+    def add_many(self, items: Iterable[Tuple[str, "TranslationType"]], locale: str) -> None:
+        """
+        Adds translations, replacing existing ones
+
+        :param items: Pairs of key and translation
+        :param locale: Locale of the translations
+        """
+
+        raise NotImplementedError
+
+    def get(self, key: str, locale: str) -> "TranslationType":
+        """
+        Gets translation
+
+        :param key: Translation key
+        :param locale: Locale
+        :return: Translation
+        :raises KeyError: If there is no such translation
+        """
+
+        raise NotImplementedError
+
+    def has(self, key: str, locale: str) -> bool:
+        raise NotImplementedError
+
+    def clear(self, locale: Optional[str] = None) -> None:
+        """
+        Removes translations
+
+        :param locale: Locale to clear (optional). All locales are cleared if not provided
+        """
+
+        raise NotImplementedError
+
+    def keys(self, locale: str, prefix: str = "") -> Iterator[str]:
+        """
+        Iterates over translation keys
+
+        :param locale: Locale
+        :param prefix: Prefix of keys (optional)
+        :return: Iterator over keys that start with the prefix
+        """
+
+        raise NotImplementedError
+
+    def locales(self) -> Iterator[str]:
+        """Iterates over locales that have translations"""
+
+        raise NotImplementedError
+
+    def memory_usage(self) -> int:
+        """Estimates memory used by stored translations in bytes"""
+
+        raise NotImplementedError
+
+    def add(self, key: str, value: "TranslationType", locale: str) -> None:
+        self.add_many(((key, value),), locale)
+
+    def mapping(self, locale: str) -> Mapping[str, "TranslationType"]:
+        """
+        Gets read-only view of translations of one locale
+
+        It's used by `Translator` and `compile_key()` to access translations quickly,
+        so backends may override it to return an existing mapping
+
+        :param locale: Locale
+        :return: Mapping from keys to translations, which reflects further changes
+        """
+
+        return CatalogView(self, locale)
+
+
+class CatalogView(Mapping[str, "TranslationType"]):
+    """Mapping that reads translations of one locale from backend"""
+
+    def __init__(self, backend: CatalogBackend, locale: str):
+        self.backend = backend
+        self.locale = locale
+
+    def __getitem__(self, key: str) -> "TranslationType":
+        return self.backend.get(key, self.locale)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.backend.has(key, self.locale)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.backend.keys(self.locale)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.backend.keys(self.locale))
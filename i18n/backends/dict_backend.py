@@ -0,0 +1,45 @@
+from typing import Dict, Iterable, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from .backend import CatalogBackend
+from ..loaders.loader import estimate_size
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..translations import TranslationType
+
+
+class DictBackend(CatalogBackend):
+    """Default backend, keeps translations in a dict for each locale"""
+
+    def __init__(self):
+        self.container: Dict[str, Dict[str, "TranslationType"]] = {}
+
+    def add_many(self, items: Iterable[Tuple[str, "TranslationType"]], locale: str) -> None:
+        self.container.setdefault(locale, {}).update(items)
+
+    def add(self, key: str, value: "TranslationType", locale: str) -> None:
+        self.container.setdefault(locale, {})[key] = value
+
+    def get(self, key: str, locale: str) -> "TranslationType":
+        return self.container[locale][key]
+
+    def has(self, key: str, locale: str) -> bool:
+        return key in self.container.get(locale, ())
+
+    def clear(self, locale: Optional[str] = None) -> None:
+        if locale is None:
+            self.container.clear()
+        elif locale in self.container:
+            # the dict may be used by translators, so it's cleared instead of being removed
+            self.container[locale].clear()
+
+    def keys(self, locale: str, prefix: str = "") -> Iterator[str]:
+        return (key for key in list(self.container.get(locale, ())) if key.startswith(prefix))
+
+    def locales(self) -> Iterator[str]:
+        return iter(list(self.container))
+
+    def memory_usage(self) -> int:
+        return estimate_size(self.container, set())
+
+    def mapping(self, locale: str) -> Dict[str, "TranslationType"]:
+        return self.container.setdefault(locale, {})
@@ -0,0 +1,102 @@
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+from typing import TYPE_CHECKING
+
+from .backend import CatalogBackend
+from ..errors import I18nLockedError
+from ..loaders.loader import estimate_size
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..translations import TranslationType
+
+
+class FrozenBackend(CatalogBackend):
+    """
+    Immutable translations prepared for fast lookups, see `i18n.frozen.freeze()`
+
+    Every locale has one dict which also contains translations of the fallback
+    that the locale lacks, so a lookup never needs a second step
+    """
+
+    def __init__(
+        self,
+        merged: Dict[str, Dict[str, "TranslationType"]],
+        from_fallback: Dict[str, FrozenSet[str]],
+        fallback: Optional[str],
+        templates: Dict[str, Tuple[str, List[Tuple[str, str]]]],
+        config_generation: int,
+    ):
+        """
+        :param merged: Translations of every locale merged with translations of the fallback
+        :param from_fallback: Keys of every locale which are taken from the fallback
+        :param fallback: Fallback locale
+        :param templates: Compiled translations, see `compile_template()`
+        :param config_generation: Settings generation the translations were prepared for
+        """
+
+        self.merged = merged
+        self.from_fallback = from_fallback
+        self.fallback = fallback
+        self.templates = templates
+        self.config_generation = config_generation
+        # set by `freeze()`
+        self.report: Any = None
+
+    def resolve(self, key: str, locale: str) -> Tuple["TranslationType", str]:
+        """
+        Finds translation in the locale or the fallback
+
+        :param key: Translation key
+        :param locale: Locale
+        :return: Translation and locale it belongs to
+        :raises KeyError: If neither the locale nor the fallback has the translation
+        """
+
+        catalog = self.merged.get(locale)
+        if catalog is None:
+            if self.fallback is None:
+                raise KeyError(key)
+            return self.merged[self.fallback][key], self.fallback
+        value = catalog[key]
+        if key in self.from_fallback[locale]:
+            return value, self.fallback  # type: ignore[return-value]
+        return value, locale
+
+    def add_many(self, items: Iterable[Tuple[str, "TranslationType"]], locale: str) -> None:
+        raise I18nLockedError("Translations are frozen, use unload_everything() to unfreeze")
+
+    def get(self, key: str, locale: str) -> "TranslationType":
+        if key in self.from_fallback.get(locale, ()):
+            raise KeyError(key)
+        return self.merged[locale][key]
+
+    def has(self, key: str, locale: str) -> bool:
+        return key in self.merged.get(locale, ()) and key not in self.from_fallback[locale]
+
+    def clear(self, locale: Optional[str] = None) -> None:
+        raise I18nLockedError("Translations are frozen, use unload_everything() to unfreeze")
+
+    def keys(self, locale: str, prefix: str = "") -> Iterator[str]:
+        from_fallback = self.from_fallback.get(locale, frozenset())
+        return (
+            key
+            for key in self.merged.get(locale, ())
+            if key.startswith(prefix) and key not in from_fallback
+        )
+
+    def locales(self) -> Iterator[str]:
+        return iter(self.merged)
+
+    def memory_usage(self) -> int:
+        """Estimates memory used by translations and templates, shared objects are counted once"""
+
+        seen: set = set()
+        return (
+            estimate_size(self.merged, seen)
+            + estimate_size(self.from_fallback, seen)
+            + estimate_size(self.templates, seen)
+        )
+
+    def mapping(self, locale: str) -> Mapping[str, "TranslationType"]:
+        if self.from_fallback.get(locale, True):
+            return super().mapping(locale)
+        return self.merged[locale]
@@ -0,0 +1,261 @@
+import json
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+from .backend import CatalogBackend
+from ..loaders.loader import estimate_size
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..translations import TranslationType
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    locale TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    is_json INTEGER NOT NULL,
+    PRIMARY KEY (locale, key)
+) WITHOUT ROWID
+"""
+
+# cached result of lookup of a key that doesn't exist
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _encode(value: "TranslationType") -> Tuple[str, int]:
+    if isinstance(value, str):
+        return value, 0
+    return json.dumps(value, ensure_ascii=False), 1
+
+
+def _decode(value: str, is_json: int) -> "TranslationType":
+    if not is_json:
+        return value
+    decoded = json.loads(value)
+    # lists are loaded as tuples
+    return tuple(decoded) if isinstance(decoded, list) else decoded
+
+
+def _prefix_end(prefix: str) -> Optional[str]:
+    # the smallest string that is greater than all strings starting with prefix,
+    # `None` if there is no such string
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SqliteBackend(CatalogBackend):
+    """
+    Keeps translations in SQLite database, recently used ones are cached in memory
+
+    The database is filled by usual loading, e.g. `load_everything()`.
+    Other processes can open it with `read_only=True`, in this mode
+    added translations are kept only in memory and `clear()` doesn't touch the database.
+    Threads share one read-only connection
+    """
+
+    def __init__(self, path: str, cache_size: int = 4096, read_only: bool = False):
+        """
+        :param path: Path of database file, it's created if needed
+        :param cache_size: Maximum number of cached lookups
+        :param read_only: Whether to use existing database without modifying it
+        """
+
+        self.path = path
+        self.cache_size = cache_size
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        # incremented on changes, so that values read before them aren't cached
+        self._version = 0
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._writer: Optional[sqlite3.Connection] = None
+        # translations added in read-only mode
+        self._overlay: Dict[Tuple[str, str], "TranslationType"] = {}
+        if read_only:
+            # fail early if the database doesn't exist
+            self._query("SELECT 1", ())
+        else:
+            self._write_lock = threading.Lock()
+            self._writer = sqlite3.connect(path, check_same_thread=False)
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            self._writer.execute(SCHEMA)
+            self._writer.commit()
+
+    def _reader(self) -> sqlite3.Connection:
+        # called with `_read_lock`
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                Path(self.path).resolve().as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+        return self._connection
+
+    def _query(self, sql: str, parameters: Tuple[str, ...]) -> List[Tuple[Any, ...]]:
+        with self._read_lock:
+            return self._reader().execute(sql, parameters).fetchall()
+
+    def _lookup(self, key: str, locale: str) -> Any:
+        with self._cache_lock:
+            if self._overlay:
+                try:
+                    return self._overlay[locale, key]
+                except KeyError:
+                    pass
+            try:
+                value = self._cache[locale, key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._cache.move_to_end((locale, key))
+                self.hits += 1
+                return value
+            version = self._version
+        rows = self._query(
+            "SELECT value, is_json FROM translations WHERE locale = ? AND key = ?",
+            (locale, key),
+        )
+        value = _decode(*rows[0]) if rows else _MISSING
+        with self._cache_lock:
+            if self.cache_size > 0 and version == self._version:
+                self._cache[locale, key] = value
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return value
+
+    def add_many(self, items: Iterable[Tuple[str, "TranslationType"]], locale: str) -> None:
+        if self._writer is None:
+            with self._cache_lock:
+                for key, value in items:
+                    self._overlay[locale, key] = value
+                    self._cache.pop((locale, key), None)
+            return
+        rows = [(locale, key) + _encode(value) for key, value in items]
+        with self._write_lock:
+            with self._writer:
+                self._writer.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        with self._cache_lock:
+            self._version += 1
+            for row in rows:
+                self._cache.pop(row[:2], None)
+
+    def get(self, key: str, locale: str) -> "TranslationType":
+        value = self._lookup(key, locale)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def has(self, key: str, locale: str) -> bool:
+        return self._lookup(key, locale) is not _MISSING
+
+    def clear(self, locale: Optional[str] = None) -> None:
+        if self._writer is not None:
+            with self._write_lock:
+                with self._writer:
+                    if locale is None:
+                        self._writer.execute("DELETE FROM translations")
+                    else:
+                        self._writer.execute(
+                            "DELETE FROM translations WHERE locale = ?", (locale,),
+                        )
+        with self._cache_lock:
+            self._version += 1
+            if locale is None:
+                self._cache.clear()
+                self._overlay.clear()
+            else:
+                for cached in (self._cache, self._overlay):
+                    for item in [item for item in cached if item[0] == locale]:
+                        del cached[item]
+
+    def keys(self, locale: str, prefix: str = "") -> Iterator[str]:
+        end = _prefix_end(prefix) if prefix else None
+        if end is not None:
+            rows = self._query(
+                "SELECT key FROM translations WHERE locale = ? AND key >= ? AND key < ?"
+                " ORDER BY key",
+                (locale, prefix, end),
+            )
+        elif prefix:
+            rows = self._query(
+                "SELECT key FROM translations WHERE locale = ? AND key >= ? ORDER BY key",
+                (locale, prefix),
+            )
+        else:
+            rows = self._query(
+                "SELECT key FROM translations WHERE locale = ? ORDER BY key", (locale,),
+            )
+        keys = [key for key, in rows]
+        with self._cache_lock:
+            added = [
+                key for item_locale, key in self._overlay
+                if item_locale == locale and key.startswith(prefix)
+            ]
+        if added:
+            keys = sorted(set(keys).union(added))
+        return iter(keys)
+
+    def locales(self) -> Iterator[str]:
+        rows = self._query("SELECT DISTINCT locale FROM translations", ())
+        locales = [locale for locale, in rows]
+        with self._cache_lock:
+            added = {locale for locale, _ in self._overlay}.difference(locales)
+        return iter(locales + sorted(added))
+
+    def memory_usage(self) -> int:
+        """Estimates memory used by the cache and translations added in read-only mode"""
+
+        with self._cache_lock:
+            return estimate_size(dict(self._cache)) + estimate_size(dict(self._overlay))
+
+    def cache_info(self) -> CacheInfo:
+        """Gets statistics of the cache, which help to choose its size"""
+
+        with self._cache_lock:
+            return CacheInfo(self.hits, self.misses, self.cache_size, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Clears the cache and its statistics"""
+
+        with self._cache_lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        """Closes all connections"""
+
+        with self._read_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __repr__(self) -> str:
+        return "<{} {!r}>".format(self.__class__.__name__, self.path)
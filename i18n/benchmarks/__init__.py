@@ -0,0 +1 @@
+"""Performance benchmarks, not imported by the library itself"""
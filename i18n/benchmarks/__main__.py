@@ -0,0 +1,156 @@
+"""
+Runs benchmarks and compares results with a baseline
+
+Usage: `python -m i18n.benchmarks [suite ...] [--output FILE] [--baseline FILE] [--threshold X]`
+Exits with code 1 if any case became slower than the baseline by more than the threshold
+"""
+
+import sys
+import json
+import platform
+from functools import partial
+from argparse import ArgumentParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import hot_path, locale_switching, startup
+from .catalog import CatalogShape
+
+
+SUITES: Dict[str, Callable[..., Dict[str, float]]] = {
+    "hot_path": hot_path.main,
+    "locale_switching": locale_switching.main,
+    "startup": startup.main,
+}
+
+Results = Dict[str, Dict[str, float]]
+
+
+def run(
+    suites: List[str],
+    number: Optional[int] = None,
+    startup_options: Optional[Dict[str, Any]] = None,
+) -> Results:
+    results = {}
+    for name in suites:
+        print("==", name)
+        main = SUITES[name]
+        if name == "startup" and startup_options:
+            main = partial(main, **startup_options)
+        results[name] = main() if number is None else main(number)
+    return results
+
+
+def parse_shape_option(option: str) -> Tuple[str, Any]:
+    """
+    Parses `name=value` option of `CatalogShape`
+
+    :param option: Option string
+    :return: Name and converted value
+    :raises ValueError: If option is invalid
+    """
+
+    name, sep, value = option.partition("=")
+    if not sep or name not in CatalogShape._fields:
+        raise ValueError("invalid shape option: {}".format(option))
+    field_type = type(CatalogShape._field_defaults[name])
+    if field_type is bool:
+        return name, value.lower() in ("1", "true", "yes")
+    return name, field_type(value)
+
+
+def compare(results: Results, baseline: Results, threshold: float) -> List[str]:
+    """
+    Finds cases that became slower
+
+    :param results: New results
+    :param baseline: Old results
+    :param threshold: Allowed slowdown, e.g. 0.1 for 10%
+    :return: Descriptions of regressions
+    """
+
+    regressions = []
+    for suite, cases in results.items():
+        for case, value in cases.items():
+            old = baseline.get(suite, {}).get(case)
+            if old is None:
+                continue
+            if old <= 0:
+                # relative change can't be computed, e.g. for memory that wasn't allocated
+                print("{}/{}: {:.1f} -> {:.1f}".format(suite, case, old, value))
+                continue
+            change = value / old - 1
+            line = "{}/{}: {:.1f} -> {:.1f} ({:+.1%})".format(suite, case, old, value, change)
+            print(line)
+            if change > threshold:
+                regressions.append(line)
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(prog="python -m i18n.benchmarks", description=__doc__)
+    parser.add_argument("suites", nargs="*", help="one of: " + ", ".join(SUITES))
+    parser.add_argument(
+        "-n",
+        "--number",
+        type=int,
+        help="number of calls per measurement (number of repetitions for startup)",
+    )
+    parser.add_argument("-o", "--output", help="file to save results to (JSON)")
+    parser.add_argument("-b", "--baseline", help="file with results to compare with")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown (default: 0.1, which means 10%%)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="numbers of keys in catalogs for startup (default: {})".format(
+            " ".join(map(str, startup.SIZES)),
+        ),
+    )
+    parser.add_argument(
+        "--shape",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="catalog parameter for startup, e.g. depth=3 or file_format=yml. Parameters: "
+        + ", ".join(CatalogShape._fields),
+    )
+    options = parser.parse_args(args)
+    for suite in options.suites:
+        if suite not in SUITES:
+            parser.error("unknown suite: {}".format(suite))
+    startup_options: Dict[str, Any] = {}
+    if options.sizes:
+        startup_options["sizes"] = options.sizes
+    try:
+        startup_options.update(map(parse_shape_option, options.shape))
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = run(options.suites or list(SUITES), options.number, startup_options)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                f,
+                indent=2,
+            )
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)["results"]
+        print("== comparison with", options.baseline)
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print("Regressions:")
+            print("\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
@@ -0,0 +1,129 @@
+"""
+Generates synthetic translation files for benchmarks
+
+The same shape always produces the same files
+"""
+
+import os
+import json
+import random
+from typing import Any, Dict, List, NamedTuple
+
+
+class CatalogShape(NamedTuple):
+    locales: int = 2
+    # number of directory levels above files
+    depth: int = 1
+    # files per locale
+    files: int = 10
+    keys_per_file: int = 100
+    # fractions of values with placeholders, static references and plural forms
+    placeholder_density: float = 0.3
+    static_ref_density: float = 0.1
+    plural_density: float = 0.1
+    file_format: str = "json"
+    use_locale_dirs: bool = False
+    seed: int = 0
+
+    @property
+    def total_keys(self) -> int:
+        return self.locales * self.files * self.keys_per_file
+
+    @classmethod
+    def with_keys(cls, keys: int, **kwargs: Any) -> "CatalogShape":
+        """Creates shape with approximately the given number of keys in total"""
+
+        shape = cls(**kwargs)
+        files = max(1, keys // (shape.locales * shape.keys_per_file))
+        return shape._replace(files=files)
+
+
+def locale_names(shape: CatalogShape) -> List[str]:
+    return ["l{}".format(i) for i in range(shape.locales)]
+
+
+def namespaces(shape: CatalogShape) -> List[str]:
+    """
+    Gets namespaces of generated files, e.g. `"d0.d3.f42"`
+
+    Directories are spread so that each of them contains up to 10 subdirectories or files
+    """
+
+    result = []
+    for i in range(shape.files):
+        parts = []
+        rest = i
+        for _ in range(shape.depth):
+            parts.append("d{}".format(rest % 10))
+            rest //= 10
+        parts.append("f{}".format(i))
+        result.append(".".join(parts))
+    return result
+
+
+def generate_values(shape: CatalogShape, namespace: str, rng: random.Random) -> Dict[str, Any]:
+    values: Dict[str, Any] = {}
+    plain: List[str] = []
+    for i in range(shape.keys_per_file):
+        key = "k{}".format(i)
+        roll = rng.random()
+        if roll < shape.plural_density:
+            values[key] = {
+                "one": "one item {}".format(i),
+                "many": "%{{count}} items {}".format(i),
+            }
+            continue
+        roll -= shape.plural_density
+        if roll < shape.static_ref_density and plain:
+            values[key] = "see %{{.{}.{}}}".format(namespace, rng.choice(plain))
+        elif roll < shape.static_ref_density + shape.placeholder_density:
+            values[key] = "Hello %{{name}}, value {} is %{{value}}".format(i)
+        else:
+            values[key] = "Value number {}".format(i)
+        plain.append(key)
+    return values
+
+
+def dump(data: Dict[str, Any], filename: str, file_format: str) -> None:
+    with open(filename, "w", encoding="utf-8") as f:
+        if file_format == "json":
+            json.dump(data, f, ensure_ascii=False)
+        else:
+            import yaml
+
+            yaml.safe_dump(data, f, allow_unicode=True)
+
+
+def generate(directory: str, shape: CatalogShape) -> Dict[str, Any]:
+    """
+    Writes translation files into the directory
+
+    :param directory: Existing directory
+    :param shape: Parameters of generated catalog
+    :return: Settings needed to load the files
+    """
+
+    rng = random.Random(shape.seed)
+    for namespace in namespaces(shape):
+        *dirs, name = namespace.split(".")
+        for locale in locale_names(shape):
+            values = generate_values(shape, namespace, rng)
+            if shape.use_locale_dirs:
+                file_dir = os.path.join(directory, locale, *dirs)
+                filename = "{}.{}".format(name, shape.file_format)
+            else:
+                file_dir = os.path.join(directory, *dirs)
+                filename = "{}.{}.{}".format(name, locale, shape.file_format)
+                values = {locale: values}
+            os.makedirs(file_dir, exist_ok=True)
+            dump(values, os.path.join(file_dir, filename), shape.file_format)
+    return {
+        "load_path": [directory],
+        "file_format": shape.file_format,
+        "filename_format": (
+            "{namespace}.{format}" if shape.use_locale_dirs else "{namespace}.{locale}.{format}"
+        ),
+        "use_locale_dirs": shape.use_locale_dirs,
+        "skip_locale_root_data": shape.use_locale_dirs,
+        "locale": locale_names(shape)[0],
+    }
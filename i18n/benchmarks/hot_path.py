@@ -0,0 +1,146 @@
+"""
+Measures cost of typical `t()` calls
+
+Run with `python -m i18n.benchmarks hot_path`
+"""
+
+import sys
+import timeit
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+import i18n
+from i18n import config, custom_functions
+from i18n.frozen import freeze
+
+
+SETTINGS = ("load_path", "locale", "fallback", "file_format")
+# Python function calls made by plain hit before optional features were added,
+# while they are off the plain hit shouldn't cost more
+PLAIN_HIT_CALLS = 11
+
+
+def plain_hit() -> None:
+    i18n.t("bench.plain")
+
+
+def placeholders_hit() -> None:
+    i18n.t("bench.placeholders", name="Bob", amount=10)
+
+
+def plural_hit() -> None:
+    i18n.t("bench.plural", count=3)
+
+
+def function_hit() -> None:
+    i18n.t("bench.function", count=3)
+
+
+def list_access() -> None:
+    i18n.t("bench.list", name="Bob")[1]
+
+
+def miss_with_fallback() -> None:
+    i18n.t("bench.only_fallback")
+
+
+def miss_with_disk_search() -> None:
+    i18n.t("bench_missing.key")
+
+
+CASES: Dict[str, Callable[[], None]] = {
+    "plain hit": plain_hit,
+    "placeholders": placeholders_hit,
+    "plural": plural_hit,
+    "custom function": function_hit,
+    "list access": list_access,
+    "fallback": miss_with_fallback,
+    "disk search": miss_with_disk_search,
+}
+
+
+@contextmanager
+def prepared() -> Iterator[None]:
+    """Sets up translations and restores settings afterwards"""
+
+    saved = {key: config.get(key) for key in SETTINGS}
+    saved["load_path"] = list(saved["load_path"])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # empty directory, so that every search checks the disk
+        i18n.set("load_path", [tmp_dir])
+        i18n.set("file_format", "json")
+        i18n.set("locale", "en")
+        i18n.set("fallback", "fr")
+        i18n.add_translation("bench.plain", "Hello")
+        i18n.add_translation("bench.placeholders", "Hello %{name}, you have %{amount} points")
+        i18n.add_translation("bench.plural", {
+            "zero": "no points",
+            "one": "1 point",
+            "few": "a few points",
+            "many": "%{count} points",
+        })
+        i18n.add_function("bench_plural", lambda *a, **kw: a[kw["count"] != 1], "en")
+        i18n.add_translation("bench.function", "%{count} %{bench_plural(point|points)}")
+        i18n.add_translation("bench.list", ("Hello", "Hello %{name}", "Bye"))
+        i18n.add_translation("bench.only_fallback", "Bonjour", "fr")
+        try:
+            yield
+        finally:
+            i18n.unload_everything()
+            custom_functions.locales_functions["en"].pop("bench_plural", None)
+            for key, value in saved.items():
+                i18n.set(key, value)
+
+
+def count_calls(func: Callable[[], None]) -> int:
+    """Counts Python functions called by `func`, not including itself"""
+
+    calls = 0
+
+    # profile functions aren't traced, so coverage can't see it run
+    def profile(frame: Any, event: str, arg: Any) -> None:  # pragma: no cover
+        nonlocal calls
+        if event == "call":
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return calls - 1
+
+
+def measure(results: Dict[str, float], prefix: str, number: int) -> None:
+    for name, func in CASES.items():
+        best = min(timeit.repeat(func, number=number, repeat=3))
+        # nanoseconds per call
+        results[prefix + name] = best / number * 1e9
+        print("{:<23} {:10.1f} ns/call".format(prefix + name, results[prefix + name]))
+
+
+def main(number: int = 20000) -> Dict[str, float]:
+    """
+    Measures all cases, then measures them again with frozen translations
+
+    :param number: Number of calls per measurement
+    :return: Nanoseconds per call and number of calls made by plain hit
+    """
+
+    results: Dict[str, float] = {}
+    with prepared():
+        measure(results, "", number)
+        results["plain hit calls"] = count_calls(plain_hit)
+        print("{:<23} {:10d} (baseline: {})".format(
+            "plain hit calls",
+            int(results["plain hit calls"]),
+            PLAIN_HIT_CALLS,
+        ))
+        freeze()
+        measure(results, "frozen ", number)
+    return results
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
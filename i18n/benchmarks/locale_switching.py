@@ -0,0 +1,78 @@
+"""
+Measures cost of switching locale per request
+
+Run with `python -m i18n.benchmarks locale_switching`
+"""
+
+import timeit
+from typing import Callable, Dict
+
+import i18n
+
+
+LOCALES = ("en", "fr", "de", "uk")
+KEY = "greeting"
+
+
+def setup() -> None:
+    for locale in LOCALES:
+        i18n.add_translation(KEY, "Hello from " + locale, locale)
+
+
+def with_global_setting() -> None:
+    for locale in LOCALES:
+        i18n.set("locale", locale)
+        i18n.t(KEY)
+
+
+def with_locale_scope() -> None:
+    for locale in LOCALES:
+        with i18n.locale_scope(locale):
+            i18n.t(KEY)
+
+
+def with_bound_locale() -> None:
+    for locale in LOCALES:
+        token = i18n.bind_locale(locale)
+        i18n.t(KEY)
+        i18n.reset_locale(token)
+
+
+def with_explicit_locale() -> None:
+    for locale in LOCALES:
+        i18n.t(KEY, locale)
+
+
+CASES: Dict[str, Callable[[], None]] = {
+    "config.set": with_global_setting,
+    "locale_scope": with_locale_scope,
+    "bind_locale": with_bound_locale,
+    "explicit locale": with_explicit_locale,
+}
+
+
+def main(number: int = 100000) -> Dict[str, float]:
+    """
+    Measures all cases, the locale and translations are restored afterwards
+
+    :param number: Number of requests per measurement
+    :return: Nanoseconds per request
+    """
+
+    locale = i18n.get("locale")
+    setup()
+    results = {}
+    try:
+        for name, func in CASES.items():
+            best = min(timeit.repeat(func, number=number, repeat=3))
+            # nanoseconds per request
+            results[name] = best / number / len(LOCALES) * 1e9
+            print("{:<16} {:8.1f} ns/request".format(name, results[name]))
+    finally:
+        i18n.unload_everything()
+        i18n.set("locale", locale)
+    return results
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,144 @@
+"""
+Measures import time, loading time and memory usage for synthetic catalogs of different sizes
+
+Run with `python -m i18n.benchmarks startup`
+"""
+
+import sys
+import tempfile
+import tracemalloc
+import subprocess
+from time import perf_counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+import i18n
+from i18n import config
+
+from .catalog import CatalogShape, generate, locale_names, namespaces
+
+
+SIZES = (1000, 10000, 100000)
+# number of files loaded lazily per measurement
+LAZY_FILES = 10
+
+IMPORT_CODE = """
+from time import perf_counter
+start = perf_counter()
+import i18n
+print(perf_counter() - start)
+"""
+
+
+def measure_import() -> float:
+    output = subprocess.check_output((sys.executable, "-c", IMPORT_CODE), text=True)
+    return float(output)
+
+
+def best_of(number: int, func: Callable[[], float]) -> float:
+    return min(func() for _ in range(number))
+
+
+@contextmanager
+def catalog(shape: CatalogShape) -> Iterator[None]:
+    """Generates catalog and sets settings to load it, restores them afterwards"""
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings = generate(tmp_dir, shape)
+        saved = {key: config.get(key) for key in settings}
+        saved["load_path"] = list(saved["load_path"])
+        saved["filename_format"] = saved["filename_format"].template
+        for key, value in settings.items():
+            i18n.set(key, value)
+        i18n.unload_everything()
+        try:
+            yield
+        finally:
+            i18n.unload_everything()
+            for key, value in saved.items():
+                i18n.set(key, value)
+
+
+def measure_load() -> float:
+    i18n.unload_everything()
+    start = perf_counter()
+    i18n.load_everything()
+    return perf_counter() - start
+
+
+def measure_peak_memory() -> float:
+    i18n.unload_everything()
+    tracemalloc.start()
+    try:
+        i18n.load_everything()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_lazy(keys: Iterable[str]) -> float:
+    i18n.unload_everything()
+    start = perf_counter()
+    for key in keys:
+        i18n.t(key)
+    return perf_counter() - start
+
+
+def measure_lazy_miss(keys: Iterable[str], locale: str) -> float:
+    start = perf_counter()
+    for key in keys:
+        i18n.t(key, locale)
+    return perf_counter() - start
+
+
+def run_shape(shape: CatalogShape, number: int) -> Dict[str, float]:
+    """
+    Measures one catalog
+
+    :param shape: Catalog shape
+    :param number: Number of repetitions, the best result is used
+    :return: Loading time (ms), peak memory (KiB), cost of loading one file on demand
+    and cost of missing key in existing file (us)
+    """
+
+    locale = locale_names(shape)[0]
+    lazy_keys = [namespace + ".k0" for namespace in namespaces(shape)[:LAZY_FILES]]
+    missing_keys = [namespace + ".missing" for namespace in namespaces(shape)[:LAZY_FILES]]
+    with catalog(shape):
+        load = best_of(number, measure_load)
+        memory = best_of(number, measure_peak_memory)
+        lazy = best_of(number, lambda: measure_lazy(lazy_keys))
+        # files are already loaded by previous measurement
+        miss = best_of(number, lambda: measure_lazy_miss(missing_keys, locale))
+    return {
+        "load_everything (ms)": load * 1e3,
+        "peak memory (KiB)": memory / 1024,
+        "lazy load per file (us)": lazy / len(lazy_keys) * 1e6,
+        "miss per key (us)": miss / len(missing_keys) * 1e6,
+    }
+
+
+def main(number: int = 3, sizes: Iterable[int] = SIZES, **shape: Any) -> Dict[str, float]:
+    """
+    Runs benchmarks for all sizes
+
+    :param number: Number of repetitions
+    :param sizes: Total numbers of keys
+    :param **shape: Other parameters of `CatalogShape`
+    :return: Results
+    """
+
+    results = {"import i18n (ms)": best_of(number, measure_import) * 1e3}
+    print("{:<40} {:12.1f}".format("import i18n (ms)", results["import i18n (ms)"]))
+    for size in sizes:
+        catalog_shape = CatalogShape.with_keys(size, **shape)
+        for name, value in run_shape(catalog_shape, number).items():
+            name = "{} keys: {}".format(catalog_shape.total_keys, name)
+            results[name] = value
+            print("{:<40} {:12.1f}".format(name, value))
+    return results
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -0,0 +1,109 @@
+__all__ = ("CallTiming", "PHASES", "phase")
+
+import threading
+from time import perf_counter
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, FrozenSet, Optional
+
+from . import config
+
+
+# mirrors `timing_hook` setting
+hook: Optional[Callable[["CallTiming"], Any]] = config.get("timing_hook")
+
+PHASES = ("lookup", "search", "fallback", "pluralization", "substitution", "functions")
+
+_local = threading.local()
+_nothing = nullcontext()
+
+
+class CallTiming(object):
+    """
+    Durations of phases of one `t()` call in seconds
+
+    Passed to `timing_hook` after the call. `path` is one of:
+      - `"hit"`: translation was already loaded
+      - `"search"`: translation was loaded from files
+      - `"fallback"`: fallback locale was used
+      - `"missing"`: translation wasn't found
+
+    `substitution` doesn't include `pluralization` and `functions`.
+    Items of lists are formatted on access, so their formatting isn't measured
+    """
+
+    def __init__(self, key: str, locale: str, hook: Callable[["CallTiming"], Any]):
+        self.key = key
+        self.locale = locale
+        self.path = "hit"
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.total = 0.0
+        self.hook = hook
+        self._lap = 0.0
+
+    def phase(self, name: str) -> "_Phase":
+        return _Phase(self, name)
+
+    def lap(self, name: str) -> None:
+        """Adds time passed since the previous lap (or the start of the call) to the phase"""
+
+        now = perf_counter()
+        self.phases[name] += now - self._lap
+        self._lap = now
+
+    def __enter__(self) -> "CallTiming":
+        self.previous = getattr(_local, "current", None)
+        _local.current = self
+        self.start = self._lap = perf_counter()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.total = perf_counter() - self.start
+        _local.current = self.previous
+        self.phases["substitution"] -= self.phases["pluralization"] + self.phases["functions"]
+        self.hook(self)
+
+    def __repr__(self) -> str:
+        return "<{} {!r} {!r} {} {:.6f}s>".format(
+            self.__class__.__name__,
+            self.key,
+            self.locale,
+            self.path,
+            self.total,
+        )
+
+
+class _Phase(object):
+    def __init__(self, call: CallTiming, name: str):
+        self.call = call
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *_: Any) -> None:
+        self.call.phases[self.name] += perf_counter() - self.start
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Measures time of the block as a phase of the current `t()` call
+
+    Does nothing when `timing_hook` isn't set
+
+    :param name: One of `PHASES`
+    """
+
+    if hook is None:
+        return _nothing
+    call = getattr(_local, "current", None)
+    if call is None:
+        return _nothing
+    return call.phase(name)
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global hook
+
+    if "timing_hook" in changed:
+        hook = config.get("timing_hook")
@@ -1,15 +1,64 @@
-__all__ = ("set", "get")
+__all__ = (
+    "set",
+    "get",
+    "snapshot",
+    "subscribe",
+    "unsubscribe",
+    "locale_scope",
+    "bind_locale",
+    "reset_locale",
+    "current_locale",
+)
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, TYPE_CHECKING
 from importlib import reload as _reload
+from importlib.util import find_spec as _find_spec
+from contextvars import ContextVar, Token
 
-try:
-    import yaml
-    del yaml
+if TYPE_CHECKING:  # pragma: no cover
+    from .snapshot import ConfigSnapshot
 
-    yaml_available = True
-except ImportError:
-    yaml_available = False
+
+def _is_available(module: str) -> bool:
+    # checks for module without importing it
+    try:
+        return _find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+yaml_available: bool = _is_available("yaml")
+
+# incremented on every change of settings,
+# allows to detect that cached settings are outdated
+generation: int = globals().get("generation", 0)
+# functions called with names of changed settings
+# they are kept on reload
+_subscribers: List[Callable[[FrozenSet[str]], Any]] = globals().get("_subscribers", [])
+
+
+class LoadPath(List[str]):
+    """List of directories and archives that reports its modifications like `set()` does"""
+    pass
+
+
+def _notifying(method: Callable) -> Callable:
+    def wrapper(self: LoadPath, *args: Any, **kwargs: Any) -> Any:
+        result = method(self, *args, **kwargs)
+        _changed(("load_path",))
+        return result
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(LoadPath, _name, _notifying(getattr(list, _name)))
+del _name
 
 # try to get existing path object
 # in case if config is being reloaded
@@ -17,7 +66,12 @@ try:
     from . import load_path
     load_path.clear()
 except ImportError:
-    load_path = []
+    load_path = LoadPath()
+
+# keep the same variable to not lose bound locales on reload
+if "context_locale" not in globals():
+    # locale bound to the current thread or asyncio task
+    context_locale: ContextVar[Optional[str]] = ContextVar("i18n_locale", default=None)
 
 
 FILENAME_VARS = dict.fromkeys(
@@ -42,12 +96,24 @@ settings: Dict[str, Any] = {
     'plural_few': 5,
     'skip_locale_root_data': False,
     "enable_memoization": True,
+    "memoization_max_entries": None,
+    "memoization_max_bytes": None,
     "argument_delimiter": "|",
     "use_locale_dirs": False,
+    "lazy_static_refs": False,
+    "enable_metrics": False,
+    "profiler_sample_rate": None,
+    "trace_loading": False,
+    "timing_hook": None,
+    "record_loaded_files": False,
+    "catalog_backend": None,
+    "locale_idle_timeout": None,
+    "max_loaded_locales": None,
 }
 
 
-if "set" in globals():
+_reloading = "set" in globals()
+if _reloading:
     # deja vu, we've just been in this place before
     from . import formatters
 
@@ -65,9 +131,8 @@ def set(key: str, value: Any) -> None:
 
     if key not in settings:
         raise KeyError("Invalid setting: {0}".format(key))
-    elif key == 'load_path':
-        load_path.clear()
-        load_path.extend(value)
+    if key == 'load_path':
+        load_path[:] = value
         return
     elif key == 'filename_format':
         from .formatters import FilenameFormat
@@ -75,15 +140,19 @@ def set(key: str, value: Any) -> None:
         value = FilenameFormat(value, FILENAME_VARS)
 
     settings[key] = value
+    changed = [key]
 
     if settings["locale"] == settings["fallback"]:
         settings["fallback"] = None
+        changed.append("fallback")
 
     if key in ('placeholder_delimiter', 'namespace_delimiter'):
         from . import formatters
 
         _reload(formatters)
 
+    _changed(changed)
+
 
 def get(key: str) -> Any:
     """
@@ -97,5 +166,121 @@ def get(key: str) -> Any:
     return settings[key]
 
 
+_snapshot: Optional["ConfigSnapshot"] = None
+
+
+def snapshot() -> "ConfigSnapshot":
+    """
+    Gets settings as an immutable object with attributes
+
+    The same object is returned until settings change
+
+    :return: Snapshot of current settings
+    """
+
+    global _snapshot
+
+    if _snapshot is None or _snapshot.generation != generation:
+        from .snapshot import ConfigSnapshot
+
+        values: Dict[str, Any] = {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in settings.items()
+        }
+        _snapshot = ConfigSnapshot(generation=generation, **values)
+    return _snapshot
+
+
+def subscribe(callback: Callable[[FrozenSet[str]], Any]) -> Callable[[FrozenSet[str]], Any]:
+    """
+    Registers function that will be called after settings change
+
+    The function receives a frozenset of changed settings.
+    Modifications of `load_path` list are also reported.
+    Can be used as a decorator
+
+    :param callback: Function to call
+    :return: The same function
+    """
+
+    _subscribers.append(callback)
+    return callback
+
+
+def unsubscribe(callback: Callable[[FrozenSet[str]], Any]) -> None:
+    """
+    Removes function registered with `subscribe()`
+
+    :param callback: Function to remove
+    :raises ValueError: If function isn't registered
+    """
+
+    _subscribers.remove(callback)
+
+
+def _changed(keys: Iterable[str]) -> None:
+    global generation
+
+    generation += 1
+    changed = frozenset(keys)
+    for callback in tuple(_subscribers):
+        callback(changed)
+
+
+def bind_locale(locale: Optional[str]) -> Token:
+    """
+    Sets locale for the current context (thread or asyncio task)
+
+    It's used instead of `locale` setting when locale isn't passed to `t`
+
+    :param locale: Locale to use. `None` means using `locale` setting
+    :return: Token to restore previous locale with `reset_locale()`
+    """
+
+    return context_locale.set(locale)
+
+
+def reset_locale(token: Token) -> None:
+    """
+    Restores locale of the current context
+
+    :param token: Token returned by `bind_locale()`
+    """
+
+    context_locale.reset(token)
+
+
+class locale_scope(object):
+    """
+    Context manager that binds locale to the current context
+
+    Usage: `with locale_scope("fr"): ...`
+    """
+
+    def __init__(self, locale: Optional[str]):
+        self.locale = locale
+        self.tokens: List[Token] = []
+
+    def __enter__(self) -> None:
+        self.tokens.append(context_locale.set(self.locale))
+
+    def __exit__(self, *_: Any) -> None:
+        context_locale.reset(self.tokens.pop())
+
+
+def current_locale() -> str:
+    """
+    Gets locale of the current context
+
+    :return: Bound locale or `locale` setting if nothing is bound
+    """
+
+    return context_locale.get() or settings["locale"]
+
+
 # initialize FilenameFormat
 set('filename_format', get('filename_format'))
+
+if _reloading:
+    # all settings have been reset
+    _changed(settings)
@@ -1,4 +1,4 @@
-__all__ = ("add_function", "get_function")
+__all__ = ("add_function", "get_function", "functions_for")
 
 from collections import defaultdict
 from typing import Optional, Callable, Dict
@@ -7,6 +7,8 @@ from typing import Optional, Callable, Dict
 Function = Callable[..., str]
 global_functions: Dict[str, Function] = {}
 locales_functions: Dict[str, Dict[str, Function]] = defaultdict(dict)
+# incremented when a function is added
+generation = 0
 
 
 def add_function(name: str, func: Function, locale: Optional[str] = None) -> None:
@@ -23,13 +25,29 @@ def add_function(name: str, func: Function, locale: Optional[str] = None) -> Non
     :param locale: Locale to which function will be bound (optional)
     """
 
+    global generation
+
     if locale:
         locales_functions[locale][name] = func
     else:
         global_functions[name] = func
+    generation += 1
 
 
 def get_function(name: str, locale: Optional[str] = None) -> Optional[Function]:
     if locale and name in locales_functions[locale]:
         return locales_functions[locale][name]
     return global_functions.get(name)
+
+
+def functions_for(locale: str) -> Dict[str, Function]:
+    """
+    Gets all functions available in the locale
+
+    The result isn't updated when functions are added, see `generation`
+
+    :param locale: Locale
+    :return: Global functions merged with functions of the locale
+    """
+
+    return {**global_functions, **locales_functions.get(locale, {})}
@@ -0,0 +1,163 @@
+__all__ = ("evict", "evict_idle", "loaded_locales")
+
+import os.path
+import threading
+from time import monotonic
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from . import config
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .resource_loader import TranslationFile
+
+
+# whether `locale_idle_timeout` or `max_loaded_locales` is set
+enabled: bool = (
+    config.get("locale_idle_timeout") is not None
+    or config.get("max_loaded_locales") is not None
+)
+
+# time of the last access to every loaded locale
+_last_access: Dict[str, float] = {}
+# absolute paths of loaded files by locale, `None` is for multilingual files
+_files: Dict[Optional[str], Set[str]] = {}
+_next_sweep = 0.0
+_lock = threading.RLock()
+
+
+def record(file: "TranslationFile", locales: Iterable[str]) -> None:
+    """
+    Remembers loaded file, so that it can be loaded again after eviction
+
+    :param file: Loaded file
+    :param locales: Locales found in the file
+    """
+
+    if not enabled:
+        return
+    path = os.path.abspath(os.path.join(file.base_directory, file.filename))
+    now = monotonic()
+    with _lock:
+        _files.setdefault(file.locale, set()).add(path)
+        for locale in locales:
+            _last_access.setdefault(locale, now)
+
+
+def touch(locale: str) -> None:
+    """
+    Marks locale as used and evicts cold locales if it's time to
+
+    Callers are expected to check `enabled` first
+
+    :param locale: Used locale
+    """
+
+    now = monotonic()
+    new = locale not in _last_access
+    _last_access[locale] = now
+    if now >= _next_sweep or new and config.get("max_loaded_locales") is not None:
+        _evict_idle(locale)
+
+
+def loaded_locales() -> List[str]:
+    """Gets tracked locales, from the most recently used"""
+
+    return [locale for locale, _ in _by_access()]
+
+
+def _by_access() -> List[Tuple[str, float]]:
+    # copying is atomic, so `touch()` doesn't need the lock
+    return sorted(list(_last_access.items()), key=lambda item: item[1], reverse=True)
+
+
+def evict(locale: str) -> bool:
+    """
+    Removes translations of the locale, they're loaded again on the next miss
+
+    Locked locales aren't evicted
+
+    :param locale: Locale to evict
+    :return: Whether the locale was evicted
+    """
+
+    from . import resource_loader, translations
+    from .loaders import Loader
+
+    if resource_loader._check_locked(locale):
+        return False
+    with _lock:
+        _last_access.pop(locale, None)
+        paths = _files.pop(locale, set()) | _files.get(None, set())
+        translations.clear(locale)
+        # files must be read again instead of being reported as already loaded
+        for path in paths:
+            Loader.loaded_files.pop(path, None)
+    if resource_loader._preloader is not None:
+        resource_loader._preloader.forget(locale)
+    return True
+
+
+def evict_idle() -> List[str]:
+    """
+    Evicts locales according to `locale_idle_timeout` and `max_loaded_locales` settings
+
+    It's called automatically during translation, but can also be called
+    periodically, e.g. from a background task.
+    Default locale and fallback are never evicted
+
+    :return: Evicted locales
+    """
+
+    return _evict_idle(None)
+
+
+def _evict_idle(used_locale: Optional[str]) -> List[str]:
+    global _next_sweep
+
+    timeout = config.get("locale_idle_timeout")
+    max_locales = config.get("max_loaded_locales")
+    protected = {config.get("locale"), config.get("fallback")}
+    now = monotonic()
+    evicted = []
+    with _lock:
+        if timeout is not None:
+            # idle locales are evicted at most `timeout` later than they could be
+            _next_sweep = now + timeout
+        else:
+            _next_sweep = float("inf")
+        candidates = [item for item in _by_access() if item[0] not in protected]
+        for i, (locale, last_access) in enumerate(candidates):
+            # the locale that is being used is kept, but it's counted
+            if locale != used_locale and (
+                (timeout is not None and now - last_access >= timeout)
+                or (max_locales is not None and i >= max_locales)
+            ) and evict(locale):
+                evicted.append(locale)
+    return evicted
+
+
+def clear() -> None:
+    """Forgets tracked locales and files"""
+
+    with _lock:
+        _last_access.clear()
+        _files.clear()
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global enabled, _next_sweep
+
+    if {"locale_idle_timeout", "max_loaded_locales"} & changed:
+        was_enabled = enabled
+        enabled = (
+            config.get("locale_idle_timeout") is not None
+            or config.get("max_loaded_locales") is not None
+        )
+        _next_sweep = 0.0
+        if enabled and not was_enabled:
+            from .loaders import Loader
+
+            # files loaded meanwhile weren't recorded, so they must be read again when needed
+            with _lock:
+                Loader.loaded_files.clear()
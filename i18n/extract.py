@@ -0,0 +1,255 @@
+__all__ = ("KeyManifest", "scan_source", "extract_keys")
+
+import os
+import ast
+import warnings
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from . import config
+
+
+# names of functions and methods whose first argument is a translation key
+FUNCTIONS = ("t", "at", "compile_key")
+
+MANIFEST_VERSION = 1
+
+
+class KeyManifest(object):
+    """
+    Translation keys used by an application
+
+    `prefixes` are literal beginnings of keys built at runtime, e.g. `"errors."` for
+    `t(f"errors.{code}")`, all keys that start with them are loaded.
+    `dynamic` contains locations (`"path:line"`) of keys which can't be determined at all,
+    they're resolved lazily by searching as usual
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        dynamic: Iterable[str] = (),
+    ):
+        self.keys = frozenset(keys)
+        self.prefixes = tuple(sorted(set(prefixes)))
+        self.dynamic = tuple(dynamic)
+        self._namespaces: Optional[Set[str]] = None
+
+    def wants(self, key: str) -> bool:
+        return key in self.keys or key.startswith(self.prefixes)
+
+    def may_contain(self, namespace: str) -> bool:
+        """
+        Checks whether file with the namespace may contain wanted keys
+
+        :param namespace: Namespace of file
+        """
+
+        if not namespace:
+            return True
+        delimiter = config.get("namespace_delimiter")
+        if self._namespaces is None:
+            namespaces = set()
+            for key in self.keys:
+                parts = key.split(delimiter)
+                for i in range(1, len(parts)):
+                    namespaces.add(delimiter.join(parts[:i]))
+            self._namespaces = namespaces
+        if namespace in self._namespaces:
+            return True
+        namespace += delimiter
+        return any(
+            prefix.startswith(namespace) or namespace.startswith(prefix)
+            for prefix in self.prefixes
+        )
+
+    def select(self, translations: Dict[str, Any]) -> List[str]:
+        """
+        Selects wanted keys together with keys they reference statically
+
+        :param translations: Flattened translations of one file
+        :return: Selected keys in the original order
+        """
+
+        queue = [key for key in translations if self.wants(key)]
+        selected = set(queue)
+        while queue:
+            key = queue.pop()
+            for dependency in _static_refs(key, translations[key]):
+                if dependency in translations and dependency not in selected:
+                    selected.add(dependency)
+                    queue.append(dependency)
+        return [key for key in translations if key in selected]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "keys": sorted(self.keys),
+            "prefixes": list(self.prefixes),
+            "dynamic": list(self.dynamic),
+        }
+
+    def save(self, path: str) -> None:
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path: str) -> "KeyManifest":
+        """
+        Loads manifest saved by `save()`
+
+        :param path: Path of manifest
+        :return: Loaded manifest
+        :raises ValueError: If manifest has unsupported version
+        """
+
+        import json
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError("unsupported manifest version: {!r}".format(data.get("version")))
+        return cls(data["keys"], data["prefixes"], data["dynamic"])
+
+    def __repr__(self) -> str:
+        return "<{} {} keys, {} prefixes, {} dynamic>".format(
+            self.__class__.__name__,
+            len(self.keys),
+            len(self.prefixes),
+            len(self.dynamic),
+        )
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def _static_refs(key: str, value: Any) -> Iterator[str]:
+    # all keys that `StaticRefResolver.resolve_ref()` may check
+    from .formatters import StaticFormatter
+
+    delimiter = config.get("namespace_delimiter")
+    path = key.split(delimiter)
+    for string in _strings(value):
+        if StaticFormatter.delimiter not in string:
+            continue
+        for match in StaticFormatter.pattern.finditer(string):
+            ref = match.group("named") or match.group("braced")
+            if ref is None:
+                continue
+            yield ref.lstrip(delimiter)
+            for i in range(1, len(path)):
+                yield delimiter.join(path[:i]) + ref
+
+
+def _literal_prefix(node: ast.expr) -> Tuple[Optional[str], bool]:
+    # returns string or its literal beginning and whether the string is complete
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, True
+    if isinstance(node, ast.JoinedStr) and node.values:
+        prefix, _ = _literal_prefix(node.values[0])
+        return prefix, False
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        prefix, complete = _literal_prefix(node.left)
+        if complete and prefix is not None:
+            right, complete = _literal_prefix(node.right)
+            if right is not None:
+                return prefix + right, complete
+        return prefix, False
+    return None, False
+
+
+def _called_name(node: ast.Call) -> Optional[str]:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def scan_source(
+    source: Union[str, bytes],
+    filename: str = "<string>",
+    functions: Iterable[str] = FUNCTIONS,
+) -> KeyManifest:
+    """
+    Finds translation keys in Python source code
+
+    :param source: Source code
+    :param filename: Name of file used in `dynamic` and error messages
+    :param functions: Names of translation functions
+    :return: Found keys
+    :raises SyntaxError: If the source code is invalid
+    """
+
+    functions = frozenset(functions)
+    keys = []
+    prefixes = []
+    dynamic = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if not isinstance(node, ast.Call) or not node.args:
+            continue
+        if _called_name(node) not in functions:
+            continue
+        value, complete = _literal_prefix(node.args[0])
+        if complete and value is not None:
+            keys.append(value)
+        elif value:
+            prefixes.append(value)
+        else:
+            dynamic.append(node.lineno)
+    return KeyManifest(
+        keys,
+        prefixes,
+        ("{}:{}".format(filename, line) for line in sorted(dynamic)),
+    )
+
+
+def _python_files(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for directory, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(".py"):
+                    yield os.path.join(directory, name)
+
+
+def extract_keys(paths: Iterable[str], functions: Iterable[str] = FUNCTIONS) -> KeyManifest:
+    """
+    Finds translation keys in Python files
+
+    Files with syntax errors are skipped with a warning
+
+    :param paths: Files and directories to scan
+    :param functions: Names of translation functions
+    :return: Found keys
+    """
+
+    functions = tuple(functions)
+    keys: Set[str] = set()
+    prefixes: Set[str] = set()
+    dynamic: List[str] = []
+    for path in _python_files(paths):
+        with open(path, "rb") as f:
+            source = f.read()
+        try:
+            found = scan_source(source, path, functions)
+        except SyntaxError as e:
+            warnings.warn("skipping {}: {}".format(path, e))
+            continue
+        keys.update(found.keys)
+        prefixes.update(found.prefixes)
+        dynamic.extend(found.dynamic)
+    return KeyManifest(keys, prefixes, dynamic)
@@ -1,15 +1,39 @@
-__all__ = ("TranslationFormatter", "StaticFormatter", "FilenameFormat", "expand_static_refs")
-
-from re import Match, compile, escape
+__all__ = (
+    "TranslationFormatter",
+    "StaticFormatter",
+    "StaticRefResolver",
+    "FilenameFormat",
+    "expand_static_refs",
+    "defer_static_refs",
+)
+
+import sys
+from re import Match, Pattern, compile, escape
 from string import Template, Formatter as _Fmt
-from typing import Any, Iterable, Optional, Set, Callable, Tuple, TypeVar, NoReturn
+from typing import (
+    Any, ContextManager, Dict, Iterable, Optional, Set, List, Callable, Tuple, TypeVar, NoReturn,
+)
+from contextlib import nullcontext
+from functools import cached_property
 from collections.abc import Mapping
 
-from . import config, translations
+from . import config, translations, metrics
 from .translations import TranslationType
 from .translator import pluralize
 from .errors import I18nInvalidStaticRef, I18nInvalidFormat
-from .custom_functions import get_function
+from .custom_functions import Function, get_function
+
+
+_nothing = nullcontext()
+
+
+def _timing_phase(name: str) -> ContextManager[None]:
+    # `call_timing` is imported only when `timing_hook` is set
+    if config.get("timing_hook") is None:
+        return _nothing
+    from .call_timing import phase
+
+    return phase(name)
 
 
 if config.get("namespace_delimiter") != "-":
@@ -32,6 +56,11 @@ class Formatter(
     # for mypy
     _invalid: Callable[[Match], NoReturn]
 
+    if sys.version_info >= (3, 9):  # pragma: no branch
+        def __init_subclass__(cls) -> None:
+            # pattern is compiled on first use by `_LazyPattern`
+            pass
+
     def __init__(self, translation_key: str, locale: str, value: TranslationType, kwargs: dict):
         super().__init__(value)  # type: ignore[arg-type]
         self.translation_key = translation_key
@@ -71,10 +100,17 @@ class Formatter(
         if isinstance(self.template, str):
             return self._format_str()
         if isinstance(self.template, dict):
+            template = self.template
             result = {}
-            for k, v in self.template.items():
+            for k, v in template.items():
                 self.template = v
                 result[k] = self.format()
+            if isinstance(template, translations.PluralForms):
+                forms = []
+                for v in template.forms:
+                    self.template = v
+                    forms.append(self.format())
+                return translations.PluralForms(result, forms, template.rule)
             return result
         # assuming list/tuple
         result = []
@@ -93,6 +129,35 @@ class Formatter(
         return self.kwargs.__iter__()
 
 
+class _LazyPattern(object):
+    """
+    Compiles `pattern` of a formatter class when it's accessed for the first time
+
+    Only works since Python 3.9, earlier `Template` compiles it in its metaclass
+    """
+
+    def __init__(self) -> None:
+        self._own: Optional[Pattern] = None
+
+    def __get__(self, instance: Optional[Formatter], owner: type) -> Pattern:
+        if owner is Formatter:
+            # the descriptor has to stay in `Formatter` for its subclasses,
+            # so the pattern is compiled for a temporary subclass
+            if self._own is None:
+                class Compiled(Formatter):
+                    pass
+
+                self._own = Compiled.pattern
+            return self._own
+        # the same as at class creation, stores compiled pattern in the class
+        Template.__init_subclass__.__func__(owner)  # type: ignore[attr-defined]
+        return owner.pattern  # type: ignore[attr-defined]
+
+
+if sys.version_info >= (3, 9):  # pragma: no branch
+    Formatter.pattern = _LazyPattern()  # type: ignore[assignment]
+
+
 class WrappedException(Exception):
     pass
 
@@ -107,29 +172,43 @@ class TranslationFormatter(Formatter):
         )?
     """
 
-    def __init__(self, translation_key: str, locale: str, value: TranslationType, kwargs: dict):
+    def __init__(
+        self,
+        translation_key: str,
+        locale: str,
+        value: TranslationType,
+        kwargs: dict,
+        functions: Optional[Dict[str, Function]] = None,
+    ):
+        """
+        :param functions: Functions available in the locale (optional),
+        see `custom_functions.functions_for()`. If not provided, they're found on every call
+        """
+
         super().__init__(translation_key, locale, value, kwargs)
+        self.functions = functions
         self.pluralized = False
 
     def format(self) -> TranslationType:
         if not self.pluralized and "count" in self.kwargs:
-            if isinstance(self.template, tuple):
-                self.template = tuple(
-                    pluralize(
+            with _timing_phase("pluralization"):
+                if isinstance(self.template, tuple):
+                    self.template = tuple(
+                        pluralize(
+                            self.translation_key,
+                            self.locale,
+                            i,
+                            self.kwargs["count"],
+                        )
+                        for i in self.template
+                    )
+                else:
+                    self.template = pluralize(
                         self.translation_key,
                         self.locale,
-                        i,
+                        self.template,
                         self.kwargs["count"],
                     )
-                    for i in self.template
-                )
-            else:
-                self.template = pluralize(
-                    self.translation_key,
-                    self.locale,
-                    self.template,
-                    self.kwargs["count"],
-                )
             self.pluralized = True
         return super().format()
 
@@ -143,7 +222,10 @@ class TranslationFormatter(Formatter):
     def __getitem__(self, key: str) -> Any:
         name, _, args = key.partition("(")
         if args:
-            f = get_function(name, self.locale)
+            if self.functions is None:
+                f = get_function(name, self.locale)
+            else:
+                f = self.functions.get(name)
             if f:
                 args = args.strip(")")
                 if args:
@@ -151,7 +233,8 @@ class TranslationFormatter(Formatter):
                 else:
                     arg_list = []
                 try:
-                    return f(*arg_list, **self.kwargs)
+                    with _timing_phase("functions"):
+                        return f(*arg_list, **self.kwargs)
                 except KeyError as e:
                     # wrap KeyError from user's function
                     # to avoid treating it as missing placeholder
@@ -172,43 +255,105 @@ class StaticFormatter(Formatter):
         _name_pattern,
     )
 
-    def __init__(self, translation_key: str, locale: str, value: TranslationType):
+    def __init__(
+        self,
+        translation_key: str,
+        locale: str,
+        value: TranslationType,
+        resolver: Optional["StaticRefResolver"] = None,
+    ):
         super().__init__(translation_key, locale, value, {})
-        self.path = translation_key.split(config.get("namespace_delimiter"))
+        self.resolver = resolver if resolver is not None else StaticRefResolver(locale)
 
     def _format_str(self) -> str:
         return self.substitute(static=True)
 
     def __getitem__(self, key: str) -> Any:
-        delim = config.get("namespace_delimiter")
-        full_key = key.lstrip(delim)
+        return self.resolver.resolve_ref(key, self.translation_key)
+
+
+class StaticRefResolver(object):
+    """
+    Expands static references in translations of one locale
+
+    References form a dependency graph which is walked depth-first,
+    so each translation is expanded only once (after everything it depends on)
+    and circular references are reported with the whole chain
+    """
 
-        for i in range(1, len(self.path) + 1):
+    def __init__(self, locale: str):
+        self.locale = locale
+        self.delimiter = config.get("namespace_delimiter")
+        self.expanded: Set[str] = set()
+        self.chain: List[str] = []
+
+    def expand(self, key: str) -> TranslationType:
+        value = translations.get(key, self.locale)
+        if key in self.expanded:
+            return value
+        if key in self.chain:
+            cycle = self.chain[self.chain.index(key):] + [key]
+            raise I18nInvalidStaticRef(
+                "circular static reference: {}".format(" -> ".join(map(repr, cycle))),
+            )
+        # strings without delimiter can be skipped,
+        # other values must be formatted anyway to convert lists into tuples
+        if not isinstance(value, str) or StaticFormatter.delimiter in value:
+            self.chain.append(key)
             try:
-                # keep expanding in case of nested references
-                # python will throw an exception if there's a recursive reference
-                expand_static_refs((full_key,), self.locale)
-                return translations.get(full_key, self.locale)
-            except KeyError:
-                full_key = delim.join(self.path[:i]) + key
+                value = StaticFormatter(key, self.locale, value, self).format()
+            finally:
+                self.chain.pop()
+            translations.add(key, value, self.locale)
+            if metrics.enabled:
+                metrics.increment("static_refs_expanded")
+        self.expanded.add(key)
+        if translations.deferred:
+            translations.deferred.get(self.locale, set()).discard(key)
+        return value
+
+    def resolve_ref(self, ref: str, translation_key: str) -> TranslationType:
+        delim = self.delimiter
+        path = translation_key.split(delim)
+        full_key = ref.lstrip(delim)
+
+        for i in range(1, len(path) + 1):
+            if translations.has(full_key, self.locale):
+                return self.expand(full_key)
+            full_key = delim.join(path[:i]) + ref
 
         # try to search in other files
         from .resource_loader import search_translation
 
-        full_key = key.lstrip(delim)
+        full_key = ref.lstrip(delim)
         if search_translation(full_key, self.locale):
-            return translations.get(full_key, self.locale)
+            return self.expand(full_key)
         raise I18nInvalidStaticRef(
             "no value found for static reference {!r} (in {!r})"
-            .format(key, self.translation_key),
+            .format(ref, translation_key),
         )
 
 
 def expand_static_refs(keys: Iterable[str], locale: str) -> None:
+    resolver = StaticRefResolver(locale)
+    for key in keys:
+        resolver.expand(key)
+
+
+def defer_static_refs(keys: Iterable[str], locale: str) -> None:
+    """
+    Marks translations to expand their static references on first access
+
+    :param keys: Keys of loaded translations
+    :param locale: Locale of the translations
+    """
+
+    delimiter = StaticFormatter.delimiter
+    deferred = translations.deferred.setdefault(locale, set())
     for key in keys:
-        tr = translations.get(key, locale)
-        tr = StaticFormatter(key, locale, tr).format()
-        translations.add(key, tr, locale)
+        value = translations.get(key, locale)
+        if not isinstance(value, str) or delimiter in value:
+            deferred.add(key)
 
 
 # This is (hopefully) a temporary workaround
@@ -222,7 +367,11 @@ class FilenameFormat(_Fmt):
         self.template = template
         self.variables = variables
         self.used_variables: Set[str] = set()
-        self.pattern = compile(super().format(template))
+        self.regex = super().format(template)
+
+    @cached_property
+    def pattern(self) -> Pattern:
+        return compile(self.regex)
 
     @property
     def format(self) -> Callable[..., str]:
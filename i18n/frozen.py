@@ -0,0 +1,137 @@
+__all__ = ("FreezeReport", "freeze")
+
+import sys
+from itertools import islice
+from time import perf_counter
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Tuple
+
+from . import config, translations, resource_loader, formatters
+from .backends.frozen_backend import FrozenBackend
+from .translator import compile_template, _update_extras
+
+
+# number of lookups used to measure speedup
+SAMPLE_SIZE = 1000
+
+
+class FreezeReport(NamedTuple):
+    locales: int
+    keys: int
+    # estimated memory used by translations
+    bytes_before: int
+    bytes_after: int
+    # average time of finding translation of a sampled key, in nanoseconds
+    lookup_before: float
+    lookup_after: float
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def speedup(self) -> float:
+        return self.lookup_before / self.lookup_after if self.lookup_after else 1.0
+
+
+def _lookup(key: str, locale: str, fallback: Any) -> Any:
+    # the same steps as in `t()` before freezing
+    if translations.has(key, locale) or resource_loader.search_translation(key, locale):
+        return translations.get(key, locale)
+    if fallback and translations.has(key, fallback):
+        return translations.get(key, fallback)
+    return None
+
+
+def _frozen_lookup(backend: FrozenBackend, key: str, locale: str) -> Any:
+    try:
+        return backend.resolve(key, locale)
+    except KeyError:
+        return None
+
+
+def _measure(func: Callable[[str, str], Any], sample: List[Tuple[str, str]]) -> float:
+    start = perf_counter()
+    for key, locale in sample:
+        func(key, locale)
+    return (perf_counter() - start) / len(sample) * 1e9 if sample else 0.0
+
+
+def freeze() -> FreezeReport:
+    """
+    Replaces loaded translations with immutable copy optimized for lookups
+
+    All translations are locked, static references are expanded,
+    keys are interned and equal strings are shared between locales.
+    Fallback translations are merged into every locale and plain templates are compiled,
+    so `t()` finds and formats translations without searching.
+    Translations of the default backend are released, other backends keep their data.
+    Frozen translations can't be changed until `unload_everything()`
+
+    :return: Estimated memory usage and lookup time before and after freezing
+    """
+
+    resource_loader._lock(None)
+    for locale, keys in list(translations.deferred.items()):
+        formatters.expand_static_refs(list(keys), locale)
+    translations.deferred.clear()
+
+    source = translations.backend
+    fallback = config.get("fallback")
+    strings: Dict[str, str] = {}
+    catalogs: Dict[str, Dict[str, translations.TranslationType]] = {}
+    for locale in source.locales():
+        catalog = {}
+        for key in source.keys(locale):
+            value = source.get(key, locale)
+            if isinstance(value, str):
+                value = strings.setdefault(value, value)
+            catalog[sys.intern(key)] = value
+        if catalog:
+            catalogs[locale] = catalog
+
+    fallback_catalog = catalogs.get(fallback, {}) if fallback else {}
+    merged = {}
+    from_fallback: Dict[str, FrozenSet[str]] = {}
+    no_keys: FrozenSet[str] = frozenset()
+    for locale, catalog in catalogs.items():
+        missing = fallback_catalog.keys() - catalog.keys()
+        if missing:
+            catalog = dict(catalog)
+            catalog.update((key, fallback_catalog[key]) for key in missing)
+        merged[locale] = catalog
+        from_fallback[locale] = frozenset(missing) if missing else no_keys
+
+    delimiter = formatters.TranslationFormatter.delimiter
+    templates = {}
+    for string in strings:
+        if delimiter in string:
+            compiled = compile_template(string)
+            if compiled is not None:
+                templates[string] = compiled
+
+    backend = FrozenBackend(
+        merged,
+        from_fallback,
+        fallback if fallback in merged else None,
+        templates,
+        config.generation,
+    )
+    reference = fallback_catalog or next(iter(catalogs.values()), {})
+    per_locale = max(1, SAMPLE_SIZE // max(1, len(catalogs)))
+    sample = [(key, locale) for locale in catalogs for key in islice(reference, per_locale)]
+    report = FreezeReport(
+        locales=len(catalogs),
+        keys=sum(map(len, catalogs.values())),
+        bytes_before=source.memory_usage(),
+        bytes_after=backend.memory_usage(),
+        lookup_before=_measure(lambda key, locale: _lookup(key, locale, fallback), sample),
+        lookup_after=_measure(lambda key, locale: _frozen_lookup(backend, key, locale), sample),
+    )
+    backend.report = report
+
+    translations.backend = translations.frozen = backend
+    translations.generation += 1
+    _update_extras()
+    if source is translations._default_backend:
+        source.clear()
+    return report
@@ -0,0 +1,234 @@
+__all__ = ("FileTrace", "traces", "clear", "report", "report_json")
+
+import os.path
+import threading
+from collections import deque
+from time import perf_counter
+from contextlib import nullcontext
+from typing import Any, ContextManager, Deque, Dict, FrozenSet, List, Optional, TYPE_CHECKING
+
+from . import config
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .resource_loader import TranslationFile
+
+
+# mirrors `trace_loading` setting
+enabled: bool = config.get("trace_loading")
+
+PHASES = ("discovery", "read", "parse", "flatten", "static_refs")
+# number of kept traces, the oldest ones are dropped
+MAX_TRACES = 10000
+
+_local = threading.local()
+# traces of files that were found or read, but not added yet
+_pending: Dict["TranslationFile", "FileTrace"] = {}
+_finished: Deque["FileTrace"] = deque(maxlen=MAX_TRACES)
+_lock = threading.Lock()
+_nothing = nullcontext()
+
+
+class FileTrace(object):
+    """
+    Time spent on loading one translation file, in seconds
+
+    `static_refs` includes loading of files found through static references,
+    these files have their own traces
+    """
+
+    def __init__(self, file: "TranslationFile", lazy: bool):
+        self.path = os.path.join(file.base_directory, file.filename)
+        self.locale = file.locale
+        # whether the file was loaded on demand (by `search_translation()` or `ensure_loaded()`)
+        self.lazy = lazy
+        self.loader: Optional[str] = None
+        self.keys = 0
+        self.discovery = 0.0
+        self.read = 0.0
+        self.parse = 0.0
+        self.flatten = 0.0
+        self.static_refs = 0.0
+
+    @property
+    def total(self) -> float:
+        return sum(getattr(self, phase) for phase in PHASES)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "path": self.path,
+            "locale": self.locale,
+            "lazy": self.lazy,
+            "loader": self.loader,
+            "keys": self.keys,
+        }
+        result.update((phase, getattr(self, phase)) for phase in PHASES)
+        result["total"] = self.total
+        return result
+
+    def __repr__(self) -> str:
+        return "<{} {!r} {:.6f}s>".format(self.__class__.__name__, self.path, self.total)
+
+
+class _Phase(object):
+    def __init__(self, trace: FileTrace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *_: Any) -> None:
+        elapsed = perf_counter() - self.start
+        setattr(self.trace, self.name, getattr(self.trace, self.name) + elapsed)
+
+
+class _FileContext(object):
+    def __init__(self, trace: FileTrace, file: "TranslationFile", finish: bool):
+        self.trace = trace
+        self.file = file
+        self.finish = finish
+
+    def __enter__(self) -> FileTrace:
+        self.previous = getattr(_local, "current", None)
+        _local.current = self.trace
+        return self.trace
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        _local.current = self.previous
+        # the file won't be added if reading or adding has failed
+        if self.finish or exc_type is not None:
+            with _lock:
+                _pending.pop(self.file, None)
+                if exc_type is None:
+                    _finished.append(self.trace)
+
+
+def _get_pending(file: "TranslationFile", lazy: bool) -> FileTrace:
+    with _lock:
+        trace = _pending.get(file)
+        if trace is None:
+            trace = _pending[file] = FileTrace(file, lazy)
+        return trace
+
+
+def discovered(file: "TranslationFile", seconds: float, lazy: bool) -> None:
+    """Records time spent on finding the file"""
+
+    _get_pending(file, lazy).discovery += seconds
+
+
+def discard(file: "TranslationFile") -> None:
+    """Forgets trace of the file that won't be loaded, e.g. because loading was cancelled"""
+
+    if _pending:
+        with _lock:
+            _pending.pop(file, None)
+
+
+def file_context(file: "TranslationFile", finish: bool = False) -> ContextManager[Any]:
+    """
+    Makes phases measured in the current thread count towards the file
+
+    :param file: File that is being loaded
+    :param finish: Whether the file will be loaded completely after leaving the context
+    """
+
+    if not enabled:
+        return _nothing
+    return _FileContext(_get_pending(file, False), file, finish)
+
+
+def current() -> Optional[FileTrace]:
+    """Gets trace of the file that is being loaded in the current thread"""
+
+    return getattr(_local, "current", None)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Measures time of the block as a phase of the current file
+
+    Does nothing when there's no current file
+
+    :param name: One of `PHASES`
+    """
+
+    trace = getattr(_local, "current", None)
+    if trace is None:
+        return _nothing
+    return _Phase(trace, name)
+
+
+def traces() -> List[FileTrace]:
+    """
+    Gets traces of loaded files in order of loading
+
+    Traces are recorded only while `trace_loading` setting is `True`,
+    only the last `MAX_TRACES` of them are kept
+
+    :return: List of traces
+    """
+
+    with _lock:
+        return list(_finished)
+
+
+def clear() -> None:
+    """Removes recorded traces"""
+
+    with _lock:
+        _pending.clear()
+        _finished.clear()
+
+
+def _sorted(sort_by: str, limit: Optional[int]) -> List[FileTrace]:
+    if sort_by not in ("total", "keys") + PHASES:
+        raise ValueError("can't sort by {!r}".format(sort_by))
+    return sorted(traces(), key=lambda trace: getattr(trace, sort_by), reverse=True)[:limit]
+
+
+def report(sort_by: str = "total", limit: Optional[int] = None) -> str:
+    """
+    Formats traces as a text table, the slowest files first
+
+    :param sort_by: Column to sort by: `"total"`, `"keys"` or one of `PHASES`
+    :param limit: Maximum number of files (optional)
+    :return: Text report
+    :raises ValueError: If `sort_by` is invalid
+    """
+
+    columns = ("total",) + PHASES
+    lines = [
+        "  ".join("{:>11}".format(column) for column in columns)
+        + "  {:>7}  {:<5}  file".format("keys", "lazy"),
+    ]
+    for trace in _sorted(sort_by, limit):
+        lines.append(
+            "  ".join("{:>11.6f}".format(getattr(trace, column)) for column in columns)
+            + "  {:>7}  {:<5}  {} ({}, {})".format(
+                trace.keys,
+                "yes" if trace.lazy else "no",
+                trace.path,
+                trace.locale or "all locales",
+                trace.loader,
+            ),
+        )
+    return "\n".join(lines)
+
+
+def report_json(sort_by: str = "total", limit: Optional[int] = None) -> str:
+    """
+    Same as `report()`, but returns JSON array of objects
+    """
+
+    import json
+
+    return json.dumps([trace.to_dict() for trace in _sorted(sort_by, limit)])
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global enabled
+
+    if "trace_loading" in changed:
+        enabled = config.get("trace_loading")
@@ -1,12 +1,37 @@
-__all__: tuple = ("Loader", "PythonLoader", "I18nFileLoadError", "JsonLoader")
+__all__: tuple = (
+    "Loader",
+    "LoadedFilesCache",
+    "PythonLoader",
+    "I18nFileLoadError",
+    "JsonLoader",
+    "StreamingJsonLoader",
+    "MoLoader",
+)
 
-from .loader import Loader
+from typing import Any
+from importlib import import_module
+
+from .loader import Loader, LoadedFilesCache
 from ..errors import I18nFileLoadError
-from .python_loader import PythonLoader
 from .. import config
-from .json_loader import JsonLoader
+
+# loaders are imported on first use
+_LAZY = {
+    "PythonLoader": "python_loader",
+    "JsonLoader": "json_loader",
+    "StreamingJsonLoader": "json_loader",
+    "MoLoader": "mo_loader",
+}
 if config.yaml_available:
-    from .yaml_loader import YamlLoader
+    _LAZY["YamlLoader"] = "yaml_loader"
     __all__ += ("YamlLoader",)
 
 del config
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(import_module("." + _LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
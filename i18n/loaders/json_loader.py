@@ -1,6 +1,13 @@
+import re
+import io
 import json
+import mmap
+import codecs
+import os.path
+from typing import Dict, Optional, Tuple, Union
 
 from . import Loader, I18nFileLoadError
+from .. import config, metrics, load_trace, archives
 
 
 class JsonLoader(Loader):
@@ -13,3 +20,180 @@ class JsonLoader(Loader):
             return json.loads(file_content)
         except json.JSONDecodeError as e:
             raise I18nFileLoadError("invalid JSON: {0}".format(e.args[0])) from e
+
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,:\[\]{}\s]*")
+_TOKEN = re.compile(rb'[\[\]{}"]')
+_OPENING = frozenset(b"[{")
+
+Buffer = Union[bytes, mmap.mmap]
+
+# encodings in which structural JSON characters can't be a part of multibyte sequences
+_SCANNABLE_ENCODINGS = frozenset(("utf-8", "utf-8-sig", "ascii"))
+
+
+class JsonIndex(Dict[str, Tuple[int, int]]):
+    """Maps top-level keys of json file to byte offsets of their values"""
+    pass
+
+
+def _skip_whitespace(buffer: Buffer, pos: int) -> int:
+    return _WHITESPACE.match(buffer, pos).end()  # type: ignore[union-attr]
+
+
+def _skip_string(buffer: Buffer, pos: int) -> int:
+    match = _STRING.match(buffer, pos)
+    if not match:
+        raise ValueError("unterminated string at byte {0}".format(pos))
+    return match.end()
+
+
+def _skip_value(buffer: Buffer, pos: int) -> int:
+    if buffer[pos:pos + 1] == b'"':
+        return _skip_string(buffer, pos)
+    if buffer[pos] not in _OPENING:
+        return _SCALAR.match(buffer, pos).end()  # type: ignore[union-attr]
+    depth = 0
+    while True:
+        match = _TOKEN.search(buffer, pos)
+        if not match:
+            raise ValueError("unexpected end of data")
+        token = match.group()
+        if token == b'"':
+            pos = _skip_string(buffer, match.start())
+            continue
+        pos = match.end()
+        if token[0] in _OPENING:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def scan_json_object(buffer: Buffer) -> JsonIndex:
+    """
+    Finds values of top-level object without parsing them
+
+    :param buffer: Raw file content (bytes-like object)
+    :return: Index of top-level keys
+    :raises ValueError: If the content is not a valid object
+    """
+
+    index = JsonIndex()
+    pos = _skip_whitespace(buffer, len(codecs.BOM_UTF8) if buffer[:3] == codecs.BOM_UTF8 else 0)
+    if buffer[pos:pos + 1] != b"{":
+        raise ValueError("expected object at byte {0}".format(pos))
+    pos = _skip_whitespace(buffer, pos + 1)
+    if buffer[pos:pos + 1] == b"}":
+        return index
+    while True:
+        key_end = _skip_string(buffer, pos)
+        key = json.loads(bytes(buffer[pos:key_end]))
+        pos = _skip_whitespace(buffer, key_end)
+        if buffer[pos:pos + 1] != b":":
+            raise ValueError("expected ':' at byte {0}".format(pos))
+        start = _skip_whitespace(buffer, pos + 1)
+        end = _skip_value(buffer, start)
+        if end == start:
+            raise ValueError("expected value at byte {0}".format(start))
+        index[key] = (start, end)
+        pos = _skip_whitespace(buffer, end)
+        delimiter = buffer[pos:pos + 1]
+        if delimiter == b"}":
+            return index
+        if delimiter != b",":
+            raise ValueError("expected ',' or '}}' at byte {0}".format(pos))
+        pos = _skip_whitespace(buffer, pos + 1)
+
+
+class StreamingJsonLoader(JsonLoader):
+    """
+    class to load multilingual json files partially
+
+    Only the requested root element is parsed,
+    positions of other elements are memoized to read them later without rescanning
+    """
+
+    def __init__(self):
+        super(StreamingJsonLoader, self).__init__()
+
+    def scan_file(self, filename: str) -> JsonIndex:
+        found = archives.find(filename)
+        try:
+            if found is not None:
+                return scan_json_object(found[0].read(found[1]))
+            with io.open(filename, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return scan_json_object(buffer)
+        except (ValueError, IndexError) as e:
+            # mmap raises ValueError for empty files
+            raise I18nFileLoadError("invalid JSON: {0}".format(e)) from e
+        except IOError as e:
+            raise I18nFileLoadError(
+                "error loading file {0}: {1}".format(filename, e.strerror),
+            ) from e
+
+    def load_span(self, filename: str, start: int, end: int) -> str:
+        found = archives.find(filename)
+        if found is not None:
+            # members of archives are decompressed as a whole
+            span = found[0].read(found[1])[start:end]
+            if metrics.enabled:
+                metrics.increment("bytes_read", end - start)
+            return span.decode(config.get("encoding"))
+        try:
+            with io.open(filename, "rb") as f:
+                f.seek(start)
+                if metrics.enabled:
+                    metrics.increment("bytes_read", end - start)
+                return f.read(end - start).decode(config.get("encoding"))
+        except IOError as e:
+            raise I18nFileLoadError(
+                "error loading file {0}: {1}".format(filename, e.strerror),
+            ) from e
+
+    def load_resource(
+        self,
+        filename: str,
+        root_data: Optional[str],
+        remember_content: bool,
+    ) -> dict:
+        encoding = codecs.lookup(config.get("encoding")).name
+        if root_data is None or not remember_content or encoding not in _SCANNABLE_ENCODINGS:
+            filename = os.path.abspath(filename)
+            if filename in self.loaded_files and isinstance(self.loaded_files[filename], JsonIndex):
+                # full content is required
+                del self.loaded_files[filename]
+            return super(StreamingJsonLoader, self).load_resource(
+                filename,
+                root_data,
+                remember_content,
+            )
+
+        filename = os.path.abspath(filename)
+        try:
+            index = self.loaded_files[filename]
+        except KeyError:
+            with load_trace.phase("read"):
+                index = self.scan_file(filename)
+        else:
+            if not index:
+                # cache is missing or exhausted
+                return {}
+        if root_data not in index:
+            raise I18nFileLoadError(
+                "error getting data from {0}: {1} not defined".format(filename, root_data),
+            )
+        start, end = index.pop(root_data)
+        if config.get("enable_memoization"):
+            self.loaded_files[filename] = index
+        with load_trace.phase("read"):
+            span = self.load_span(filename, start, end)
+        with load_trace.phase("parse"):
+            data = self.parse_file(span)
+        if metrics.enabled:
+            self.count_parsed()
+        return data
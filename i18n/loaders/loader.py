@@ -1,15 +1,165 @@
 import io
+import sys
 import os.path
-from typing import Optional, Dict
+# same as `threading.RLock`, but `import i18n` doesn't import `threading`
+from _thread import RLock
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Iterator, MutableMapping, Set, Tuple
 
-from .. import config
+from .. import config, metrics
 from ..errors import I18nFileLoadError
 
 
+def estimate_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimates memory used by parsed file content
+
+    :param obj: Object to measure
+    :param seen: Ids of already measured objects (optional).
+    If provided, shared objects are counted once
+    :return: Approximate size in bytes
+    """
+
+    if seen is not None:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += estimate_size(k, seen) + estimate_size(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            size += estimate_size(v, seen)
+    return size
+
+
+class LoadedFilesCache(MutableMapping[str, Optional[dict]]):
+    """
+    Memoization cache for loaded files with LRU eviction
+
+    Its size is limited by `memoization_max_entries` and `memoization_max_bytes` settings
+    Evicted files will be read again when needed
+    """
+
+    def __init__(self):
+        self._data: "OrderedDict[str, Optional[dict]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # sizes of top-level items by key, with ids of the values they were measured for
+        self._item_sizes: Dict[str, Dict[Any, Tuple[int, int]]] = {}
+        self._lock = RLock()
+        self.total_size = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns cache statistics
+
+        :return: Numbers of hits, misses, evictions, entries and estimated size in bytes
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._data),
+            "bytes": self.total_size,
+        }
+
+    def __getitem__(self, filename: str) -> Optional[dict]:
+        with self._lock:
+            try:
+                value = self._data[filename]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data.move_to_end(filename)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, filename: str, value: Optional[dict]) -> None:
+        max_bytes = config.get("memoization_max_bytes")
+        with self._lock:
+            if max_bytes is not None:
+                size, item_sizes = self._measure(filename, value)
+            self._discard(filename)
+            self._data[filename] = value
+            if max_bytes is not None:
+                self._sizes[filename] = size
+                self.total_size += size
+                if item_sizes:
+                    self._item_sizes[filename] = item_sizes
+            self._evict(config.get("memoization_max_entries"), max_bytes)
+
+    def _measure(
+        self,
+        filename: str,
+        value: Optional[dict],
+    ) -> Tuple[int, Dict[Any, Tuple[int, int]]]:
+        # the same content is usually stored again with one locale removed,
+        # so only items that weren't measured before are walked
+        if not isinstance(value, dict):
+            return estimate_size(value), {}
+        measured = self._item_sizes.get(filename, {})
+        item_sizes = {}
+        size = sys.getsizeof(value)
+        for key, item in value.items():
+            known = measured.get(key)
+            if known is not None and known[0] == id(item):
+                item_size = known[1]
+            else:
+                item_size = estimate_size(key) + estimate_size(item)
+            item_sizes[key] = (id(item), item_size)
+            size += item_size
+        return size, item_sizes
+
+    def __delitem__(self, filename: str) -> None:
+        with self._lock:
+            if filename not in self._data:
+                raise KeyError(filename)
+            self._discard(filename)
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._item_sizes.clear()
+            self.total_size = 0
+
+    def _discard(self, filename: str) -> None:
+        self._data.pop(filename, None)
+        self.total_size -= self._sizes.pop(filename, 0)
+        self._item_sizes.pop(filename, None)
+
+    def _evict(self, max_entries: Optional[int], max_bytes: Optional[int]) -> None:
+        while self._data and (
+            (max_entries is not None and len(self._data) > max_entries)
+            or (max_bytes is not None and self.total_size > max_bytes)
+        ):
+            self._discard(next(iter(self._data)))
+            self.evictions += 1
+
+
 class Loader(object):
     """Base class to load resources"""
 
-    loaded_files: Dict[str, Optional[dict]] = {}
+    loaded_files: MutableMapping[str, Optional[dict]] = LoadedFilesCache()
+    # whether `lookup()` is implemented
+    supports_lookup = False
 
     def __init__(self):
         super(Loader, self).__init__()
@@ -23,14 +173,30 @@ class Loader(object):
         :raises I18nFileLoadError: If loading wasn't successful
         """
 
+        from .. import archives
+
+        found = archives.find(filename)
+        if found is not None:
+            content = found[0].read(found[1])
+            if metrics.enabled:
+                metrics.increment("bytes_read", len(content))
+            return content.decode(config.get('encoding'))
         try:
             with io.open(filename, 'r', encoding=config.get('encoding')) as f:
+                if metrics.enabled:
+                    metrics.increment("bytes_read", os.fstat(f.fileno()).st_size)
                 return f.read()
         except IOError as e:
             raise I18nFileLoadError(
                 "error loading file {0}: {1}".format(filename, e.strerror),
             ) from e
 
+    def count_parsed(self) -> None:
+        """Updates metrics after parsing a file"""
+
+        metrics.increment("files_parsed")
+        metrics.increment("files_parsed." + self.__class__.__name__)
+
     def parse_file(self, file_content: str) -> dict:
         """
         Parses file content to dict. Must be implemented in subclasses
@@ -69,6 +235,23 @@ class Loader(object):
         # use .pop to remove used data from cache
         return data if root_data is None else data.pop(root_data)
 
+    def lookup(self, filename: str, key: str) -> Any:
+        """
+        Finds single translation without loading whole file.
+        Used instead of `load_resource()` during search if `supports_lookup` is `True`
+
+        :param filename: File to search in
+        :param key: Key relative to the namespace of the file
+        :return: Translation or `None` if the file doesn't contain it
+        :raises I18nFileLoadError: If the file is invalid
+        """
+
+        raise NotImplementedError(
+            "the method lookup has not been implemented for class {0}".format(
+                self.__class__.__name__,
+            ),
+        )
+
     def load_resource(
         self,
         filename: str,
@@ -88,22 +271,30 @@ class Loader(object):
         """
 
         filename = os.path.abspath(filename)
-        if filename in self.loaded_files:
+        try:
             data = self.loaded_files[filename]
+        except KeyError:
+            from .. import load_trace
+
+            with load_trace.phase("read"):
+                file_content = self.load_file(filename)
+            with load_trace.phase("parse"):
+                data = self.parse_file(file_content)
+            if metrics.enabled:
+                self.count_parsed()
+        else:
             if not data:
                 # cache is missing or exhausted
                 return {}
-        else:
-            file_content = self.load_file(filename)
-            data = self.parse_file(file_content)
         if not self.check_data(data, root_data):
             raise I18nFileLoadError(
                 "error getting data from {0}: {1} not defined".format(filename, root_data),
             )
+        result = self.get_data(data, root_data)
         enable_memoization = config.get('enable_memoization')
         if enable_memoization:
             if remember_content:
                 self.loaded_files[filename] = data
             else:
                 self.loaded_files[filename] = None
-        return self.get_data(data, root_data)
+        return result
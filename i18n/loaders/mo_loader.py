@@ -0,0 +1,295 @@
+import io
+import os
+import mmap
+import struct
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from . import Loader, I18nFileLoadError
+from .. import config, metrics, archives
+from ..translations import PluralForms
+
+
+MAGIC = 0x950412DE
+# separates msgctxt from msgid
+CONTEXT_SEPARATOR = b"\x04"
+# numbers used to choose plural forms for categories of `translator.pluralize()`,
+# the categories are used only if the plural expression of the file is lost
+PLURAL_EXAMPLES = {"zero": 0, "one": 1, "few": 2}
+
+
+def hash_string(string: bytes) -> int:
+    """Hash function used by GNU gettext for hash tables of .mo files"""
+
+    value = 0
+    for byte in string:
+        value = ((value << 4) + byte) & 0xFFFFFFFF
+        high = value & 0xF0000000
+        if high:
+            value ^= high >> 24
+            value ^= high
+    return value
+
+
+class MoCatalog(object):
+    """
+    Memory-mapped .mo file
+
+    Strings are decoded only when they're requested,
+    single messages are found with the hash table of the file
+    """
+
+    def __init__(self, filename: str, content: Optional[bytes] = None):
+        """
+        :param filename: Path of the file
+        :param content: Content of the file (optional), it's used instead of mapping the file
+        :raises I18nFileLoadError: If the file is invalid
+        """
+
+        self.buffer: Union[mmap.mmap, bytes]
+        try:
+            if content is not None:
+                self.buffer = content
+            else:
+                with io.open(filename, "rb") as f:
+                    self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            # mmap raises ValueError for empty files
+            raise I18nFileLoadError("invalid .mo file {0}: {1}".format(filename, e)) from e
+        except IOError as e:
+            raise I18nFileLoadError(
+                "error loading file {0}: {1}".format(filename, e.strerror),
+            ) from e
+        for order in "<>":
+            if self._unpack(order + "I", 0)[0] == MAGIC:
+                break
+        else:
+            self.close()
+            raise I18nFileLoadError("invalid .mo file {0}: wrong magic number".format(filename))
+        self._order = order
+        (
+            revision,
+            self.size,
+            self._originals,
+            self._translations,
+            self._hash_size,
+            self._hash_offset,
+        ) = self._unpack(order + "6I", 4)
+        if revision >> 16 > 1:
+            self.close()
+            raise I18nFileLoadError(
+                "invalid .mo file {0}: unsupported revision {1}".format(filename, revision),
+            )
+        self.charset = config.get("encoding")
+        self._plural: Callable[[int], int] = _germanic_plural
+        header = self.find(b"")
+        if header is not None:
+            self._parse_header(self._string(self._translations, header).decode("ascii", "replace"))
+
+    def _unpack(self, fmt: str, offset: int) -> Tuple[int, ...]:
+        try:
+            return struct.unpack_from(fmt, self.buffer, offset)
+        except struct.error as e:
+            raise I18nFileLoadError("invalid .mo file: {0}".format(e)) from e
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = self._unpack(self._order + "2I", table + index * 8)
+        return self.buffer[offset:offset + length]
+
+    def _msgid(self, index: int) -> bytes:
+        # originals of plural messages also contain plural msgid after NUL
+        return self._string(self._originals, index).partition(b"\0")[0]
+
+    def _parse_header(self, header: str) -> None:
+        from gettext import c2py
+
+        for line in header.splitlines():
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            if name == "content-type" and "charset=" in value:
+                self.charset = value.split("charset=")[1].strip()
+            elif name == "plural-forms" and "plural=" in value:
+                self._plural = c2py(value.split("plural=")[1].strip().rstrip(";"))
+
+    def find(self, msgid: bytes) -> Optional[int]:
+        """
+        Finds index of message
+
+        :param msgid: Original string, prefixed with context and `CONTEXT_SEPARATOR` if needed
+        :return: Index of the message or `None` if it's absent
+        """
+
+        if self._hash_size > 2:
+            value = hash_string(msgid)
+            index = value % self._hash_size
+            increment = 1 + value % (self._hash_size - 2)
+            while True:
+                (entry,) = self._unpack(self._order + "I", self._hash_offset + index * 4)
+                if entry == 0:
+                    return None
+                if self._msgid(entry - 1) == msgid:
+                    return entry - 1
+                if index >= self._hash_size - increment:
+                    index -= self._hash_size - increment
+                else:
+                    index += increment
+        # without hash table, originals are sorted
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            current = self._msgid(middle)
+            if current == msgid:
+                return middle
+            if current < msgid:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def translation(self, index: int) -> Any:
+        """
+        Decodes translation of message
+
+        Plural forms are converted into `PluralForms`
+
+        :param index: Index of the message
+        :return: Translation
+        """
+
+        forms = self._string(self._translations, index).decode(self.charset).split("\0")
+        if len(forms) == 1 and b"\0" not in self._string(self._originals, index):
+            return forms[0]
+        categories = dict(PLURAL_EXAMPLES, many=config.get("plural_few") + 1)
+        result = {}
+        for category, number in categories.items():
+            form = self._plural(number)
+            result[category] = forms[min(form, len(forms) - 1)]
+        # categories equal to `many` are redundant
+        return PluralForms(
+            {
+                category: form
+                for category, form in result.items()
+                if category == "many" or form != result["many"]
+            },
+            forms,
+            self._plural,
+        )
+
+    def get(self, key: str) -> Any:
+        """
+        Finds translation by key
+
+        Key may consist of msgctxt and msgid joined with namespace delimiter
+
+        :param key: Translation key
+        :return: Translation or `None` if it's absent
+        """
+
+        if not key:
+            return None
+        delimiter = config.get("namespace_delimiter")
+        index = self.find(key.encode(self.charset))
+        position = key.find(delimiter)
+        while index is None and position != -1:
+            msgid = (
+                key[:position].encode(self.charset)
+                + CONTEXT_SEPARATOR
+                + key[position + len(delimiter):].encode(self.charset)
+            )
+            index = self.find(msgid)
+            position = key.find(delimiter, position + 1)
+        return None if index is None else self.translation(index)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterates over keys and translations, except the header"""
+
+        delimiter = config.get("namespace_delimiter")
+        for index in range(self.size):
+            msgid = self._msgid(index)
+            if not msgid:
+                continue
+            context, separator, msgid = msgid.rpartition(CONTEXT_SEPARATOR)
+            key = msgid.decode(self.charset)
+            if separator:
+                key = context.decode(self.charset) + delimiter + key
+            yield key, self.translation(index)
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+def _germanic_plural(n: int) -> int:
+    # default when file doesn't specify plural forms
+    return int(n != 1)
+
+
+class MoLoader(Loader):
+    """
+    class to load GNU gettext .mo files
+
+    msgids become keys, prefixed with msgctxt and namespace delimiter if there's a context.
+    Plural forms are chosen by the `Plural-Forms` expression of the file.
+    When a translation is searched, only the requested message is read
+    """
+
+    supports_lookup = True
+
+    def __init__(self):
+        super(MoLoader, self).__init__()
+        # open catalogs with modification times and sizes of their files
+        self._catalogs: Dict[str, Tuple[Tuple[int, int], MoCatalog]] = {}
+        self._lock = threading.Lock()
+
+    def catalog(self, filename: str) -> MoCatalog:
+        """
+        Gets memory-mapped file, it's opened again if the file was changed
+
+        :param filename: Path of the file
+        :return: Catalog
+        :raises I18nFileLoadError: If the file is invalid
+        """
+
+        filename = os.path.abspath(filename)
+        found = archives.find(filename)
+        if found is not None:
+            info = found[0].getinfo(found[1])
+            version = (info.CRC, info.file_size)
+        else:
+            try:
+                stat = os.stat(filename)
+            except OSError as e:
+                raise I18nFileLoadError(
+                    "error loading file {0}: {1}".format(filename, e.strerror),
+                ) from e
+            version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._catalogs.get(filename)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            if found is not None:
+                catalog = MoCatalog(filename, found[0].read(found[1]))
+            else:
+                catalog = MoCatalog(filename)
+            self._catalogs[filename] = (version, catalog)
+        # mapped memory of the old catalog is released when it isn't used anymore
+        return catalog
+
+    def lookup(self, filename: str, key: str) -> Any:
+        return self.catalog(filename).get(key)
+
+    def load_file(self, filename: str) -> dict:  # type: ignore[override]
+        catalog = self.catalog(filename)
+        if metrics.enabled:
+            metrics.increment("bytes_read", len(catalog.buffer))
+        return dict(catalog.items())
+
+    def parse_file(self, file_content: dict) -> dict:  # type: ignore[override]
+        return file_content
+
+    def check_data(self, data: dict, root_data: Optional[str]) -> bool:
+        # .mo file always contains one locale
+        return True
+
+    def get_data(self, data: dict, root_data: Optional[str]) -> dict:
+        return data
@@ -1,7 +1,9 @@
 import os.path
+from types import ModuleType
 from importlib import util
 
 from . import Loader, I18nFileLoadError
+from .. import archives
 
 
 class PythonLoader(Loader):
@@ -13,7 +15,13 @@ class PythonLoader(Loader):
     def load_file(self, filename: str) -> dict:  # type: ignore[override]
         _, name = os.path.split(filename)
         module_name, _ = os.path.splitext(name)
+        found = archives.find(filename)
         try:
+            if found is not None:
+                module = ModuleType(module_name)
+                module.__file__ = filename
+                exec(compile(found[0].read(found[1]), filename, "exec"), vars(module))
+                return vars(module)
             spec = util.spec_from_file_location(module_name, filename)
             # loader is guaranteed to be not None if spec is not None
             # but we check it anyway to make mypy happy
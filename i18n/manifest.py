@@ -0,0 +1,136 @@
+__all__ = ("loaded_files", "clear", "write_manifest", "warm_from_manifest")
+
+import os.path
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, TYPE_CHECKING
+
+from . import config, archives, load_trace
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .resource_loader import TranslationFile
+
+
+# mirrors `record_loaded_files` setting
+recording: bool = config.get("record_loaded_files")
+
+MANIFEST_VERSION = 1
+
+# used as an ordered set
+_loaded: Dict["TranslationFile", None] = {}
+_lock = threading.Lock()
+
+
+def record(file: "TranslationFile") -> None:
+    with _lock:
+        _loaded[file] = None
+
+
+def loaded_files() -> List["TranslationFile"]:
+    """Gets recorded files in order of loading"""
+
+    with _lock:
+        return list(_loaded)
+
+
+def clear() -> None:
+    """Forgets recorded files"""
+
+    with _lock:
+        _loaded.clear()
+
+
+def _to_entry(file: "TranslationFile") -> Dict[str, Any]:
+    entry: Dict[str, Any] = {"filename": file.filename, "locale": file.locale}
+    base_directory = os.path.abspath(file.base_directory)
+    for i, directory in enumerate(archives.load_path()):
+        directory = os.path.abspath(directory)
+        if base_directory == directory or base_directory.startswith(directory + os.sep):
+            # relative to load path, so that the manifest works after moving the files
+            entry["load_path"] = i
+            entry["directory"] = os.path.relpath(base_directory, directory)
+            return entry
+    entry["directory"] = base_directory
+    return entry
+
+
+def _from_entry(entry: Dict[str, Any]) -> Optional["TranslationFile"]:
+    from .resource_loader import TranslationFile
+
+    directory = entry["directory"]
+    if "load_path" in entry:
+        load_path = archives.load_path()
+        if entry["load_path"] >= len(load_path):
+            return None
+        directory = os.path.normpath(os.path.join(load_path[entry["load_path"]], directory))
+    return TranslationFile(directory, entry["filename"], entry["locale"])
+
+
+def write_manifest(path: str) -> None:
+    """
+    Saves recorded files to JSON file
+
+    Directories from `load_path` are saved as their indexes
+
+    :param path: Path of manifest
+    """
+
+    import json
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "files": list(map(_to_entry, loaded_files()))},
+            f,
+            indent=1,
+        )
+
+
+def warm_from_manifest(path: str, max_workers: Optional[int] = None) -> List["TranslationFile"]:
+    """
+    Loads files listed in manifest
+
+    Files are read and parsed in a thread pool, then added in the original order.
+    Files that don't exist anymore and files of locked locales are skipped
+
+    :param path: Path of manifest created by `write_manifest()`
+    :param max_workers: Number of threads, see `ThreadPoolExecutor`
+    :return: Loaded files
+    :raises ValueError: If manifest has unsupported version
+    """
+
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    from . import resource_loader
+
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError("unsupported manifest version: {!r}".format(manifest.get("version")))
+
+    files = []
+    for entry in manifest["files"]:
+        file = _from_entry(entry)
+        if (
+            file is not None
+            and not resource_loader._check_locked(file.locale)
+            and archives.isfile(os.path.join(file.base_directory, file.filename))
+        ):
+            files.append(file)
+
+    try:
+        with ThreadPoolExecutor(max_workers) as executor:
+            contents = executor.map(resource_loader.read_translation_file, files)
+            for file, content in zip(files, contents):
+                resource_loader.add_translation_file(file, content)
+    finally:
+        # files read before an error aren't added
+        for file in files:
+            load_trace.discard(file)
+    return files
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global recording
+
+    if "record_loaded_files" in changed:
+        recording = config.get("record_loaded_files")
@@ -0,0 +1,163 @@
+__all__ = ("stats", "reset_stats", "increment", "observe", "timed")
+
+# low-level module of `threading`, so that `import i18n` doesn't import `threading`
+import _thread
+from types import ModuleType
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, TypeVar
+
+from . import config
+
+
+# mirrors `enable_metrics` setting, so that disabled metrics cost one global lookup
+enabled: bool = config.get("enable_metrics")
+# whether translation calls should be passed to `observe()`
+observing: bool = enabled or bool(config.get("profiler_sample_rate"))
+# `profiler` module, it's imported when profiling is enabled for the first time
+_profiler: Optional[ModuleType] = None
+
+_local = _thread._local()
+# counters of live threads
+_counters: List[Dict[str, float]] = []
+# counters of finished threads
+_retired: Dict[str, float] = {}
+_lock = _thread.allocate_lock()
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Holder(object):
+    """Removed together with thread-local data when the thread finishes"""
+
+    def __init__(self, counters: Dict[str, float]):
+        self.counters = counters
+
+
+def _retire(counters: Dict[str, float]) -> None:
+    with _lock:
+        _counters.remove(counters)
+        _merge(_retired, counters)
+
+
+def _merge(target: Dict[str, float], counters: Dict[str, float]) -> None:
+    for name, value in counters.copy().items():
+        target[name] = target.get(name, 0) + value
+
+
+def increment(name: str, amount: float = 1) -> None:
+    """
+    Increments counter of the current thread
+
+    Callers are expected to check `enabled` first
+
+    :param name: Counter name
+    :param amount: Value to add
+    """
+
+    try:
+        counters = _local.holder.counters
+    except AttributeError:
+        from weakref import finalize
+
+        counters = {}
+        _local.holder = _Holder(counters)
+        with _lock:
+            _counters.append(counters)
+        finalize(_local.holder, _retire, counters)
+    counters[name] = counters.get(name, 0) + amount
+
+
+def observe(outcome: str, key: str, locale: str) -> None:
+    """
+    Counts result of translation call and passes it to the profiler
+
+    Callers are expected to check `observing` first
+
+    :param outcome: `"hits"`, `"fallback_hits"` or `"misses"`
+    :param key: Translation key
+    :param locale: Requested locale
+    """
+
+    if enabled:
+        increment(outcome)
+    if _profiler is not None and _profiler.sample_rate:
+        _profiler.record(key, locale, outcome)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """
+    Decorator that adds execution time of the function to the counter
+
+    Nested calls of timed functions aren't counted twice
+
+    :param name: Counter name
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not enabled or getattr(_local, "timing", False):
+                return func(*args, **kwargs)
+            _local.timing = True
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _local.timing = False
+                increment(name, perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def stats() -> Dict[str, float]:
+    """
+    Gets counters summed over all threads
+
+    Counters:
+      - `hits`: translations found in the requested locale
+      - `fallback_hits`: translations found in the fallback locale
+      - `misses`: translations that weren't found
+      - `searches`: calls of `search_translation()`
+      - `fs_probes`: files checked while searching translations
+      - `files_parsed` and `files_parsed.<loader class>`: parsed files
+      - `bytes_read`: bytes read from translation files (except python files)
+      - `static_refs_expanded`: translations with expanded static references
+      - `load_time`: seconds spent loading translation files
+
+    Counters are collected only while `enable_metrics` setting is `True`
+
+    :return: Mapping of counter names to values
+    """
+
+    result: Dict[str, float] = {}
+    with _lock:
+        _merge(result, _retired)
+        for counters in _counters:
+            _merge(result, counters)
+    return result
+
+
+def reset_stats() -> None:
+    """Sets all counters to zero"""
+
+    with _lock:
+        _retired.clear()
+        for counters in _counters:
+            counters.clear()
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global enabled, observing, _profiler
+
+    if "enable_metrics" in changed:
+        enabled = config.get("enable_metrics")
+    sample_rate = config.get("profiler_sample_rate")
+    if sample_rate and _profiler is None:
+        from . import profiler
+
+        _profiler = profiler
+    observing = enabled or bool(sample_rate)
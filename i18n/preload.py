@@ -0,0 +1,230 @@
+__all__ = ("Preloader", "start_preload")
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import config, resource_loader, load_trace
+from .resource_loader import TranslationFile
+
+
+class Preloader(object):
+    """
+    Loads translation files on a background thread
+
+    Files are loaded in order of priority. When `t()` needs a file that
+    isn't loaded yet, the file is moved to the front of the queue and only
+    that file is waited for, without searching the disk
+    """
+
+    def __init__(self, locales: Optional[Iterable[str]], priority: Iterable[str]):
+        self.locales = None if locales is None else tuple(locales)
+        self.priority = tuple(priority)
+        # number of found files, `None` until all of them are found
+        self.total: Optional[int] = None
+        self.loaded = 0
+        # set when all files are loaded or loading was cancelled
+        self.finished = threading.Event()
+        # file is `None` if an error happened during search of files
+        self.errors: List[Tuple[Optional[TranslationFile], Exception]] = []
+        self.cancelled = False
+        self._condition = threading.Condition()
+        self._queue: Deque[TranslationFile] = deque()
+        self._index: Optional[Dict[str, List[TranslationFile]]] = None
+        self._positions: Dict[TranslationFile, int] = {}
+        self._done: Set[TranslationFile] = set()
+        self._failed: Set[TranslationFile] = set()
+        # locales whose translations were evicted and have to be searched again
+        self._evicted: Set[str] = set()
+        self._thread = threading.Thread(target=self._run, name="i18n-preload", daemon=True)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of loaded files, from 0 to 1"""
+
+        if self.total is None:
+            return 0.0
+        return self.loaded / self.total if self.total else 1.0
+
+    @property
+    def pending(self) -> List[TranslationFile]:
+        """Files that are not loaded yet, in order of loading"""
+
+        with self._condition:
+            return list(self._queue)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until loading is finished
+
+        :param timeout: Timeout in seconds (optional)
+        :return: Whether loading is finished
+        """
+
+        return self.finished.wait(timeout)
+
+    def cancel(self) -> None:
+        """Stops loading and waits until the current file is loaded"""
+
+        with self._condition:
+            self.cancelled = True
+            self._queue.clear()
+            self._condition.notify_all()
+        if threading.current_thread() is not self._thread:
+            self.finished.wait()
+
+    def load_now(self, key: str, locale: str) -> bool:
+        """
+        Waits until files that may contain the key are loaded
+
+        :param key: Translation key
+        :param locale: Locale
+        :return: `False` if the files should be searched on disk instead
+        """
+
+        if threading.current_thread() is self._thread:
+            # e.g. static reference to a file that isn't loaded yet
+            return False
+        if (self.locales is not None and locale not in self.locales) or locale in self._evicted:
+            return False
+        with self._condition:
+            while self._index is None and not self.cancelled:
+                self._condition.wait()
+            if self.cancelled:
+                return False
+            files = self._files_for(key, locale)
+            wanted = [file for file in files if file not in self._done]
+            # the file which is being loaded isn't in the queue
+            queued = set(self._queue).intersection(wanted)
+            self._queue = deque(
+                [file for file in wanted if file in queued]
+                + [file for file in self._queue if file not in queued],
+            )
+            while not self.cancelled and not self._done.issuperset(wanted):
+                self._condition.wait()
+            # failed files are searched again to raise the same error
+            return not self.cancelled and self._failed.isdisjoint(files)
+
+    def forget(self, locale: str) -> None:
+        """
+        Makes further searches in the locale ignore preloaded files
+
+        Used after translations of the locale were evicted
+
+        :param locale: Locale
+        """
+
+        self._evicted.add(locale)
+
+    def _files_for(self, key: str, locale: str) -> List[TranslationFile]:
+        assert self._index is not None
+        delimiter = config.get("namespace_delimiter")
+        parts = key.split(delimiter)[:-1]
+        files = [
+            file
+            for i in range(len(parts) + 1)
+            for file in self._index.get(delimiter.join(parts[:i]), ())
+            if file.locale in (locale, None)
+        ]
+        # keep the same order as in `load_everything()`
+        return sorted(files, key=self._positions.__getitem__)
+
+    def _rank(self, namespace: str) -> int:
+        delimiter = config.get("namespace_delimiter")
+        for i, prioritized in enumerate(self.priority):
+            if (
+                not namespace
+                or namespace == prioritized
+                or namespace.startswith(prioritized + delimiter)
+                or prioritized.startswith(namespace + delimiter)
+            ):
+                return i
+        return len(self.priority)
+
+    def _discover(self) -> None:
+        files: List[TranslationFile] = []
+        try:
+            for locale in (None,) if self.locales is None else self.locales:
+                files.extend(resource_loader.iter_translation_files(locale))
+        except Exception as e:
+            self.errors.append((None, e))
+            for file in files:
+                load_trace.discard(file)
+            self.cancel()
+            return
+        index: Dict[str, List[TranslationFile]] = {}
+        ranks = {}
+        for position, file in enumerate(files):
+            namespace = resource_loader.get_namespace_from_filepath(file.filename)
+            index.setdefault(namespace, []).append(file)
+            ranks[file] = self._rank(namespace)
+            self._positions[file] = position
+        with self._condition:
+            if not self.cancelled:
+                self._queue.extend(sorted(files, key=ranks.__getitem__))
+            self.total = len(files)
+            self._index = index
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        self._discover()
+        while True:
+            with self._condition:
+                if not self._queue:
+                    break
+                file = self._queue.popleft()
+            try:
+                content = resource_loader.read_translation_file(file)
+                resource_loader.add_translation_file(file, content)
+            except Exception as e:
+                self.errors.append((file, e))
+                self._failed.add(file)
+            finally:
+                load_trace.discard(file)
+            with self._condition:
+                self._done.add(file)
+                self.loaded += 1
+                self._condition.notify_all()
+        # files that won't be loaded after cancelling
+        for file in self._positions:
+            load_trace.discard(file)
+        self.finished.set()
+
+    def __repr__(self) -> str:
+        return "<{} {}/{} files>".format(
+            self.__class__.__name__,
+            self.loaded,
+            "?" if self.total is None else self.total,
+        )
+
+
+def start_preload(
+    locales: Optional[Iterable[str]] = None,
+    priority: Iterable[str] = (),
+) -> Preloader:
+    """
+    Starts loading translations on a background thread
+
+    Translations which are needed before they are preloaded are loaded first.
+    Previous preloading is cancelled, `unload_everything()` cancels preloading too
+
+    :param locales: Locales to load, all locales by default
+    :param priority: Namespaces to load first, in order of importance
+    :return: Preloader that reports progress
+    :raises I18nLockedError: If translations are locked
+    """
+
+    if locales is not None:
+        locales = tuple(locales)
+    for locale in (None,) if locales is None else locales:
+        resource_loader._ensure_not_locked(locale)
+
+    if resource_loader._preloader is not None:
+        resource_loader._preloader.cancel()
+    preloader = Preloader(locales, priority)
+    resource_loader._preloader = preloader
+    preloader.start()
+    return preloader
@@ -0,0 +1,131 @@
+__all__ = ("ProfileReport", "record", "report", "reset")
+
+import threading
+from itertools import count
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import config, translations
+
+
+# mirrors `profiler_sample_rate` setting
+sample_rate: Optional[int] = config.get("profiler_sample_rate")
+
+_calls = count()
+# (key, locale, outcome) -> number of sampled calls
+_samples: Dict[Tuple[str, str, str], int] = {}
+# keys of all calls, sampled or not, so that rarely used keys aren't reported as unused
+_accessed: Set[str] = set()
+_lock = threading.Lock()
+
+
+class ProfileReport(NamedTuple):
+    """
+    Result of profiling
+
+    Counts are numbers of sampled calls, multiply them by `sample_rate` to estimate real numbers
+    """
+
+    sample_rate: int
+    # (key, locale, count), the most used first
+    hot: List[Tuple[str, str, int]]
+    # (key, requested locale, count) for translations taken from fallback locale
+    fallbacks: List[Tuple[str, str, int]]
+    # (key, locale, count) for translations that weren't found
+    missing: List[Tuple[str, str, int]]
+    # loaded keys that weren't accessed in any locale
+    unused: List[str]
+
+    def to_text(self) -> str:
+        """Formats report as human-readable text"""
+
+        lines = ["Sampled 1 of {} calls".format(self.sample_rate)]
+        for title, rows in (
+            ("Hot keys", self.hot),
+            ("Fallbacks", self.fallbacks),
+            ("Missing", self.missing),
+        ):
+            lines.append("")
+            lines.append("{}:".format(title))
+            lines.extend("{:>10}  {} ({})".format(n, key, locale) for key, locale, n in rows)
+        lines.append("")
+        lines.append("Unused keys ({}):".format(len(self.unused)))
+        lines.extend(self.unused)
+        return "\n".join(lines)
+
+
+def record(key: str, locale: str, outcome: str) -> None:
+    """
+    Records translation call if it's sampled
+
+    The key is remembered as accessed regardless of sampling
+
+    :param key: Translation key
+    :param locale: Requested locale
+    :param outcome: `"hits"`, `"fallback_hits"` or `"misses"`
+    """
+
+    # set.add() and next() of itertools.count are atomic, so threads don't need a lock here
+    _accessed.add(key)
+    if next(_calls) % sample_rate:  # type: ignore[operator]
+        return
+    sample = (key, locale, outcome)
+    with _lock:
+        _samples[sample] = _samples.get(sample, 0) + 1
+
+
+def report(limit: Optional[int] = 20) -> ProfileReport:
+    """
+    Builds report from collected samples
+
+    Keys loaded after profiling has finished may be reported as unused
+
+    :param limit: Maximum number of hot keys (optional)
+    :return: Report object, use `to_text()` or `_asdict()` to export it
+    """
+
+    with _lock:
+        samples = list(_samples.items())
+        accessed = _accessed.copy()
+    totals: Dict[Tuple[str, str], int] = {}
+    fallbacks = []
+    missing = []
+    for (key, locale, outcome), n in samples:
+        totals[key, locale] = totals.get((key, locale), 0) + n
+        if outcome == "fallback_hits":
+            fallbacks.append((key, locale, n))
+        elif outcome == "misses":
+            missing.append((key, locale, n))
+    hot = _by_count((key, locale, n) for (key, locale), n in totals.items())
+    unused = sorted({
+        key
+        for locale in translations.backend.locales()
+        for key in translations.backend.keys(locale)
+        if key not in accessed
+    })
+    return ProfileReport(
+        sample_rate=sample_rate or 1,
+        hot=hot[:limit],
+        fallbacks=_by_count(fallbacks),
+        missing=_by_count(missing),
+        unused=unused,
+    )
+
+
+def _by_count(rows: Iterable[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+    return sorted(rows, key=lambda row: (-row[2], row[0], row[1]))
+
+
+def reset() -> None:
+    """Removes collected samples and accessed keys"""
+
+    with _lock:
+        _samples.clear()
+        _accessed.clear()
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global sample_rate
+
+    if "profiler_sample_rate" in changed:
+        sample_rate = config.get("profiler_sample_rate")
@@ -1,6 +1,7 @@
 __all__ = (
     "Loader",
     "register_loader",
+    "get_loader",
     "init_loaders",
     "load_config",
     "load_everything",
@@ -10,16 +11,39 @@ __all__ = (
 )
 
 import os.path
-from typing import Dict, Type, Iterable, Optional, List, Set, Union
+from time import perf_counter
+from types import ModuleType
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Type,
+    Iterable,
+    Iterator,
+    Optional,
+    List,
+    Set,
+    Union,
+    NamedTuple,
+    TYPE_CHECKING,
+)
 
 from . import config
 from .loaders import Loader, I18nFileLoadError
 from .errors import I18nLockedError
-from . import translations, formatters
+from . import translations, formatters, metrics
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .preload import Preloader
+    from .extract import KeyManifest
 
 loaders: Dict[str, Loader] = {}
+# default loaders that weren't created yet, by extension
+_pending_loaders: Dict[str, Callable[[], None]] = {}
 
 PLURALS = {"zero", "one", "few", "many"}
+# `eviction` module, it's imported when eviction is enabled for the first time
+_eviction: Optional[ModuleType] = None
 
 
 def register_loader(loader_class: Type[Loader], supported_extensions: Iterable[str]) -> None:
@@ -37,22 +61,51 @@ def register_loader(loader_class: Type[Loader], supported_extensions: Iterable[s
     loader = loader_class()
     for extension in supported_extensions:
         loaders[extension] = loader
+        _pending_loaders.pop(extension, None)
+
+
+def get_loader(extension: str) -> Loader:
+    """
+    Gets loader for the extension, creates default loader on first use
+
+    :param extension: File extension without dot
+    :return: Registered loader
+    :raises I18nFileLoadError: If there is no loader for the extension
+    """
+
+    loader = loaders.get(extension)
+    if loader is None:
+        init = _pending_loaders.get(extension)
+        if init is not None:
+            init()
+        # may be registered by another thread in the meantime
+        loader = loaders.get(extension)
+        if loader is None:
+            raise I18nFileLoadError("no loader available for extension {0}".format(extension))
+    return loader
 
 
 def load_resource(filename: str, root_data: Optional[str], remember_content: bool = False) -> dict:
     extension = os.path.splitext(filename)[1][1:]
-    if extension not in loaders:
-        raise I18nFileLoadError("no loader available for extension {0}".format(extension))
-    return loaders[extension].load_resource(filename, root_data, remember_content)
+    loader = get_loader(extension)
+    if config.get("trace_loading"):
+        from . import load_trace
+
+        trace = load_trace.current()
+        if trace is not None:
+            trace.loader = loader.__class__.__name__
+    return loader.load_resource(filename, root_data, remember_content)
 
 
 def init_loaders():
-    """Sets default loaders"""
+    """Sets default loaders, each of them is imported on first use of its extension"""
 
-    init_python_loader()
+    defaults = {"py": init_python_loader, "json": init_json_loader, "mo": init_mo_loader}
     if config.yaml_available:
-        init_yaml_loader()
-    init_json_loader()
+        defaults.update(yml=init_yaml_loader, yaml=init_yaml_loader)
+    for extension, init in defaults.items():
+        loaders.pop(extension, None)
+        _pending_loaders[extension] = init
 
 
 def init_python_loader():
@@ -70,6 +123,11 @@ def init_json_loader():
     register_loader(JsonLoader, ["json"])
 
 
+def init_mo_loader():
+    from .loaders import MoLoader
+    register_loader(MoLoader, ["mo"])
+
+
 def load_config(filename: str) -> None:
     """
     Loads configuration from file
@@ -96,31 +154,141 @@ def get_namespace_from_filepath(filename: str) -> str:
     return namespace
 
 
+class TranslationFile(NamedTuple):
+    """Translation file found in one of `load_path` directories"""
+
+    base_directory: str
+    # path relative to `base_directory`
+    filename: str
+    # `None` means that the file contains data for all locales
+    locale: Optional[str]
+
+
 def load_translation_file(filename: str, base_directory: str, locale: Optional[str] = None) -> None:
     if locale is None:
         locale = config.get('locale')
-    skip_locale_root_data = config.get('skip_locale_root_data')
-    root_data = None if skip_locale_root_data else locale
-    # if the file isn't dedicated to one locale and may contain other `root_data`s
-    remember_content = not config.get("filename_format").has_locale and bool(root_data)
-    translations_dic = load_resource(
-        os.path.join(base_directory, filename),
-        root_data,
-        remember_content,
-    )
-    namespace = get_namespace_from_filepath(filename)
-    loaded = load_translation_dic(translations_dic, namespace, locale)
-    formatters.expand_static_refs(loaded, locale)
+    file = TranslationFile(base_directory, filename, locale)
+    add_translation_file(file, read_translation_file(file))
+
+
+@metrics.timed("load_time")
+def read_translation_file(file: TranslationFile) -> dict:
+    """
+    Reads and parses translation file without modifying translations
+
+    Safe to be called from any thread
+
+    :param file: File to read
+    :return: Parsed content
+    """
+
+    from . import load_trace
+
+    path = os.path.join(file.base_directory, file.filename)
+    with load_trace.file_context(file):
+        if file.locale is None:
+            return load_resource(path, None, False)
+        skip_locale_root_data = config.get('skip_locale_root_data')
+        root_data = None if skip_locale_root_data else file.locale
+        # if the file isn't dedicated to one locale and may contain other `root_data`s
+        remember_content = not config.get("filename_format").has_locale and bool(root_data)
+        return load_resource(path, root_data, remember_content)
+
+
+@metrics.timed("load_time")
+def add_translation_file(
+    file: TranslationFile,
+    content: dict,
+    only: Optional["KeyManifest"] = None,
+) -> None:
+    """
+    Adds parsed content of translation file to translations
+
+    :param file: File that was read
+    :param content: Result of `read_translation_file()`
+    :param only: Manifest of keys to add (optional), see `load_everything()`
+    """
+
+    from . import load_trace
+
+    if config.get("record_loaded_files"):
+        from . import manifest
+
+        manifest.record(file)
+    namespace = get_namespace_from_filepath(file.filename)
+    with load_trace.file_context(file, finish=True):
+        if file.locale is not None:
+            if _eviction is not None:
+                _eviction.record(file, (file.locale,))
+            _add_translation_dic(content, namespace, file.locale, only)
+            return
+        locales = [locale for locale, dic in content.items() if isinstance(dic, dict)]
+        if _eviction is not None:
+            _eviction.record(file, locales)
+        for locale in locales:
+            _add_translation_dic(content[locale], namespace, locale, only)
+
+
+def _add_translation_dic(
+    dic: dict,
+    namespace: str,
+    locale: str,
+    only: Optional["KeyManifest"] = None,
+) -> None:
+    from . import load_trace
+
+    with load_trace.phase("flatten"):
+        if only is None:
+            keys = load_translation_dic(dic, namespace, locale)
+        else:
+            keys = load_selected_translations(dic, namespace, locale, only)
+    trace = load_trace.current()
+    if trace is not None:
+        trace.keys += len(keys)
+    with load_trace.phase("static_refs"):
+        expand_static_refs(keys, locale)
+
+
+def expand_static_refs(keys: Iterable[str], locale: str) -> None:
+    if config.get("lazy_static_refs"):
+        formatters.defer_static_refs(keys, locale)
+    else:
+        formatters.expand_static_refs(keys, locale)
 
 
 _locked: Union[bool, Set[Union[str, None]]] = False
+# set by `start_preload()`
+_preloader: Optional["Preloader"] = None
 
 
 def _check_locked(locale: Optional[str]) -> bool:
     return _locked if isinstance(_locked, bool) else locale in _locked
 
 
-def load_everything(locale: Optional[str] = None, *, lock: bool = False) -> None:
+def _ensure_not_locked(locale: Optional[str]) -> None:
+    if _check_locked(locale):
+        raise I18nLockedError("Translations were locked, use unload_everything() to unlock")
+
+
+def _lock(locale: Optional[str]) -> None:
+    global _locked
+
+    if locale:
+        if isinstance(_locked, bool):
+            _locked = {None, locale}
+        else:
+            _locked.add(locale)
+    else:
+        _locked = True
+
+
+def load_everything(
+    locale: Optional[str] = None,
+    *,
+    lock: bool = False,
+    only: Union["KeyManifest", str, None] = None,
+    freeze: bool = False,
+) -> None:
     """
     Loads all translations
 
@@ -129,44 +297,99 @@ def load_everything(locale: Optional[str] = None, *, lock: bool = False) -> None
     :param locale: Locale (optional)
     :param lock: Whether to lock translations after loading.
     Locking disables further searching for missing translations
+    :param only: Manifest created by `python -m i18n extract` or path to it (optional).
+    If provided, only listed keys and keys they reference are loaded,
+    files that can't contain them aren't read at all
+    :param freeze: Whether to lock and freeze translations, see `i18n.frozen.freeze()`.
+    Only all locales can be frozen
+    :raises ValueError: If `freeze` is used together with `locale`
     """
 
-    global _locked
+    if freeze and locale is not None:
+        raise ValueError("only all locales can be frozen")
+    _ensure_not_locked(locale)
 
-    if _check_locked(locale):
-        raise I18nLockedError("Translations were locked, use unload_everything() to unlock")
+    if isinstance(only, str):
+        from .extract import KeyManifest
+
+        only = KeyManifest.load(only)
 
-    for directory in config.get("load_path"):
+    from . import load_trace
+
+    for file in iter_translation_files(locale):
+        try:
+            if only is None:
+                add_translation_file(file, read_translation_file(file))
+                continue
+            if not only.may_contain(get_namespace_from_filepath(file.filename)):
+                continue
+            add_translation_file(file, read_translation_file(file), only)
+            # the rest of the file must be available for searching
+            path = os.path.join(file.base_directory, file.filename)
+            Loader.loaded_files.pop(os.path.abspath(path), None)
+        finally:
+            # skipped files aren't traced
+            load_trace.discard(file)
+
+    if freeze:
+        from .frozen import freeze as freeze_translations
+
+        freeze_translations()
+    elif lock:
+        _lock(locale)
+
+
+def iter_translation_files(locale: Optional[str] = None) -> Iterator[TranslationFile]:
+    """
+    Finds all translation files in `load_path`
+
+    :param locale: Locale to search files for (optional)
+    :return: Iterator over found files
+    :raises I18nFileLoadError: If file locale can't be identified
+    """
+
+    start = perf_counter()
+    for file in _iter_translation_files(locale):
+        if config.get("trace_loading"):
+            from . import load_trace
+
+            load_trace.discovered(file, perf_counter() - start, lazy=False)
+        yield file
+        start = perf_counter()
+
+
+def _iter_translation_files(locale: Optional[str]) -> Iterator[TranslationFile]:
+    from . import archives
+
+    for directory in archives.load_path():
         if config.get("use_locale_dirs"):
-            for locale_dir in os.listdir(directory):
+            for locale_dir in archives.listdir(directory):
                 if locale and locale_dir != locale:
                     continue
                 locale_dir_path = os.path.join(directory, locale_dir)
-                if not os.path.isdir(locale_dir_path):
+                if not archives.isdir(locale_dir_path):
                     continue
-                recursive_load_everything(locale_dir_path, "", locale_dir)
-        else:
-            recursive_load_everything(directory, "", locale)
-
-    if not lock:
-        return
-
-    if locale:
-        if isinstance(_locked, bool):
-            _locked = {None, locale}
+                yield from recursive_find_files(locale_dir_path, "", locale_dir)
         else:
-            _locked.add(locale)
-    else:
-        _locked = True
+            yield from recursive_find_files(directory, "", locale)
 
 
 def unload_everything():
-    """Clears all cached translations"""
+    """Clears all cached translations and cancels preloading"""
 
-    global _locked
+    global _locked, _preloader
 
+    from . import archives
+
+    if _preloader is not None:
+        _preloader.cancel()
+        _preloader = None
+    translations.unfreeze()
     translations.clear()
     Loader.loaded_files.clear()
+    if _eviction is not None:
+        _eviction.clear()
+    archives.close()
     _locked = False
 
 
@@ -181,37 +404,151 @@ def reload_everything(*, lock: bool = False) -> None:
     load_everything(lock=lock)
 
 
-def load_translation_dic(dic: dict, namespace: str, locale: str) -> Iterable[str]:
-    loaded: List[str] = []
+def load_translation_dic(dic: dict, namespace: str, locale: str) -> List[str]:
+    flattened: Dict[str, translations.TranslationType] = {}
+    _flatten_translation_dic(dic, namespace, flattened)
+    translations.add_many(flattened.items(), locale)
+    return list(flattened)
+
+
+def load_selected_translations(
+    dic: dict,
+    namespace: str,
+    locale: str,
+    only: "KeyManifest",
+) -> List[str]:
+    flattened: Dict[str, translations.TranslationType] = {}
+    _flatten_translation_dic(dic, namespace, flattened)
+    keys = only.select(flattened)
+    translations.add_many(((key, flattened[key]) for key in keys), locale)
+    return keys
+
+
+def _flatten_translation_dic(
+    dic: dict,
+    namespace: str,
+    result: Dict[str, translations.TranslationType],
+) -> None:
     if namespace:
         namespace += config.get('namespace_delimiter')
     for key, value in dic.items():
         full_key = namespace + key
         if isinstance(value, dict) and not (PLURALS.issuperset(value) and value):
-            loaded.extend(load_translation_dic(value, full_key, locale))
+            _flatten_translation_dic(value, full_key, result)
         else:
-            translations.add(full_key, value, locale)
-            loaded.append(full_key)
-    return loaded
+            result[full_key] = value
 
 
 def search_translation(key: str, locale: str) -> bool:
+    if metrics.enabled:
+        metrics.increment("searches")
     if not _check_locked(locale):
+        if _preloader is not None and _preloader.load_now(key, locale):
+            return translations.has(key, locale)
+        from . import archives
+
         splitted_key = key.split(config.get('namespace_delimiter'))
         namespace = splitted_key[:-1]
-        for directory in config.get("load_path"):
+        for directory in archives.load_path():
             if config.get("use_locale_dirs"):
                 directory = os.path.join(directory, locale)
-            recursive_search_dir(namespace, "", directory, locale)
+            recursive_search_dir(namespace, "", directory, locale, key)
     return translations.has(key, locale)
 
 
+def find_translation_files(splitted_namespace: List[str], locale: str) -> List[TranslationFile]:
+    """
+    Finds files that may contain translations from the namespace
+
+    Works the same way as `search_translation()`, but doesn't load anything
+
+    :param splitted_namespace: Namespace splitted by namespace delimiter
+    :param locale: Locale to search files for
+    :return: List of found files
+    """
+
+    from . import archives
+
+    files = []
+    for directory in archives.load_path():
+        if config.get("use_locale_dirs"):
+            directory = os.path.join(directory, locale)
+        file = _find_translation_file(splitted_namespace, directory, locale)
+        if file is not None:
+            files.append(file)
+    return files
+
+
 def recursive_search_dir(
     splitted_namespace: List[str],
     directory: str,
     root_dir: str,
     locale: str,
+    key: Optional[str] = None,
 ) -> None:
+    file = _find_translation_file(splitted_namespace, root_dir, locale, directory)
+    if file is None:
+        return
+    if key is not None:
+        loader = get_loader(os.path.splitext(file.filename)[1][1:])
+        if loader.supports_lookup:
+            _lookup_translation(loader, file, key, locale)
+            return
+    load_translation_file(file.filename, root_dir, locale)
+
+
+@metrics.timed("load_time")
+def _lookup_translation(loader: Loader, file: TranslationFile, key: str, locale: str) -> None:
+    from . import load_trace
+
+    if config.get("record_loaded_files"):
+        from . import manifest
+
+        # warming from manifest loads the whole file
+        manifest.record(file)
+    # the file was found by namespace of the key, so the key starts with it
+    namespace = get_namespace_from_filepath(file.filename)
+    if namespace:
+        namespace += config.get("namespace_delimiter")
+    path = os.path.join(file.base_directory, file.filename)
+    # traced as a file with one key, so that its discovery isn't left pending
+    with load_trace.file_context(file, finish=True) as trace:
+        with load_trace.phase("read"):
+            value = loader.lookup(path, key[len(namespace):])
+        if value is None:
+            return
+        if trace is not None:
+            trace.loader = loader.__class__.__name__
+            trace.keys += 1
+        translations.add(key, value, locale)
+        with load_trace.phase("static_refs"):
+            expand_static_refs([key], locale)
+
+
+def _find_translation_file(
+    splitted_namespace: List[str],
+    root_dir: str,
+    locale: str,
+    directory: str = "",
+) -> Optional[TranslationFile]:
+    start = perf_counter()
+    filename = find_translation_file(splitted_namespace, directory, root_dir, locale)
+    if filename is None:
+        return None
+    file = TranslationFile(root_dir, filename, locale)
+    if config.get("trace_loading"):
+        from . import load_trace
+
+        load_trace.discovered(file, perf_counter() - start, lazy=True)
+    return file
+
+
+def find_translation_file(
+    splitted_namespace: List[str],
+    directory: str,
+    root_dir: str,
+    locale: str,
+) -> Optional[str]:
     namespace = splitted_namespace[0] if splitted_namespace else ""
     seeked_file = os.path.join(
         directory,
@@ -221,26 +558,37 @@ def recursive_search_dir(
             format=config.get("file_format"),
         ),
     )
-    if os.path.isfile(os.path.join(root_dir, seeked_file)):
-        return load_translation_file(seeked_file, root_dir, locale)
+    from . import archives
+
+    if metrics.enabled:
+        metrics.increment("fs_probes")
+    if archives.isfile(os.path.join(root_dir, seeked_file)):
+        return seeked_file
 
     if not namespace:
-        return
+        return None
     namespace = os.path.join(directory, namespace)
-    if os.path.isdir(os.path.join(root_dir, namespace)):
-        recursive_search_dir(
+    if archives.isdir(os.path.join(root_dir, namespace)):
+        return find_translation_file(
             splitted_namespace[1:],
             namespace,
             root_dir,
             locale,
         )
+    return None
+
 
+def recursive_find_files(
+    root_dir: str,
+    directory: str,
+    locale: Optional[str],
+) -> Iterator[TranslationFile]:
+    from . import archives
 
-def recursive_load_everything(root_dir: str, directory: str, locale: Optional[str]) -> None:
     dir_ = os.path.join(root_dir, directory)
-    for f in os.listdir(dir_):
+    for f in archives.listdir(dir_):
         path = os.path.join(dir_, f)
-        if os.path.isfile(path):
+        if archives.isfile(path):
             if os.path.splitext(path)[1][1:] != config.get("file_format"):
                 continue
             format_match = config.get("filename_format").match(f)
@@ -252,30 +600,46 @@ def recursive_load_everything(root_dir: str, directory: str, locale: Optional[st
                 requested_locale = file_locale
             if requested_locale is not None:
                 if requested_locale == file_locale:
-                    load_translation_file(
-                        os.path.join(directory, f),
+                    yield TranslationFile(
                         root_dir,
+                        os.path.join(directory, f),
                         requested_locale,
                     )
             elif not config.get("skip_locale_root_data"):
-                file_content = load_resource(path, None, False)
-                for loc, dic in file_content.items():
-                    if isinstance(dic, dict):
-                        loaded = load_translation_dic(
-                            dic,
-                            get_namespace_from_filepath(os.path.join(directory, f)),
-                            loc,
-                        )
-                        formatters.expand_static_refs(loaded, loc)
+                yield TranslationFile(root_dir, os.path.join(directory, f), None)
             else:
                 raise I18nFileLoadError(
                     f"Cannot identify locales for {path!r}:"
                     " filename_format doesn't include locale"
                     " and skip_locale_root_data is set to True"
                 )
-        elif os.path.isdir(path):  # pragma: no branch
-            recursive_load_everything(
+        elif archives.isdir(path):  # pragma: no branch
+            yield from recursive_find_files(
                 root_dir,
                 os.path.join(directory, f),
                 locale,
             )
+
+
+# settings that change which files exist, index of the preloader doesn't match them anymore
+_PRELOAD_SETTINGS = frozenset(("load_path", "filename_format", "file_format", "use_locale_dirs"))
+
+
+# settings that enable eviction
+_EVICTION_SETTINGS = ("locale_idle_timeout", "max_loaded_locales")
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global _preloader, _eviction
+
+    preloader = _preloader
+    if preloader is not None and not _PRELOAD_SETTINGS.isdisjoint(changed):
+        _preloader = None
+        preloader.cancel()
+    if _eviction is None and any(config.get(name) is not None for name in _EVICTION_SETTINGS):
+        from . import eviction
+
+        _eviction = eviction
+        # files loaded until now weren't recorded, so they must be read again after eviction
+        Loader.loaded_files.clear()
@@ -0,0 +1,41 @@
+__all__ = ("ConfigSnapshot",)
+
+from typing import Any, NamedTuple, Optional
+
+
+class ConfigSnapshot(NamedTuple):
+    """
+    Immutable copy of settings
+
+    Lists are converted into tuples
+    """
+
+    generation: int
+    filename_format: Any
+    file_format: str
+    available_locales: tuple
+    load_path: tuple
+    locale: str
+    fallback: Optional[str]
+    placeholder_delimiter: str
+    on_missing_translation: Any
+    on_missing_placeholder: Any
+    on_missing_plural: Any
+    encoding: str
+    namespace_delimiter: str
+    plural_few: int
+    skip_locale_root_data: bool
+    enable_memoization: bool
+    memoization_max_entries: Optional[int]
+    memoization_max_bytes: Optional[int]
+    argument_delimiter: str
+    use_locale_dirs: bool
+    lazy_static_refs: bool
+    enable_metrics: bool
+    profiler_sample_rate: Optional[int]
+    trace_loading: bool
+    timing_hook: Any
+    record_loaded_files: bool
+    catalog_backend: Any
+    locale_idle_timeout: Optional[float]
+    max_loaded_locales: Optional[int]
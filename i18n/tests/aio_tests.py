@@ -0,0 +1,103 @@
+# -*- encoding: utf-8 -*-
+
+import os
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+from importlib import reload
+
+import i18n
+from i18n import aio, config, resource_loader, translations
+from i18n.errors import I18nLockedError
+from i18n.loaders import Loader, LoadedFilesCache
+
+
+RESOURCE_FOLDER = os.path.join(os.path.dirname(__file__), "resources")
+
+
+class TestAsyncLoading(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        resource_loader.loaders = {}
+        resource_loader.init_json_loader()
+        translations.clear()
+        Loader.loaded_files = LoadedFilesCache()
+        reload(config)
+        config.set("load_path", [os.path.join(RESOURCE_FOLDER, "translations")])
+        config.set("file_format", "json")
+
+    def tearDown(self):
+        i18n.unload_everything()
+
+    async def test_at(self):
+        with mock.patch(
+            "i18n.resource_loader.search_translation",
+            side_effect=RuntimeError,
+        ):
+            self.assertEqual(await i18n.at("bar.baz.qux"), "hoge")
+            self.assertEqual(await i18n.at("bar.baz.qux", "en"), "hoge")
+            self.assertEqual(await i18n.at("bar.baz.missing"), "bar.baz.missing")
+
+            translations.add("only_fallback", "%{x}", "fr")
+            config.set("fallback", "fr")
+            self.assertEqual(await i18n.at("only_fallback", x=1), "1")
+            self.assertEqual(await i18n.at("bar.baz.missing"), "bar.baz.missing")
+
+            config.set("enable_metrics", True)
+            i18n.reset_stats()
+            self.assertEqual(await i18n.at("bar.baz.qux"), "hoge")
+            self.assertEqual(await i18n.at("only_fallback", x=1), "1")
+            self.assertEqual(await i18n.at("bar.baz.missing"), "bar.baz.missing")
+        stats = i18n.stats()
+        self.assertEqual((stats["hits"], stats["fallback_hits"], stats["misses"]), (1, 1, 1))
+
+    async def test_coalescing(self):
+        with mock.patch(
+            "i18n.resource_loader.read_translation_file",
+            side_effect=resource_loader.read_translation_file,
+        ) as read_mock:
+            results = await asyncio.gather(
+                *(i18n.at("bar.baz.qux") for _ in range(5)),
+                i18n.ensure_loaded("bar.baz"),
+            )
+        self.assertEqual(results[:5], ["hoge"] * 5)
+        read_mock.assert_called_once()
+        self.assertEqual(aio._pending, {})
+
+    async def test_aload_everything(self):
+        with tempfile.TemporaryDirectory() as dir1, tempfile.TemporaryDirectory() as dir2:
+            config.set("load_path", [dir1, dir2])
+            for i, directory in enumerate((dir1, dir2)):
+                for name in ("a", "b"):
+                    with open(os.path.join(directory, name + ".en.json"), "w") as f:
+                        f.write('{"en": {"x": "%s"}}' % i)
+
+            await i18n.aload_everything(lock=True)
+            # later files should override earlier ones
+            self.assertEqual(translations.get("a.x"), "1")
+            self.assertEqual(translations.get("b.x"), "1")
+            with self.assertRaises(I18nLockedError):
+                await i18n.aload_everything()
+
+            # nothing should be loaded after locking
+            with mock.patch(
+                "i18n.resource_loader.find_translation_files",
+                side_effect=RuntimeError,
+            ):
+                await i18n.ensure_loaded("c")
+
+        i18n.unload_everything()
+        config.set("load_path", [os.path.join(RESOURCE_FOLDER, "translations", "bar")])
+        await i18n.aload_everything("en")
+        self.assertTrue(translations.has("a.abc.x"))
+
+    async def test_locale_dirs(self):
+        config.set("filename_format", "{namespace}.{format}")
+        config.set("skip_locale_root_data", True)
+        config.set("use_locale_dirs", True)
+        await i18n.ensure_loaded("d", "bar")
+        self.assertTrue(translations.has("d.not_a_dict", "bar"))
+
+    def test_lazy_import(self):
+        with self.assertRaises(AttributeError):
+            i18n.nonexistent
@@ -0,0 +1,142 @@
+# -*- encoding: utf-8 -*-
+
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from i18n import config, translations
+from i18n.benchmarks import __main__ as benchmarks, catalog, hot_path, locale_switching, startup
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare(self):
+        baseline = {"suite": {"a": 100.0, "b": 100.0, "c": 100.0, "zero": 0.0}}
+        results = {
+            "suite": {"a": 105.0, "b": 120.0, "d": 1.0, "zero": 5.0},
+            "other": {"a": 1.0},
+        }
+        with redirect_stdout(io.StringIO()) as out:
+            regressions = benchmarks.compare(results, baseline, 0.1)
+        self.assertEqual(regressions, ["suite/b: 100.0 -> 120.0 (+20.0%)"])
+        self.assertIn("suite/a: 100.0 -> 105.0 (+5.0%)", out.getvalue())
+        self.assertIn("suite/zero: 0.0 -> 5.0\n", out.getvalue())
+
+    def test_main(self):
+        load_path = list(config.get("load_path"))
+        locale = config.get("locale")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, "results.json")
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(benchmarks.main(
+                    ["hot_path", "locale_switching", "-n", "10", "-o", output],
+                ), 0)
+            self.assertIn("== locale_switching", out.getvalue())
+            with open(output) as f:
+                data = json.load(f)
+            self.assertEqual(set(data["results"]), {"hot_path", "locale_switching"})
+            self.assertEqual(
+                set(data["results"]["hot_path"]),
+                set(hot_path.CASES)
+                | {"frozen " + name for name in hot_path.CASES}
+                | {"plain hit calls"},
+            )
+            # optional features that are off don't slow down plain hit
+            self.assertLessEqual(
+                data["results"]["hot_path"]["plain hit calls"],
+                hot_path.PLAIN_HIT_CALLS,
+            )
+            self.assertEqual(config.get("load_path"), load_path)
+            self.assertEqual(config.get("locale"), locale)
+            self.assertFalse(translations.has(locale_switching.KEY, "uk"))
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(
+                    benchmarks.main(["hot_path", "-n", "10", "-b", output, "-t", "1e9"]),
+                    0,
+                )
+
+            for cases in data["results"].values():
+                for case in cases:
+                    cases[case] = 1e-6
+            with open(output, "w") as f:
+                json.dump(data, f)
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(benchmarks.main(["hot_path", "-n", "10", "-b", output]), 1)
+            self.assertIn("Regressions:", out.getvalue())
+
+            with redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    benchmarks.main(["unknown"])
+                with self.assertRaises(SystemExit):
+                    benchmarks.main(["startup", "--shape", "size=1"])
+
+    def test_generate_catalog(self):
+        shape = catalog.CatalogShape.with_keys(
+            2000,
+            depth=2,
+            keys_per_file=50,
+            static_ref_density=0.5,
+        )
+        self.assertEqual(shape.files, 20)
+        self.assertEqual(shape.total_keys, 2000)
+        self.assertEqual(catalog.namespaces(shape)[13], "d3.d1.f13")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            settings = catalog.generate(tmp_dir, shape)
+            with open(os.path.join(tmp_dir, "d3", "d1", "f13.l1.json")) as f:
+                data = json.load(f)
+            self.assertEqual(list(data), ["l1"])
+            self.assertEqual(len(data["l1"]), 50)
+            self.assertTrue(any(isinstance(v, dict) for v in data["l1"].values()))
+            self.assertTrue(any("%{.d3.d1.f13.k" in str(v) for v in data["l1"].values()))
+        self.assertEqual(settings["filename_format"], "{namespace}.{locale}.{format}")
+
+        # same shape produces same files
+        shape = shape._replace(use_locale_dirs=True)
+        contents = []
+        for _ in range(2):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                settings = catalog.generate(tmp_dir, shape)
+                with open(os.path.join(tmp_dir, "l1", "d3", "d1", "f13.json")) as f:
+                    contents.append(json.load(f))
+        self.assertEqual(contents[0], contents[1])
+        self.assertEqual(len(contents[0]), 50)
+        self.assertTrue(settings["use_locale_dirs"])
+
+    @unittest.skipUnless(config.yaml_available, "yaml library not available")
+    def test_generate_yaml_catalog(self):
+        import yaml
+
+        shape = catalog.CatalogShape(files=1, file_format="yml")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            catalog.generate(tmp_dir, shape)
+            with open(os.path.join(tmp_dir, "d0", "f0.l0.yml")) as f:
+                data = yaml.safe_load(f)
+        self.assertEqual(len(data["l0"]), 100)
+
+    def test_startup(self):
+        load_path = list(config.get("load_path"))
+        filename_format = config.get("filename_format").template
+        use_locale_dirs = config.get("use_locale_dirs")
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(
+                benchmarks.main(
+                    ["startup", "-n", "1", "--sizes", "200", "--shape", "use_locale_dirs=yes"],
+                ),
+                0,
+            )
+        self.assertIn("200 keys: load_everything (ms)", out.getvalue())
+        self.assertEqual(config.get("load_path"), load_path)
+        self.assertEqual(config.get("filename_format").template, filename_format)
+        self.assertEqual(config.get("use_locale_dirs"), use_locale_dirs)
+
+        with redirect_stdout(io.StringIO()):
+            results = startup.main(1, sizes=(100,), depth=0)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(benchmarks.parse_shape_option("depth=3"), ("depth", 3))
+        self.assertEqual(
+            benchmarks.parse_shape_option("placeholder_density=0.5"),
+            ("placeholder_density", 0.5),
+        )
@@ -0,0 +1,106 @@
+# -*- encoding: utf-8 -*-
+
+import io
+import os
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from i18n import __main__ as cli
+from i18n.extract import FUNCTIONS, KeyManifest, extract_keys, scan_source
+
+
+SOURCE = '''
+import i18n
+from i18n import t
+
+t("foo.hi", name="Bob")
+i18n.t("foo." "bar")
+translator.t("foo.baz" + ".qux", count=2)
+await i18n.at(f"errors.{code}")
+i18n.compile_key("pre." + suffix)
+t(key)
+t(f"{prefix}.x")
+t(f"f.{x}" + ".y")
+print("not.a.key")
+_("custom.key")
+t()
+(lambda: t)()("not.detected")
+'''
+
+
+class TestExtract(unittest.TestCase):
+    def test_scan_source(self):
+        manifest = scan_source(SOURCE, "app.py")
+        self.assertEqual(manifest.keys, {"foo.hi", "foo.bar", "foo.baz.qux"})
+        self.assertEqual(manifest.prefixes, ("errors.", "f.", "pre."))
+        self.assertEqual(manifest.dynamic, ("app.py:10", "app.py:11"))
+        self.assertEqual(
+            scan_source(SOURCE, functions=["_"]).keys,
+            {"custom.key"},
+        )
+        self.assertEqual(repr(manifest), "<KeyManifest 3 keys, 3 prefixes, 2 dynamic>")
+
+    def test_select(self):
+        manifest = KeyManifest(["a.x", "a.plural", "a.number"], ["b."])
+        self.assertTrue(manifest.wants("b.anything"))
+        self.assertFalse(manifest.wants("a.y"))
+        self.assertTrue(manifest.may_contain(""))
+        self.assertTrue(manifest.may_contain("a"))
+        self.assertTrue(manifest.may_contain("b"))
+        self.assertFalse(manifest.may_contain("c"))
+        translations = {
+            "a.x": "see %{.a.y} and %{z}",
+            "a.y": "and %{.w}",
+            "a.w": "W",
+            "a.plural": {"one": "%{.a.one}", "many": ["%%{.a.unused}"]},
+            "a.one": "one",
+            "a.unused": "unused",
+            "a.z": "not a reference",
+            "a.number": 5,
+        }
+        self.assertEqual(
+            manifest.select(translations),
+            ["a.x", "a.y", "a.w", "a.plural", "a.one", "a.number"],
+        )
+
+    def test_cli(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "src")
+            os.makedirs(os.path.join(src, "pkg"))
+            with open(os.path.join(src, "pkg", "app.py"), "w") as f:
+                f.write(SOURCE)
+            with open(os.path.join(src, "broken.py"), "w") as f:
+                f.write("t('x'")
+            with open(os.path.join(src, "notes.txt"), "w") as f:
+                f.write("t('x')")
+            with open(os.path.join(tmp_dir, "single.py"), "w") as f:
+                f.write("t('single.key')")
+            output = os.path.join(tmp_dir, "keys.json")
+            with redirect_stdout(io.StringIO()) as out, self.assertWarnsRegex(
+                UserWarning,
+                "skipping .*broken.py",
+            ):
+                code = cli.main(
+                    ["extract", src, os.path.join(tmp_dir, "single.py"), "-o", output, "-f", "_"],
+                )
+            self.assertEqual(code, 0)
+            self.assertIn("5 keys, 3 prefixes and 2 dynamic keys", out.getvalue())
+            self.assertIn("dynamic key: " + os.path.join(src, "pkg", "app.py:10"), out.getvalue())
+            with open(output) as f:
+                self.assertEqual(json.load(f)["keys"][0], "custom.key")
+
+            manifest = KeyManifest.load(output)
+            with self.assertWarns(UserWarning):
+                keys = extract_keys([src, os.path.join(tmp_dir, "single.py")], FUNCTIONS + ("_",))
+            self.assertEqual(manifest.keys, keys.keys)
+            self.assertEqual(manifest.prefixes, ("errors.", "f.", "pre."))
+
+            with open(output, "w") as f:
+                json.dump({"version": 2}, f)
+            with self.assertRaisesRegex(ValueError, "unsupported manifest version: 2"):
+                KeyManifest.load(output)
+
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            cli.main([])
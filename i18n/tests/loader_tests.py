@@ -5,9 +5,23 @@ from __future__ import unicode_literals
 import unittest
 from unittest import mock
 import os
+import sys
+import subprocess
+import json
 import os.path
 import tempfile
-from typing import cast
+import threading
+import gc
+import asyncio
+import sqlite3
+import struct
+import gettext
+import io
+import zipfile
+import pathlib
+from collections import deque
+import importlib.resources
+from typing import Any, Dict, List, Tuple, cast
 from importlib import reload
 
 import i18n
@@ -16,18 +30,136 @@ from i18n.errors import I18nFileLoadError, I18nInvalidFormat, I18nLockedError
 from i18n.translator import t
 from i18n import config
 from i18n.config import yaml_available
-from i18n import translations, formatters
-from i18n.loaders import Loader
+from i18n import translations, formatters, load_trace, manifest, eviction, archives
+from i18n.loaders import Loader, LoadedFilesCache
+from i18n.extract import KeyManifest
+from i18n import backends
+from i18n.backends import CatalogBackend, CatalogView, DictBackend, FrozenBackend
+from i18n.loaders.json_loader import JsonIndex, scan_json_object
+from i18n.loaders.loader import estimate_size
+from i18n.loaders.mo_loader import hash_string
 
 
 RESOURCE_FOLDER = os.path.join(os.path.dirname(__file__), "resources")
 
 
+class FlatBackend(CatalogBackend):
+    """Keeps all translations in one dict to check that only the interface is used"""
+
+    def __init__(self):
+        self.items = {}
+
+    def add_many(self, items, locale):
+        for key, value in items:
+            self.items[locale, key] = value
+
+    def get(self, key, locale):
+        return self.items[locale, key]
+
+    def has(self, key, locale):
+        return (locale, key) in self.items
+
+    def clear(self, locale=None):
+        for item in list(self.items):
+            if locale in (None, item[0]):
+                del self.items[item]
+
+    def keys(self, locale, prefix=""):
+        return (
+            key
+            for item_locale, key in list(self.items)
+            if item_locale == locale and key.startswith(prefix)
+        )
+
+    def locales(self):
+        return iter({locale for locale, _ in self.items})
+
+    def memory_usage(self):
+        return estimate_size(self.items)
+
+
+def make_mo(messages, hash_table=True, byte_order="<"):
+    """Builds .mo file the same way as GNU msgfmt, tuple keys and lists are plural forms"""
+
+    def encode(value):
+        if isinstance(value, (tuple, list)):
+            value = "\0".join(value)
+        return value.encode("utf-8")
+
+    items = sorted((encode(k), encode(v)) for k, v in messages.items())
+    size = len(items)
+    hash_size = 0
+    if hash_table:
+        hash_size = max(3, size * 4 // 3)
+        while any(hash_size % i == 0 for i in range(2, hash_size)):
+            hash_size += 1
+    originals = 28
+    translations_offset = originals + size * 8
+    hash_offset = translations_offset + size * 8
+    data = b""
+    tables = []
+    start = hash_offset + hash_size * 4
+    for strings in (items, [(v, k) for k, v in items]):
+        table = []
+        for string, _ in strings:
+            table.append((len(string), start + len(data)))
+            data += string + b"\0"
+        tables.append(table)
+    hashes = [0] * hash_size
+    for i, (msgid, _) in enumerate(items if hash_table else ()):
+        value = hash_string(msgid.partition(b"\0")[0])
+        index = value % hash_size
+        while hashes[index]:
+            index = (index + 1 + value % (hash_size - 2)) % hash_size
+        hashes[index] = i + 1
+    return b"".join([
+        struct.pack(
+            byte_order + "7I",
+            0x950412DE,
+            0,
+            size,
+            originals,
+            translations_offset,
+            hash_size,
+            hash_offset,
+        ),
+        b"".join(struct.pack(byte_order + "2I", *entry) for entry in tables[0]),
+        b"".join(struct.pack(byte_order + "2I", *entry) for entry in tables[1]),
+        b"".join(struct.pack(byte_order + "I", entry) for entry in hashes),
+        data,
+    ])
+
+
+LAZY_IMPORT_CODE = """
+import sys
+import i18n
+from i18n.formatters import TranslationFormatter
+print(sorted(m for m in sys.modules if m.startswith(("yaml", "json", "i18n.loaders."))))
+print("pattern" in vars(TranslationFormatter))
+print(sorted(m for m in sys.argv[1:] if m in sys.modules))
+"""
+
+# modules of optional features, they're imported only when needed
+OPTIONAL_MODULES = (
+    "threading",
+    "i18n.preload",
+    "i18n.manifest",
+    "i18n.profiler",
+    "i18n.eviction",
+    "i18n.archives",
+    "i18n.load_trace",
+    "i18n.call_timing",
+    "i18n.snapshot",
+    "i18n.backends.sqlite_backend",
+)
+
+
 class TestFileLoader(unittest.TestCase):
     def setUp(self):
         resource_loader.loaders = {}
-        translations.container = {}
-        Loader.loaded_files = {}
+        resource_loader._pending_loaders = {}
+        translations.clear()
+        Loader.loaded_files = LoadedFilesCache()
         reload(config)
         config.set("load_path", [os.path.join(RESOURCE_FOLDER, "translations")])
         config.set("filename_format", "{namespace}.{locale}.{format}")
@@ -56,6 +188,36 @@ class TestFileLoader(unittest.TestCase):
         resource_loader.register_loader(Loader, ["x", "y"])
         self.assertIs(resource_loader.loaders["x"], resource_loader.loaders["y"])
 
+    def test_lazy_imports(self):
+        output = subprocess.check_output(
+            (sys.executable, "-c", LAZY_IMPORT_CODE) + OPTIONAL_MODULES,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            text=True,
+        )
+        # before Python 3.9 patterns of `Template` subclasses are always compiled at class creation
+        self.assertEqual(
+            output.split("\n")[:3],
+            ["['i18n.loaders.loader']", str(sys.version_info < (3, 9)), "[]"],
+        )
+        self.assertIs(formatters.Formatter.pattern, formatters.Formatter.pattern)
+        self.assertEqual(formatters.Formatter.pattern.sub("x", "a %{name}"), "a x")
+        # only `TranslationFormatter` supports functions
+        self.assertEqual(formatters.Formatter.pattern.sub("x", "%{f(a)}"), "x{f(a)}")
+        self.assertEqual(formatters.TranslationFormatter.pattern.sub("x", "%{f(a)}"), "x")
+
+        resource_loader.init_loaders()
+        self.assertEqual(resource_loader.loaders, {})
+        loader = resource_loader.get_loader("json")
+        self.assertIsInstance(loader, i18n.loaders.JsonLoader)
+        self.assertIs(resource_loader.get_loader("json"), loader)
+        resource_loader.register_loader(Loader, ["py"])
+        self.assertIs(type(resource_loader.get_loader("py")), Loader)
+        self.assertNotIn("py", resource_loader._pending_loaders)
+        with self.assertRaises(AttributeError):
+            i18n.loaders.NoSuchLoader
+        if yaml_available:
+            self.assertIs(resource_loader.get_loader("yaml"), resource_loader.get_loader("yml"))
+
     def test_register_python_loader(self):
         resource_loader.init_python_loader()
         with self.assertRaisesRegex(I18nFileLoadError, "error loading file .*"):
@@ -178,6 +340,60 @@ en = {{"key": "value"}}
             finally:
                 os.chdir(orig_wd)
 
+    def test_memoization_limits(self):
+        resource_loader.init_python_loader()
+        config.set("filename_format", "{namespace}.{format}")
+        config.set("file_format", "py")
+        config.set("memoization_max_entries", 1)
+        cache = cast(LoadedFilesCache, Loader.loaded_files)
+        filename = os.path.join(RESOURCE_FOLDER, "translations", "multilingual.py")
+
+        self.assertEqual(t("multilingual.hi"), "Hello")
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertIn(filename, cache)
+        self.assertEqual(list(cache), [filename])
+        # the file isn't memoized anymore, so it has to be read again
+        cache["other"] = None
+        self.assertNotIn(filename, cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(t("multilingual.hi", locale="uk"), "Привіт")
+        self.assertIsNotNone(cache[filename])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        i18n.unload_everything()
+        cache.reset_stats()
+        config.set("memoization_max_entries", None)
+        config.set("memoization_max_bytes", 10 ** 8)
+        self.assertEqual(t("multilingual.hi"), "Hello")
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertGreater(stats["bytes"], 0)
+        self.assertLessEqual(stats["bytes"], 10 ** 8)
+        del cache[filename]
+        self.assertEqual(cache.stats()["bytes"], 0)
+        # only items that weren't measured before are walked
+        content: Dict[str, Any] = {"en": {"hi": "Hello"}, "uk": {"hi": "Привіт"}}
+        cache["multi"] = content
+        self.assertEqual(cache.stats()["bytes"], estimate_size(content))
+        content.pop("en")
+        with mock.patch("i18n.loaders.loader.estimate_size", side_effect=AssertionError):
+            cache["multi"] = content
+        self.assertEqual(cache.stats()["bytes"], estimate_size(content))
+        content["uk"] = {"hi": "Привіт!"}
+        cache["multi"] = content
+        self.assertEqual(cache.stats()["bytes"], estimate_size(content))
+        cache["multi"] = None
+        self.assertEqual(cache.stats()["bytes"], estimate_size(None))
+        del cache["multi"]
+        self.assertGreater(estimate_size({"a": ("b",)}), estimate_size({"a": ()}))
+        with self.assertRaises(KeyError):
+            del cache[filename]
+
+        config.set("memoization_max_bytes", 1)
+        i18n.unload_everything()
+        self.assertEqual(t("multilingual.hi"), "Hello")
+        self.assertEqual(cache.stats()["entries"], 0)
+
     def test_load_everything(self):
         i18n.load_path[0] = os.path.join(RESOURCE_FOLDER, "translations", "bar")
         config.set("file_format", "json")
@@ -274,8 +490,86 @@ en = {{"key": "value"}}
         self.assertEqual(t("multilingual.hi"), "Hello")
         self.assertEqual(t("multilingual.hi", locale="uk"), "Привіт")
 
+    def test_streaming_json_loader(self):
+        i18n.register_loader(i18n.loaders.StreamingJsonLoader, ["json"])
+        config.set("enable_metrics", True)
+        i18n.reset_stats()
+        config.set("file_format", "json")
+        config.set("filename_format", "{namespace}.{format}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config.set("load_path", [tmp_dir])
+            filename = os.path.join(tmp_dir, "all.json")
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "en": {"hi": "Hello", "list": ["{", "}"]},
+                        "skipped": [1, {"a": "\\\"]"}, None, True, -1.5e3],
+                        "uk": {"hi": "Привіт"},
+                    },
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.assertEqual(t("all.hi"), "Hello")
+            self.assertEqual(i18n.stats()["files_parsed.StreamingJsonLoader"], 1)
+            # only the requested part is read
+            self.assertLess(i18n.stats()["bytes_read"], os.path.getsize(filename) / 2)
+            index = Loader.loaded_files[filename]
+            self.assertIsInstance(index, JsonIndex)
+            self.assertEqual(set(cast(dict, index)), {"skipped", "uk"})
+
+            # other locales are read without rescanning
+            config.set("enable_metrics", False)
+            with mock.patch(
+                "i18n.loaders.json_loader.scan_json_object",
+                side_effect=RuntimeError,
+            ):
+                self.assertEqual(t("all.hi", locale="uk"), "Привіт")
+                loader = resource_loader.loaders["json"]
+                with self.assertRaisesRegex(I18nFileLoadError, "error getting data .*"):
+                    loader.load_resource(filename, "fr", True)
+                Loader.loaded_files[filename] = JsonIndex()
+                self.assertEqual(loader.load_resource(filename, "en", True), {})
+
+            # full content is loaded without locale
+            i18n.unload_everything()
+            t("all.hi")
+            i18n.load_everything()
+            self.assertEqual(translations.get("all.list", "en"), ("{", "}"))
+            self.assertEqual(translations.get("all.hi", "uk"), "Привіт")
+
+            i18n.unload_everything()
+            config.set("enable_memoization", False)
+            self.assertEqual(t("all.hi", locale="uk"), "Привіт")
+            self.assertNotIn(filename, Loader.loaded_files)
+
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write('{"en": {"hi": "Hello"')
+            with self.assertRaisesRegex(I18nFileLoadError, "invalid JSON: .*"):
+                t("all.hi")
+            open(filename, "w").close()
+            with self.assertRaisesRegex(I18nFileLoadError, "invalid JSON: .*"):
+                t("all.hi")
+            os.remove(filename)
+            with self.assertRaisesRegex(I18nFileLoadError, "error loading file .*"):
+                i18n.loaders.StreamingJsonLoader().scan_file(filename)
+            with self.assertRaisesRegex(I18nFileLoadError, "error loading file .*"):
+                i18n.loaders.StreamingJsonLoader().load_span(filename, 0, 1)
+
+    def test_scan_json_object(self):
+        self.assertEqual(scan_json_object(b" {} "), {})
+        self.assertEqual(
+            scan_json_object(b'\xef\xbb\xbf{"a" : 1, "\\u0062":{"c": []}}'),
+            {"a": (10, 11), "b": (22, 31)},
+        )
+        for invalid in (b"[]", b'{"a" 1}', b'{"a": }', b'{"a": 1 "b": 2}', b'{"a": [1', b'{"a": "'):
+            with self.assertRaises(ValueError):
+                scan_json_object(invalid)
+
     def test_load_file_with_strange_encoding(self):
         resource_loader.init_json_loader()
+        # should fall back to full parsing
+        i18n.register_loader(i18n.loaders.StreamingJsonLoader, ["json"])
         config.set("encoding", "euc-jp")
         data = resource_loader.load_resource(
             os.path.join(RESOURCE_FOLDER, "settings", "eucjp_config.json"),
@@ -511,13 +805,11 @@ en = {{"key": "value"}}
         i18n.add_function("f", lambda *a: a[0])
         self.assertEqual(t("static_ref.asArgument"), "ver")
 
-        try:
-            with self.assertRaises(RecursionError):
-                t("static_ref2.foo")
-        except TypeError:  # pragma: no cover
-            from platform import python_implementation
-            if python_implementation() != "PyPy":
-                raise
+        with self.assertRaisesRegex(
+            i18n.I18nInvalidStaticRef,
+            "'static_ref2.foo' -> 'static_ref2.bar' -> 'static_ref2.foo'",
+        ):
+            t("static_ref2.foo")
 
         config.set("namespace_delimiter", "-")
         self.assertEqual(t("static_ref2-b"), "1")
@@ -526,6 +818,40 @@ en = {{"key": "value"}}
         with self.assertRaises(i18n.I18nInvalidStaticRef):
             t("static_ref2/x")
 
+    def test_lazy_static_refs(self):
+        resource_loader.init_json_loader()
+        config.set("file_format", "json")
+        config.set("filename_format", "{namespace}.{format}")
+        config.set("skip_locale_root_data", True)
+        config.set("lazy_static_refs", True)
+
+        self.assertEqual(t("static_ref.welcome"), "Welcome to Programname")
+        # other values are expanded only when accessed
+        self.assertEqual(
+            translations.get("static_ref.cool.best"),
+            "%{.p-name} is the best program %{.when}!",
+        )
+        self.assertIn("static_ref.cool.best", translations.deferred["en"])
+        self.assertNotIn("static_ref.ver", translations.deferred["en"])
+        self.assertEqual(t("static_ref.cool.best"), "Programname is the best program ever!")
+        self.assertNotIn("static_ref.cool.best", translations.deferred["en"])
+        self.assertNotIn("static_ref.when", translations.deferred["en"])
+
+        # broken references don't prevent loading
+        self.assertEqual(t("static_ref2.a"), "1")
+        with self.assertRaises(i18n.I18nInvalidStaticRef):
+            t("static_ref2.foo")
+
+        translations.add("list", ["a", "%{.static_ref.ver}"])  # type: ignore[arg-type]
+        formatters.defer_static_refs(("list",), "en")
+        self.assertEqual(t("list")[:], ("a", "ver"))
+
+        translations.clear("en")
+        self.assertNotIn("en", translations.deferred)
+        self.assertEqual(t("static_ref.welcome", locale="uk"), "static_ref.welcome")
+        translations.clear()
+        self.assertEqual(translations.deferred, {})
+
     def test_static_ref_expansion(self):
         locale = config.get("locale")
         i18n.add_translation("a.b", "%{.c}")
@@ -534,3 +860,1129 @@ en = {{"key": "value"}}
 
         formatters.expand_static_refs(("b",), locale)
         self.assertEqual(translations.get("b"), "c")
+
+    def test_metrics(self):
+        resource_loader.init_json_loader()
+        config.set("file_format", "json")
+        config.set("filename_format", "{namespace}.{format}")
+        config.set("skip_locale_root_data", True)
+        config.set("fallback", "uk")
+        i18n.reset_stats()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config.set("load_path", [tmp_dir])
+            os.mkdir(os.path.join(tmp_dir, "en"))
+            os.mkdir(os.path.join(tmp_dir, "uk"))
+            config.set("use_locale_dirs", True)
+            for locale, content in (
+                ("en", {"a": "A", "b": "%{.m.a}!"}),
+                ("uk", {"c": "C"}),
+            ):
+                with open(os.path.join(tmp_dir, locale, "m.json"), "w") as f:
+                    json.dump(content, f)
+
+            t("m.a")
+            self.assertEqual(i18n.stats(), {})
+
+            config.set("enable_metrics", True)
+            self.assertEqual(t("m.b"), "A!")
+            self.assertEqual(t("m.c"), "C")
+            self.assertEqual(t("m.d"), "m.d")
+            stats = i18n.stats()
+            self.assertEqual(stats["hits"], 1)
+            self.assertEqual(stats["fallback_hits"], 1)
+            self.assertEqual(stats["misses"], 1)
+            self.assertEqual(stats["searches"], 4)
+            self.assertEqual(stats["fs_probes"], 4)
+            self.assertEqual(stats["files_parsed"], 1)
+            self.assertEqual(stats["files_parsed.JsonLoader"], 1)
+            self.assertEqual(
+                stats["bytes_read"],
+                os.path.getsize(os.path.join(tmp_dir, "uk", "m.json")),
+            )
+            self.assertNotIn("static_refs_expanded", stats)
+            self.assertGreater(stats["load_time"], 0)
+
+            i18n.reset_stats()
+            i18n.unload_everything()
+            i18n.load_everything("en")
+            self.assertEqual(i18n.stats()["static_refs_expanded"], 1)
+
+            thread = threading.Thread(target=t, args=("m.a",))
+            thread.start()
+            thread.join()
+            del thread
+            gc.collect()
+            self.assertEqual(i18n.stats()["hits"], 1)
+            i18n.reset_stats()
+            self.assertEqual(i18n.stats(), {})
+
+            config.set("enable_metrics", False)
+            t("m.a")
+            self.assertEqual(i18n.stats(), {})
+
+    def test_preload(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(i18n.unload_everything)
+        for name, content in (
+            ("a.en.json", '{"x": "A"}'),
+            ("b.en.json", '{"x": "B", "ref": "%{.c.x}"}'),
+            ("c.en.json", '{"x": "C"}'),
+            ("c.fr.json", '{"x": "Cfr"}'),
+            ("bad.en.json", "{"),
+        ):
+            with open(os.path.join(tmp_dir.name, name), "w") as f:
+                f.write(content)
+        config.set("load_path", [tmp_dir.name])
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+
+        discovered = threading.Event()
+        gate = threading.Event()
+        order = []
+        iter_files = resource_loader.iter_translation_files
+        read = resource_loader.read_translation_file
+
+        def blocking_iter(locale):
+            discovered.wait()
+            return iter_files(locale)
+
+        def blocking_read(file):
+            order.append(file.filename)
+            if len(order) == 1:
+                gate.wait()
+            return read(file)
+
+        with mock.patch("i18n.resource_loader.iter_translation_files", blocking_iter), \
+                mock.patch("i18n.resource_loader.read_translation_file", blocking_read):
+            preloader = i18n.start_preload(["en"], priority=["c"])
+            self.assertEqual(preloader.progress, 0)
+            self.assertEqual(repr(preloader), "<Preloader 0/? files>")
+            threading.Timer(0.05, discovered.set).start()
+            threading.Timer(0.1, gate.set).start()
+            # waits for discovery, then b jumps to the front of the queue
+            self.assertEqual(t("b.ref"), "C")
+            self.assertTrue(preloader.wait(5))
+        self.assertEqual(order[:2], ["c.en.json", "b.en.json"])
+        self.assertEqual(preloader.progress, 1)
+        self.assertEqual(preloader.pending, [])
+        self.assertEqual(repr(preloader), "<Preloader 4/4 files>")
+        self.assertEqual(
+            [file for file, _ in preloader.errors],
+            [resource_loader.TranslationFile(tmp_dir.name, "bad.en.json", "en")],
+        )
+        self.assertEqual(t("a.x"), "A")
+
+        # the whole catalog is loaded, so the disk isn't searched
+        with mock.patch("i18n.resource_loader.recursive_search_dir", side_effect=RuntimeError):
+            self.assertEqual(t("a.missing"), "a.missing")
+            with self.assertRaises(RuntimeError):
+                t("c.x", "fr")
+        # the same error as without preloading
+        with self.assertRaises(I18nFileLoadError):
+            t("bad.x")
+
+        i18n.unload_everything()
+        self.assertTrue(preloader.cancelled)
+        self.assertIsNone(resource_loader._preloader)
+
+        def cancelling_iter(locale):
+            cast(i18n.preload.Preloader, resource_loader._preloader).cancel()
+            return iter_files(locale)
+
+        # found files aren't queued after cancelling during discovery
+        config.set("trace_loading", True)
+        with mock.patch("i18n.resource_loader.iter_translation_files", cancelling_iter):
+            preloader = i18n.start_preload(["en"])
+            self.assertTrue(preloader.wait(5))
+        self.assertEqual((preloader.total, preloader.loaded), (4, 0))
+        self.assertEqual(load_trace._pending, {})
+        # files found before an error aren't traced either
+        config.set("load_path", [tmp_dir.name, os.path.join(tmp_dir.name, "missing")])
+        self.assertTrue(i18n.start_preload(["en"]).wait(5))
+        self.assertEqual(load_trace._pending, {})
+        config.set("load_path", [tmp_dir.name])
+        config.set("trace_loading", False)
+        i18n.unload_everything()
+
+        preloader = i18n.start_preload()
+        self.assertEqual(t("c.x", "fr"), "Cfr")
+        self.assertIs(resource_loader._preloader, preloader)
+        i18n.start_preload(priority=["b"])
+        self.assertTrue(preloader.cancelled)
+        preloader = cast(i18n.preload.Preloader, resource_loader._preloader)
+        self.assertTrue(preloader.wait(5))
+
+        # preloaded files don't match changed settings, so the disk is searched again
+        with tempfile.TemporaryDirectory() as other_dir:
+            with open(os.path.join(other_dir, "d.en.json"), "w") as f:
+                f.write('{"x": "D"}')
+            config.set("load_path", [tmp_dir.name, other_dir])
+            self.assertTrue(preloader.cancelled)
+            self.assertIsNone(resource_loader._preloader)
+            self.assertEqual(t("d.x"), "D")
+        config.set("load_path", [tmp_dir.name])
+
+        i18n.unload_everything()
+        config.set("load_path", [os.path.join(tmp_dir.name, "missing")])
+        preloader = i18n.start_preload()
+        self.assertTrue(preloader.wait(5))
+        self.assertIsInstance(preloader.errors[0][1], OSError)
+        self.assertIsNone(preloader.errors[0][0])
+        self.assertEqual(t("a.x"), "a.x")
+
+        with tempfile.TemporaryDirectory() as empty_dir:
+            config.set("load_path", [empty_dir])
+            preloader = i18n.start_preload()
+            self.assertTrue(preloader.wait(5))
+            self.assertEqual(preloader.progress, 1)
+
+            i18n.load_everything("en", lock=True)
+            with self.assertRaises(I18nLockedError):
+                i18n.start_preload(["en"])
+            i18n.unload_everything()
+
+    def test_manifest(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(manifest.clear)
+        old_dir = os.path.join(tmp_dir.name, "old")
+        other_dir = os.path.join(tmp_dir.name, "other")
+        for name, content in (
+            ("old/sub/a.en.json", '{"x": "A"}'),
+            ("old/b.en.json", '{"x": "B"}'),
+            ("old/b.fr.json", '{"x": "Bfr"}'),
+            ("other/c.en.json", '{"x": "C"}'),
+        ):
+            os.makedirs(os.path.dirname(os.path.join(tmp_dir.name, name)), exist_ok=True)
+            with open(os.path.join(tmp_dir.name, name), "w") as f:
+                f.write(content)
+        config.set("load_path", [old_dir])
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+
+        t("b.x")
+        self.assertEqual(manifest.loaded_files(), [])
+        config.set("record_loaded_files", True)
+        self.assertEqual(t("sub.a.x"), "A")
+        self.assertEqual(t("b.x", "fr"), "Bfr")
+        resource_loader.load_translation_file("c.en.json", other_dir)
+        self.assertEqual(
+            [file.filename for file in manifest.loaded_files()],
+            [os.path.join("sub", "a.en.json"), "b.fr.json", "c.en.json"],
+        )
+        config.set("record_loaded_files", False)
+        manifest_path = os.path.join(tmp_dir.name, "manifest.json")
+        i18n.write_manifest(manifest_path)
+        with open(manifest_path) as f:
+            entries = json.load(f)["files"]
+        self.assertEqual(entries[0]["load_path"], 0)
+        self.assertEqual(entries[0]["directory"], ".")
+        self.assertEqual(entries[2]["directory"], other_dir)
+
+        # directories from load path are relative
+        new_dir = os.path.join(tmp_dir.name, "new")
+        os.rename(old_dir, new_dir)
+        i18n.unload_everything()
+        config.set("load_path", [new_dir])
+        loaded = i18n.warm_from_manifest(manifest_path, max_workers=2)
+        self.assertEqual(len(loaded), 3)
+        with mock.patch("i18n.resource_loader.recursive_search_dir", side_effect=RuntimeError):
+            self.assertEqual(t("sub.a.x"), "A")
+            self.assertEqual(t("b.x", "fr"), "Bfr")
+            self.assertEqual(t("c.x"), "C")
+
+        # missing files and locked locales are skipped
+        i18n.unload_everything()
+        os.remove(os.path.join(new_dir, "b.fr.json"))
+        i18n.load_everything("fr", lock=True)
+        self.assertEqual(i18n.warm_from_manifest(manifest_path), loaded[:1] + loaded[2:])
+        i18n.unload_everything()
+        config.set("load_path", [])
+        self.assertEqual(i18n.warm_from_manifest(manifest_path), loaded[2:])
+        i18n.unload_everything()
+
+        manifest.clear()
+        self.assertEqual(manifest.loaded_files(), [])
+        with open(manifest_path, "w") as f:
+            json.dump({"version": 0, "files": []}, f)
+        with self.assertRaisesRegex(ValueError, "unsupported manifest version: 0"):
+            i18n.warm_from_manifest(manifest_path)
+
+    def test_load_everything_only(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        for name, content in (
+            ("a.en.json", '{"x": "see %{.y}", "y": "Y", "z": "Z"}'),
+            ("b.en.json", '{"x": "B"}'),
+            ("c.en.json", '{"x": "C", "sub": {"y": "Y"}}'),
+        ):
+            with open(os.path.join(tmp_dir.name, name), "w") as f:
+                f.write(content)
+        config.set("load_path", [tmp_dir.name])
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+
+        manifest_path = os.path.join(tmp_dir.name, "keys.json")
+        KeyManifest(["a.x"], ["c.s"]).save(manifest_path)
+        with mock.patch(
+            "i18n.resource_loader.read_translation_file",
+            wraps=resource_loader.read_translation_file,
+        ) as read:
+            i18n.load_everything(only=manifest_path)
+        self.assertEqual(
+            sorted(file.filename for (file,), _ in read.call_args_list),
+            ["a.en.json", "c.en.json"],
+        )
+        self.assertEqual(translations.get("a.x", "en"), "see Y")
+        self.assertTrue(translations.has("a.y", "en"))
+        self.assertFalse(translations.has("a.z", "en"))
+        self.assertTrue(translations.has("c.sub.y", "en"))
+        self.assertFalse(translations.has("c.x", "en"))
+        # other keys are still loaded lazily
+        self.assertEqual(t("a.z"), "Z")
+        self.assertEqual(t("b.x"), "B")
+
+        i18n.unload_everything()
+        config.set("filename_format", "{locale}.{format}")
+        config.set("skip_locale_root_data", False)
+        with open(os.path.join(tmp_dir.name, "en.json"), "w") as f:
+            f.write('{"en": {"a": {"x": "A", "y": "Y"}}}')
+        i18n.load_everything("en", only=KeyManifest(["a.x"]))
+        self.assertTrue(translations.has("a.x", "en"))
+        self.assertFalse(translations.has("a.y", "en"))
+        i18n.unload_everything()
+
+    def test_load_trace(self):
+        resource_loader.init_json_loader()
+        config.set("file_format", "json")
+        config.set("filename_format", "{namespace}.{format}")
+        config.set("skip_locale_root_data", True)
+        config.set("use_locale_dirs", True)
+        load_trace.clear()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config.set("load_path", [tmp_dir])
+            os.mkdir(os.path.join(tmp_dir, "en"))
+            for name, content in (
+                ("a", {"x": "%{.b.y}", "z": "z"}),
+                ("b", {"y": "y"}),
+            ):
+                with open(os.path.join(tmp_dir, "en", name + ".json"), "w") as f:
+                    json.dump(content, f)
+
+            t("a.z")
+            self.assertEqual(load_trace.traces(), [])
+
+            i18n.unload_everything()
+            config.set("trace_loading", True)
+            # files read outside of loading aren't traced
+            resource_loader.load_resource(os.path.join(tmp_dir, "en", "b.json"), None)
+            self.assertEqual(load_trace._pending, {})
+            Loader.loaded_files.clear()
+            t("b.y")
+            i18n.load_everything("en")
+            traces = load_trace.traces()
+            self.assertEqual(
+                [(os.path.basename(trace.path), trace.keys, trace.lazy) for trace in traces],
+                # memoized file is read again, but nothing is added
+                [("b.json", 1, True), ("a.json", 2, False), ("b.json", 0, False)],
+            )
+            trace = traces[1]
+            self.assertEqual(trace.locale, "en")
+            self.assertEqual(trace.loader, "JsonLoader")
+            for phase in load_trace.PHASES:
+                self.assertGreater(getattr(trace, phase), 0, phase)
+            self.assertAlmostEqual(
+                trace.total,
+                sum(getattr(trace, phase) for phase in load_trace.PHASES),
+            )
+            self.assertIn("a.json", repr(trace))
+
+            lines = load_trace.report(sort_by="keys").splitlines()
+            self.assertEqual(len(lines), 4)
+            self.assertIn("lazy", lines[0])
+            self.assertTrue(lines[1].endswith("a.json (en, JsonLoader)"))
+            self.assertIn(" yes ", lines[2])
+            data = json.loads(load_trace.report_json(limit=1))
+            self.assertEqual(len(data), 1)
+            self.assertEqual(data[0]["total"], traces[1].total)
+            with self.assertRaises(ValueError):
+                load_trace.report(sort_by="path")
+
+            load_trace.clear()
+            self.assertEqual(load_trace.traces(), [])
+
+            # traces of files that failed to load aren't kept
+            with open(os.path.join(tmp_dir, "en", "c.json"), "w") as f:
+                f.write("{")
+            with self.assertRaises(I18nFileLoadError):
+                t("c.x")
+            self.assertEqual(load_trace._pending, {})
+            self.assertEqual(load_trace.traces(), [])
+
+            # skipped files aren't traced
+            i18n.unload_everything()
+            i18n.load_everything("en", only=KeyManifest(["b.y"]))
+            self.assertEqual(load_trace._pending, {})
+            self.assertEqual(
+                [os.path.basename(trace.path) for trace in load_trace.traces()],
+                ["b.json"],
+            )
+            load_trace.clear()
+
+            # only the last traces are kept
+            with mock.patch.object(load_trace, "_finished", deque(maxlen=1)):
+                i18n.unload_everything()
+                t("a.z")
+                self.assertEqual(
+                    [os.path.basename(trace.path) for trace in load_trace.traces()],
+                    # b.json is loaded while static references of a.json are expanded
+                    ["a.json"],
+                )
+            config.set("trace_loading", False)
+
+    def test_catalog_backend(self):
+        backend = DictBackend()
+        backend.add_many([("a.x", "1"), ("a.y", "2"), ("b", "3")], "en")
+        self.assertEqual(sorted(backend.keys("en", "a.")), ["a.x", "a.y"])
+        self.assertEqual(list(backend.keys("fr")), [])
+        self.assertGreater(backend.memory_usage(), DictBackend().memory_usage())
+        backend.clear("fr")
+        backend.clear("en")
+        self.assertEqual(backend.container, {"en": {}})
+
+        base = CatalogBackend()
+        for method, args in (
+            (base.add_many, ((), "en")),
+            (base.get, ("a", "en")),
+            (base.has, ("a", "en")),
+            (base.clear, ()),
+            (base.keys, ("en",)),
+            (base.locales, ()),
+            (base.memory_usage, ()),
+        ):
+            with self.assertRaises(NotImplementedError):
+                method(*args)
+
+        i18n.add_translation("default", "x")
+        translator = i18n.get_translator("en")
+        flat = FlatBackend()
+        config.set("catalog_backend", flat)
+        self.addCleanup(config.set, "catalog_backend", None)
+        self.assertIs(translations.backend, flat)
+        self.assertFalse(translations.has("default"))
+        self.assertEqual(translator.t("default"), "default")
+
+        config.set("file_format", "py")
+        config.set("fallback", "fr")
+        resource_loader.init_python_loader()
+        self.assertEqual(translator.t("foo.normal_key"), "normal_value")
+        self.assertEqual(i18n.compile_key("foo.normal_key", "en")(), "normal_value")
+        self.assertIn(("en", "foo.normal_key"), flat.items)
+        self.assertEqual(translations.container, {"en": {"default": "x"}})
+        translations.add_many([("only_fr", "fr")], "fr")
+        i18n.add_translation("added", "y")
+        translations.add_many([("added_many", "z")])
+        self.assertEqual(translator.t("only_fr"), "fr")
+        self.assertEqual(i18n.compile_key("only_fr", "en")(), "fr")
+
+        view = translations.mapping("en")
+        self.assertIsInstance(view, CatalogView)
+        self.assertIn("foo.normal_key", view)
+        self.assertNotIn(1, view)
+        self.assertEqual(len(view), len(list(view)))
+        self.assertEqual(view["foo.normal_key"], "normal_value")
+        self.assertEqual(set(flat.locales()), {"en", "fr"})
+        self.assertGreater(flat.memory_usage(), 0)
+        translations.clear("fr")
+        self.assertEqual(list(flat.locales()), ["en"])
+        self.assertEqual(translator.t("added") + translator.t("added_many"), "yz")
+
+        i18n.unload_everything()
+        self.assertEqual(flat.items, {})
+        config.set("catalog_backend", None)
+        self.assertIs(translations.backend, translations._default_backend)
+        self.assertEqual(translator.t("default"), "x")
+
+    def test_sqlite_backend(self):
+        from i18n.backends import SqliteBackend
+        from i18n.backends.sqlite_backend import CacheInfo
+
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        config.set("fallback", "fr")
+        resource_loader.init_json_loader()
+        self.addCleanup(i18n.unload_everything)
+        self.addCleanup(config.set, "catalog_backend", None)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            with open(os.path.join(tmp_dir, "a.en.json"), "w") as f:
+                json.dump({
+                    "x": "1",
+                    "list": ["p", "q"],
+                    "plural": {"one": "one", "many": "%{count}"},
+                    "b": {"y": "%{.a.x}"},
+                }, f)
+            with open(os.path.join(tmp_dir, "a.fr.json"), "w") as f:
+                json.dump({"only_fr": "fr"}, f)
+            path = os.path.join(tmp_dir, "catalog.db")
+            backend = SqliteBackend(path, cache_size=2)
+            self.addCleanup(backend.close)
+            config.set("catalog_backend", backend)
+            i18n.load_everything()
+
+            self.assertEqual(t("a.x"), "1")
+            self.assertEqual(t("a.list"), ("p", "q"))
+            self.assertEqual(t("a.plural", count=5), "5")
+            self.assertEqual(t("a.b.y"), "1")
+            self.assertEqual(t("a.only_fr"), "fr")
+            self.assertEqual(
+                list(backend.keys("en", "a.")),
+                ["a.b.y", "a.list", "a.plural", "a.x"],
+            )
+            self.assertEqual(list(backend.keys("fr")), ["a.only_fr"])
+            self.assertEqual(sorted(backend.locales()), ["en", "fr"])
+            self.assertEqual(backend.cache_info().currsize, 2)
+
+            backend.cache_clear()
+            t("a.x")
+            t("a.x")
+            info = backend.cache_info()
+            self.assertEqual((info.hits, info.misses, info.hit_rate), (1, 1, 0.5))
+            self.assertGreater(backend.memory_usage(), 0)
+            uncached = SqliteBackend(path, cache_size=0, read_only=True)
+            uncached.get("a.x", "en")
+            self.assertEqual(uncached.cache_info(), (0, 1, 0, 0))
+            uncached.close()
+
+            i18n.add_translation("a.x", "2")
+            reader = SqliteBackend(path, read_only=True)
+            self.addCleanup(reader.close)
+            results = []
+            connection = reader._connection
+            for _ in range(3):
+                thread = threading.Thread(target=lambda: results.append(reader.get("a.x", "en")))
+                thread.start()
+                thread.join()
+                reader.cache_clear()
+            self.assertEqual(results, ["2"] * 3)
+            # threads don't open connections of their own
+            self.assertIs(reader._connection, connection)
+            self.assertEqual(t("a.x"), "2")
+
+            # translations added in read-only mode are kept in memory
+            usage = reader.memory_usage()
+            reader.add_many([("a.x", "3"), ("a.z", "4")], "en")
+            reader.add_many([("b", "5")], "de")
+            self.assertEqual(reader.get("a.x", "en"), "3")
+            self.assertEqual(reader.get("a.list", "en"), ("p", "q"))
+            self.assertEqual(
+                list(reader.keys("en", "a.")),
+                ["a.b.y", "a.list", "a.plural", "a.x", "a.z"],
+            )
+            self.assertEqual(list(reader.locales()), ["en", "fr", "de"])
+            self.assertGreater(reader.memory_usage(), usage)
+            self.assertEqual(backend.get("a.x", "en"), "2")
+            reader.clear("de")
+            self.assertEqual(list(reader.locales()), ["en", "fr"])
+            reader.clear()
+            self.assertEqual(reader.get("a.x", "en"), "2")
+            self.assertFalse(reader.has("a.z", "en"))
+
+            # keys with the largest code point
+            end = chr(sys.maxunicode)
+            backend.add_many([("a" + end, "6"), ("a" + end * 2, "7"), (end, "8")], "fr")
+            self.assertEqual(list(backend.keys("fr", "a" + end)), ["a" + end, "a" + end * 2])
+            self.assertEqual(list(backend.keys("fr", end)), [end])
+            backend.clear("fr")
+            backend.add_many([("a.only_fr", "fr")], "fr")
+
+            self.assertTrue(backend.has("a.only_fr", "fr"))
+            translations.clear("fr")
+            self.assertFalse(backend.has("a.only_fr", "fr"))
+            self.assertEqual(list(backend.locales()), ["en"])
+            self.assertEqual(list(reader.keys("fr")), [])
+
+            # value read before a change isn't cached
+            backend.cache_clear()
+            read = backend._reader
+            with mock.patch.object(
+                backend,
+                "_reader",
+                side_effect=lambda: (backend.add_many([], "en"), read())[1],
+            ):
+                self.assertEqual(backend.get("a.x", "en"), "2")
+            self.assertEqual(backend.cache_info().currsize, 0)
+
+            backend.clear()
+            self.assertEqual(list(reader.locales()), [])
+            self.assertEqual(repr(reader), "<SqliteBackend {!r}>".format(path))
+            backend.close()
+            backend.close()
+            reader.close()
+            with self.assertRaises(sqlite3.OperationalError):
+                SqliteBackend(os.path.join(tmp_dir, "missing.db"), read_only=True)
+        self.assertEqual(CacheInfo(0, 0, 1, 0).hit_rate, 0.0)
+        with self.assertRaises(AttributeError):
+            backends.NoSuchBackend
+
+    def test_locale_eviction(self):
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+        self.addCleanup(i18n.unload_everything)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            for locale in ("en", "de", "fr", "es"):
+                with open(os.path.join(tmp_dir, "a.{}.json".format(locale)), "w") as f:
+                    json.dump({"x": locale}, f)
+
+            self.assertFalse(eviction.enabled)
+            # nothing is tracked while eviction is off
+            self.assertEqual(t("a.x", "de"), "de")
+            self.assertEqual(eviction._files, {})
+            config.set("max_loaded_locales", 1)
+            self.assertTrue(eviction.enabled)
+            self.assertEqual(t("a.x"), "en")
+            self.assertEqual(t("a.x", "de"), "de")
+            self.assertEqual(t("a.x", "fr"), "fr")
+            self.assertFalse(translations.has("a.x", "de"))
+            self.assertEqual(eviction.loaded_locales(), ["fr", "en"])
+            translator = i18n.get_translator("de")
+            self.assertEqual(translator.t("a.x"), "de")
+            self.assertEqual(eviction.loaded_locales(), ["de", "en"])
+            self.assertEqual(i18n.compile_key("a.x", "es")(), "es")
+            self.assertEqual(asyncio.run(i18n.at("a.x", "fr")), "fr")
+            self.assertEqual(eviction.loaded_locales(), ["fr", "en"])
+
+            # locked locales stay
+            i18n.load_everything("fr", lock=True)
+            self.assertEqual(t("a.x", "de"), "de")
+            self.assertEqual(set(eviction.loaded_locales()), {"de", "fr", "en"})
+            self.assertFalse(eviction.evict("fr"))
+            self.assertTrue(eviction.evict("de"))
+            i18n.unload_everything()
+            self.assertEqual(eviction.loaded_locales(), [])
+
+            config.set("max_loaded_locales", None)
+            config.set("locale_idle_timeout", 60)
+            with mock.patch("i18n.eviction.monotonic", return_value=1000):
+                self.assertEqual(t("a.x", "de"), "de")
+                self.assertEqual(t("a.x", "es"), "es")
+            with mock.patch("i18n.eviction.monotonic", return_value=1050):
+                self.assertEqual(t("a.x", "es"), "es")
+                self.assertEqual(eviction.evict_idle(), [])
+            with mock.patch("i18n.eviction.monotonic", return_value=1070):
+                self.assertEqual(eviction.evict_idle(), ["de"])
+                self.assertEqual(t("a.x", "fr"), "fr")
+            with mock.patch("i18n.eviction.monotonic", return_value=1200):
+                self.assertEqual(t("a.x", "de"), "de")
+            self.assertEqual(eviction.loaded_locales(), ["de"])
+
+            # preloaded files are loaded again after eviction
+            preloader = i18n.start_preload(["es"])
+            preloader.wait()
+            self.assertTrue(translations.has("a.x", "es"))
+            self.assertTrue(eviction.evict("es"))
+            self.assertFalse(translations.has("a.x", "es"))
+            self.assertEqual(t("a.x", "es"), "es")
+            config.set("locale_idle_timeout", None)
+            self.assertFalse(eviction.enabled)
+
+    def test_freeze(self):
+        from i18n.frozen import FreezeReport
+
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        config.set("locale", "fr")
+        config.set("fallback", "en")
+        config.set("lazy_static_refs", True)
+        resource_loader.init_json_loader()
+        self.addCleanup(i18n.unload_everything)
+        cases: List[Tuple[str, str, Dict[str, Any]]] = [
+            ("a.hi", "en", {"name": "Bob"}),
+            ("a.hi", "fr", {"name": "Bob"}),
+            ("a.hi", "de", {"name": "Bob"}),
+            ("a.hi", "en", {}),
+            ("a.plain", "fr", {}),
+            ("a.escaped", "en", {"x": 1}),
+            ("a.plural", "en", {"count": 3}),
+            ("a.count", "en", {"count": 3}),
+            ("a.ref", "fr", {}),
+            ("a.func", "en", {"x": 1}),
+            ("a.missing", "fr", {}),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            with open(os.path.join(tmp_dir, "a.en.json"), "w") as f:
+                json.dump({
+                    "hi": "Hello %{name}!",
+                    "plain": "text",
+                    "escaped": "100%% %{x}",
+                    "plural": {"one": "one", "many": "%{count}"},
+                    "count": "%{count} items",
+                    "list": ["%{x}", "b"],
+                    "ref": "see %{.a.plain}",
+                    "func": "%{no_such_func(x)}",
+                }, f)
+            with open(os.path.join(tmp_dir, "a.fr.json"), "w") as f:
+                json.dump({"hi": "Salut %{name}!", "ref": "voir %{.a.hi}"}, f)
+
+            expected = [t(key, locale, **kwargs) for key, locale, kwargs in cases]
+            expected_list = list(t("a.list", x=1))
+            i18n.unload_everything()
+            with self.assertRaises(ValueError):
+                i18n.load_everything("en", freeze=True)
+            # empty catalog of a locale without translations isn't frozen
+            i18n.get_translator("es")
+            i18n.load_everything(freeze=True)
+
+        backend = translations.frozen
+        assert backend is not None
+        self.assertIs(translations.backend, backend)
+        self.assertEqual(translations.container, {})
+        self.assertEqual([t(key, locale, **kwargs) for key, locale, kwargs in cases], expected)
+        self.assertEqual(list(t("a.list", x=1)), expected_list)
+        report = backend.report
+        self.assertEqual((report.locales, report.keys), (2, 10))
+        self.assertGreater(report.lookup_before, 0)
+        self.assertEqual(report.bytes_saved, report.bytes_before - report.bytes_after)
+        self.assertGreater(report.speedup, 0)
+        self.assertEqual(FreezeReport(0, 0, 0, 0, 0.0, 0.0).speedup, 1.0)
+
+        with self.assertRaises(I18nLockedError):
+            i18n.add_translation("a.new", "x")
+        with self.assertRaises(I18nLockedError):
+            translations.clear("en")
+        self.assertEqual(sorted(backend.locales()), ["en", "fr"])
+        self.assertEqual(list(backend.keys("fr")), ["a.hi", "a.ref"])
+        self.assertFalse(translations.has("a.plain", "fr"))
+        self.assertFalse(translations.has("a.plain", "de"))
+        with self.assertRaises(KeyError):
+            translations.get("a.plain", "fr")
+        self.assertEqual(translations.get("a.ref", "fr"), "voir Salut %{name}!")
+        self.assertIsInstance(translations.mapping("en"), dict)
+        self.assertIsInstance(translations.mapping("fr"), CatalogView)
+        self.assertIsInstance(translations.mapping("de"), CatalogView)
+        self.assertEqual(i18n.get_translator("fr").t("a.plain"), "text")
+        self.assertEqual(i18n.compile_key("a.hi", "fr")(name="A"), "Salut A!")
+
+        # settings changed after freezing are respected
+        config.set("fallback", None)
+        self.assertEqual(t("a.plain", "fr"), "a.plain")
+        self.assertEqual(t("a.hi", "fr", name="Bob"), "Salut Bob!")
+        i18n.unload_everything()
+        self.assertIsNone(translations.frozen)
+
+        flat = FlatBackend()
+        config.set("catalog_backend", flat)
+        self.addCleanup(config.set, "catalog_backend", None)
+        config.set("enable_metrics", True)
+        self.addCleanup(config.set, "enable_metrics", False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            with open(os.path.join(tmp_dir, "a.fr.json"), "w") as f:
+                json.dump({"hi": "Salut %{name}!"}, f)
+            with open(os.path.join(tmp_dir, "a.de.json"), "w") as f:
+                json.dump({"bye": "Tschüss"}, f)
+            i18n.load_everything(freeze=True)
+        self.assertIsNone(cast(FrozenBackend, translations.frozen).fallback)
+        self.assertEqual(t("a.hi", "de"), "a.hi")
+        self.assertEqual(t("a.bye", "de"), "Tschüss")
+        self.assertEqual(t("a.bye", "en"), "a.bye")
+        # other backends keep their data
+        self.assertTrue(flat.has("a.bye", "de"))
+        config.set("catalog_backend", DictBackend())
+        self.assertIsNone(translations.frozen)
+
+    def test_mo_loader(self):
+        config.set("file_format", "mo")
+        config.set("skip_locale_root_data", True)
+        config.set("locale", "cs")
+        resource_loader.init_mo_loader()
+        self.addCleanup(i18n.unload_everything)
+        header = (
+            "Project-Id-Version: test\n"
+            "Content-Type: text/plain; charset=UTF-8\n"
+            "Plural-Forms: nplurals=3; plural=(n==1) ? 0 : (n>=2 && n<=4) ? 1 : 2;\n"
+        )
+        messages = {
+            "": header,
+            "hello": "Ahoj",
+            "greet": "Ahoj %{name}",
+            "menu\x04open": "Otevřít",
+            ("apple", "apples"): ["jablko", "jablka", "jablek"],
+        }
+        messages.update(("k{}".format(i), "v{}".format(i)) for i in range(50))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            path = os.path.join(tmp_dir, "messages.cs.mo")
+            with open(path, "wb") as f:
+                f.write(make_mo(messages))
+
+            self.assertEqual(t("messages.hello"), "Ahoj")
+            self.assertEqual(t("messages.greet", name="Bob"), "Ahoj Bob")
+            self.assertEqual(t("messages.menu.open"), "Otevřít")
+            self.assertEqual(t("messages.apple", count=0), "jablek")
+            self.assertEqual(t("messages.apple", count=1), "jablko")
+            self.assertEqual(t("messages.apple", count=3), "jablka")
+            self.assertEqual(t("messages.apple", count=7), "jablek")
+            self.assertEqual(t("messages.missing"), "messages.missing")
+            # only requested messages are loaded
+            self.assertEqual(
+                set(translations.backend.keys("cs")),
+                {"messages.hello", "messages.greet", "messages.menu.open", "messages.apple"},
+            )
+            self.assertNotIn(path, Loader.loaded_files)
+
+            config.set("trace_loading", True)
+            load_trace.clear()
+            t("messages.k1")
+            t("messages.k50")
+            config.set("trace_loading", False)
+            self.assertEqual(
+                [(trace.keys, trace.loader) for trace in load_trace.traces()],
+                [(1, "MoLoader"), (0, None)],
+            )
+            self.assertEqual(load_trace._pending, {})
+
+            # lookups are recorded and timed like loading of whole files
+            config.set("record_loaded_files", True)
+            config.set("enable_metrics", True)
+            self.addCleanup(config.set, "enable_metrics", False)
+            self.addCleanup(config.set, "record_loaded_files", False)
+            self.addCleanup(manifest.clear)
+            i18n.reset_stats()
+            t("messages.k2")
+            self.assertEqual(
+                manifest.loaded_files(),
+                [resource_loader.TranslationFile(tmp_dir, "messages.cs.mo", "cs")],
+            )
+            self.assertGreater(i18n.stats()["load_time"], 0)
+            manifest_path = os.path.join(tmp_dir, "manifest.json")
+            i18n.write_manifest(manifest_path)
+            i18n.unload_everything()
+            i18n.warm_from_manifest(manifest_path)
+            self.assertEqual(translations.get("messages.k3", "cs"), "v3")
+            config.set("record_loaded_files", False)
+            i18n.unload_everything()
+
+            loader = cast(i18n.loaders.MoLoader, resource_loader.loaders["mo"])
+            catalog = loader.catalog(path)
+            self.assertIs(loader.catalog(path), catalog)
+            with open(path, "rb") as f:
+                reference = gettext.GNUTranslations(f)
+            for i in range(50):
+                key = "k{}".format(i)
+                self.assertEqual(catalog.get(key), reference.gettext(key))
+            for key in ("k50", "menu", "x.y.z", "apples"):
+                self.assertIsNone(catalog.get(key))
+            self.assertIsNone(catalog.get(""))
+            self.assertEqual(catalog.get("menu.open"), reference.pgettext("menu", "open"))
+            self.assertEqual(
+                catalog.get("apple"),
+                {"one": "jablko", "few": "jablka", "many": "jablek"},
+            )
+
+            # catalog is opened again after the file changes
+            with open(path, "wb") as f:
+                f.write(make_mo({"hello": "Nazdar"}, hash_table=False, byte_order=">"))
+            self.assertIsNot(loader.catalog(path), catalog)
+            catalog.close()
+            self.assertEqual(loader.lookup(path, "hello"), "Nazdar")
+
+            with open(os.path.join(tmp_dir, "plural.cs.mo"), "wb") as f:
+                f.write(make_mo({
+                    "": "Content-Type: text/plain\n",
+                    "ctx\x04a.b": "c",
+                    ("one", "many"): ["jeden", "mnoho"],
+                    ("same", "same"): ["x", "x"],
+                    "z": "last",
+                }, hash_table=False))
+            config.set("enable_metrics", True)
+            i18n.reset_stats()
+            i18n.load_everything()
+            config.set("enable_metrics", False)
+            self.assertEqual(i18n.stats()["bytes_read"], os.path.getsize(path) + os.path.getsize(
+                os.path.join(tmp_dir, "plural.cs.mo"),
+            ))
+            self.assertEqual(translations.get("messages.hello"), "Nazdar")
+            self.assertEqual(translations.get("plural.ctx.a.b"), "c")
+            self.assertEqual(translations.get("plural.one"), {"one": "jeden", "many": "mnoho"})
+            self.assertEqual(translations.get("plural.same"), {"many": "x"})
+            self.assertEqual(t("plural.z"), "last")
+            plural_path = os.path.join(tmp_dir, "plural.cs.mo")
+            plural = loader.catalog(plural_path)
+            self.assertEqual(plural.get("ctx.a.b"), "c")
+            self.assertIsNone(plural.get("ctx.a.c"))
+            self.assertEqual(loader.load_file(plural_path), dict(plural.items()))
+
+            # whole file is loaded when the key is unknown
+            i18n.unload_everything()
+            resource_loader.recursive_search_dir(["plural"], "", tmp_dir, "cs")
+            self.assertTrue(translations.has("plural.z", "cs"))
+            self.assertTrue(translations.has("plural.one", "cs"))
+
+            # file without namespace
+            config.set("filename_format", "{locale}.{format}")
+            with open(os.path.join(tmp_dir, "de.mo"), "wb") as f:
+                f.write(make_mo({"a": "1", "b": "2", "c": "3", "d": "4", "e": "5"}))
+            self.assertEqual(t("e", locale="de"), "5")
+            self.assertFalse(translations.has("a", "de"))
+
+            for content, error in (
+                (b"", "invalid"),
+                (b"\0" * 28, "magic"),
+                (struct.pack("<7I", 0x950412DE, 2 << 16, 0, 0, 0, 0, 0), "revision"),
+                (struct.pack("<3I", 0x950412DE, 0, 1), "invalid"),
+                (struct.pack("<7I", 0x950412DE, 0, 1, 28, 28, 0, 0), "invalid"),
+            ):
+                with open(path, "wb") as f:
+                    f.write(content)
+                with self.assertRaisesRegex(I18nFileLoadError, error):
+                    loader.catalog(path)
+            with self.assertRaisesRegex(I18nFileLoadError, "error loading file"):
+                loader.catalog(os.path.join(tmp_dir, "missing.mo"))
+            with mock.patch("os.stat"), self.assertRaisesRegex(
+                I18nFileLoadError, "error loading file",
+            ):
+                loader.catalog(os.path.join(tmp_dir, "missing.mo"))
+        with self.assertRaises(NotImplementedError):
+            Loader().lookup(path, "hello")
+
+    def test_mo_plural_forms(self):
+        config.set("file_format", "mo")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_mo_loader()
+        self.addCleanup(i18n.unload_everything)
+        forms = ["%{count} яблоко", "%{count} яблока", "%{count} %{.fruit.many}"]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            i18n.load_path[:] = [tmp_dir]
+            path = os.path.join(tmp_dir, "fruit.ru.mo")
+            with open(path, "wb") as f:
+                f.write(make_mo({
+                    "": (
+                        "Content-Type: text/plain; charset=UTF-8\n"
+                        "Plural-Forms: nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : "
+                        "n%10>=2 && n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);\n"
+                    ),
+                    "many": "яблок",
+                    ("apple", "apples"): forms,
+                }))
+            with open(path, "rb") as f:
+                reference = gettext.GNUTranslations(f)
+
+            # categories can't express the rule, e.g. 5 isn't "few" and 22 isn't "many"
+            for count in range(200):
+                expected = reference.ngettext("apple", "apples", count)
+                expected = expected.replace("%{.fruit.many}", "яблок")
+                expected = expected.replace("%{count}", str(count))
+                self.assertEqual(t("fruit.apple", "ru", count=count), expected)
+
+            # static references are expanded in all forms
+            value = cast(translations.PluralForms, translations.get("fruit.apple", "ru"))
+            self.assertIsInstance(value, translations.PluralForms)
+            self.assertEqual(
+                value,
+                {"one": forms[0], "few": forms[1], "many": "%{count} яблок"},
+            )
+            self.assertEqual(value.forms[2], "%{count} яблок")
+            # categories are used without the rule or for counts that aren't integers
+            self.assertEqual(t("fruit.apple", "ru", count=1.5), "1.5 яблока")
+            self.assertEqual(
+                i18n.translator.pluralize("fruit.apple", "ru", dict(value), 22),
+                "%{count} яблок",
+            )
+
+    def test_archive_load_path(self):
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+        resource_loader.init_python_loader()
+        resource_loader.init_mo_loader()
+        self.addCleanup(i18n.unload_everything)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundle = os.path.join(tmp_dir, "bundle.zip")
+            with zipfile.ZipFile(bundle, "w", zipfile.ZIP_DEFLATED) as f:
+                f.writestr("foo.en.json", json.dumps({"hi": "Hello"}))
+                f.writestr("foo.fr.json", json.dumps({"hi": "Salut"}))
+                f.writestr("sub/", "")
+                f.writestr("sub/bar.en.json", json.dumps({"x": "y"}))
+                f.writestr("sub/deep/baz.en.json", json.dumps({"z": "%{x}"}))
+                f.writestr("sub/other.txt", "")
+                f.writestr("code.en.py", "en = {'answer': str(6 * 7)}")
+                f.writestr("cat.en.mo", make_mo({"hello": "Hello", "menu\x04open": "Open"}))
+                f.writestr("locales/en/foo.en.json", json.dumps({"hi": "Hello from dir"}))
+                f.writestr("locales/fr/foo.fr.json", json.dumps({"hi": "Salut from dir"}))
+                f.writestr("locales/README", "")
+            config.set("load_path", [bundle])
+            self.assertEqual(archives.load_path(), [bundle])
+            # archive is read through the index without system calls
+            with mock.patch("os.listdir", side_effect=AssertionError), mock.patch(
+                "os.path.isfile", side_effect=AssertionError,
+            ), mock.patch("os.path.isdir", side_effect=AssertionError):
+                config.set("enable_metrics", True)
+                self.assertEqual(t("foo.hi"), "Hello")
+                self.assertEqual(t("foo.hi", locale="fr"), "Salut")
+                config.set("enable_metrics", False)
+                self.assertEqual(t("sub.bar.x"), "y")
+                self.assertEqual(t("sub.missing.x"), "sub.missing.x")
+                self.assertEqual(t("sub.deep.baz.z", x=1), "1")
+            config.set("file_format", "py")
+            config.set("skip_locale_root_data", False)
+            self.assertEqual(t("code.answer"), "42")
+            config.set("skip_locale_root_data", True)
+            config.set("file_format", "mo")
+            self.assertEqual(t("cat.hello"), "Hello")
+            self.assertEqual(t("cat.menu.open"), "Open")
+            self.assertEqual(t("cat.missing"), "cat.missing")
+            loader = cast(i18n.loaders.MoLoader, resource_loader.loaders["mo"])
+            catalog = loader.catalog(os.path.join(bundle, "cat.en.mo"))
+            self.assertIs(loader.catalog(os.path.join(bundle, "cat.en.mo")), catalog)
+            catalog.close()
+            with self.assertRaisesRegex(I18nFileLoadError, "no such file in archive"):
+                loader.catalog(os.path.join(bundle, "missing.en.mo"))
+
+            config.set("file_format", "json")
+            i18n.load_everything()
+            self.assertEqual(
+                set(translations.backend.keys("en")),
+                {
+                    "foo.hi",
+                    "sub.bar.x",
+                    "sub.deep.baz.z",
+                    "code.answer",
+                    "cat.hello",
+                    "cat.menu.open",
+                    "locales.en.foo.hi",
+                },
+            )
+            i18n.unload_everything()
+            self.assertEqual(archives._archives, {})
+
+            config.set("use_locale_dirs", True)
+            config.set("load_path", [pathlib.Path(bundle, "locales")])
+            self.assertEqual(t("foo.hi"), "Hello from dir")
+            i18n.load_everything()
+            self.assertEqual(translations.get("foo.hi", "fr"), "Salut from dir")
+            i18n.unload_everything()
+            config.set("use_locale_dirs", False)
+
+            # streaming loader reads spans of decompressed member
+            i18n.register_loader(i18n.loaders.StreamingJsonLoader, ["json"])
+            config.set("filename_format", "{namespace}.{format}")
+            config.set("skip_locale_root_data", False)
+            with zipfile.ZipFile(bundle, "w") as f:
+                f.writestr("all.json", json.dumps({"en": {"hi": "Hi"}, "uk": {"hi": "Привіт"}}))
+            config.set("load_path", [bundle])
+            config.set("enable_metrics", True)
+            self.assertEqual(t("all.hi"), "Hi")
+            config.set("enable_metrics", False)
+            self.assertEqual(t("all.hi", locale="uk"), "Привіт")
+
+            # replaced archive is read again after load_path changes
+            archive = archives._archives[bundle]
+            with zipfile.ZipFile(bundle, "w") as f:
+                f.writestr("all.json", json.dumps({"en": {"hi": "Hello again"}}))
+            config.set("load_path", [bundle])
+            self.assertEqual(archives.load_path(), [bundle])
+            self.assertIsNot(archives._archives[bundle], archive)
+            Loader.loaded_files.clear()
+            translations.clear()
+            self.assertEqual(t("all.hi"), "Hello again")
+            i18n.unload_everything()
+
+            # other files are ignored
+            text_file = os.path.join(tmp_dir, "notes.txt")
+            with open(text_file, "w") as f:
+                f.write("not a zip file")
+            config.set("load_path", [text_file, os.path.join(text_file, "sub")])
+            self.assertEqual(archives.load_path(), [text_file, os.path.join(text_file, "sub")])
+            self.assertEqual(t("all.hi"), "all.hi")
+            self.assertEqual(archives._archives, {})
+            # the same as for missing directories
+            with self.assertRaises(OSError):
+                i18n.load_everything()
+
+            config.set("load_path", [bundle, os.path.join(bundle, "sub")])
+            self.assertEqual(archives.load_path(), [bundle, os.path.join(bundle, "sub")])
+            with self.assertRaises(FileNotFoundError):
+                archives.listdir(os.path.join(bundle, "missing"))
+            self.assertTrue(archives.isdir(bundle))
+            self.assertFalse(archives.isfile(os.path.join(tmp_dir, "missing")))
+            self.assertEqual(archives.location(os.path.join(tmp_dir, "x", "y")), os.path.join(
+                tmp_dir, "x", "y",
+            ))
+            self.assertEqual(repr(archives._archives[bundle]), "<Archive {!r}>".format(bundle))
+            with open(bundle, "rb") as f:
+                content = f.read()
+            with open(os.path.join(tmp_dir, "broken.zip"), "wb") as f:
+                # central directory is damaged, but the file still looks like a zip file
+                f.write(content.replace(b"PK\x01\x02", b"XX\x01\x02"))
+            with self.assertRaisesRegex(I18nFileLoadError, "error opening archive"):
+                archives.location(os.path.join(tmp_dir, "broken.zip"))
+            with self.assertRaisesRegex(TypeError, "unsupported load_path entry"):
+                archives.location(42)
+            with self.assertRaisesRegex(TypeError, "unsupported load_path entry"):
+                archives.location(zipfile.Path(zipfile.ZipFile(io.BytesIO(), "w")))
+            i18n.unload_everything()
+
+    @unittest.skipIf(sys.version_info < (3, 9), "importlib.resources.files() requires Python 3.9")
+    def test_archive_package(self):
+        config.set("file_format", "json")
+        config.set("skip_locale_root_data", True)
+        resource_loader.init_json_loader()
+        self.addCleanup(i18n.unload_everything)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # package imported from zip file
+            with zipfile.ZipFile(os.path.join(tmp_dir, "pkg.zip"), "w") as f:
+                f.writestr("i18n_test_pkg/__init__.py", "")
+                f.writestr("i18n_test_pkg/locales/foo.en.json", json.dumps({"hi": "Packaged"}))
+            sys.path.insert(0, os.path.join(tmp_dir, "pkg.zip"))
+            locales = None
+            try:
+                locales = importlib.resources.files("i18n_test_pkg") / "locales"
+                self.assertIsInstance(locales, zipfile.Path)
+                config.set("load_path", [locales])
+                self.assertEqual(t("foo.hi"), "Packaged")
+                # manifest works with archives
+                config.set("record_loaded_files", True)
+                i18n.load_everything()
+                config.set("record_loaded_files", False)
+                i18n.write_manifest(os.path.join(tmp_dir, "manifest.json"))
+                manifest.clear()
+                i18n.unload_everything()
+                self.assertEqual(
+                    len(i18n.warm_from_manifest(os.path.join(tmp_dir, "manifest.json"))),
+                    1,
+                )
+                self.assertEqual(translations.get("foo.hi", "en"), "Packaged")
+            finally:
+                sys.path.remove(os.path.join(tmp_dir, "pkg.zip"))
+                sys.modules.pop("i18n_test_pkg", None)
+                # the package keeps the archive open
+                del locales
+                gc.collect()
+                i18n.unload_everything()
+
+    def test_static_ref_expanded_once(self):
+        locale = config.get("locale")
+        for i in range(10):
+            i18n.add_translation(f"k{i}", f"%{{.k{i + 1}}} %{{.k{i + 1}}}")
+        i18n.add_translation("k10", "x")
+        i18n.add_translation("self", "%{.self}")
+
+        with mock.patch(
+            "i18n.formatters.StaticFormatter.format",
+            side_effect=formatters.StaticFormatter.format,
+            autospec=True,
+        ) as format_mock:
+            formatters.expand_static_refs([f"k{i}" for i in range(11)], locale)
+        self.assertEqual(format_mock.call_count, 10)
+        self.assertEqual(len(cast(str, translations.get("k0")).split()), 2 ** 10)
+
+        with self.assertRaisesRegex(i18n.I18nInvalidStaticRef, "'self' -> 'self'$"):
+            formatters.expand_static_refs(("self",), locale)
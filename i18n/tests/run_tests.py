@@ -20,8 +20,7 @@ class ModuleDisabler(PathFinder):
     @disabled_modules.setter
     def disabled_modules(self, modules: Collection[str]) -> None:
         for k in modules:
-            if k in sys.modules:  # pragma: no branch
-                del sys.modules[k]
+            sys.modules.pop(k, None)
         self._disabled_modules = modules
 
     def find_spec(self, name: str, *_: Any) -> None:  # type: ignore[override]
@@ -41,6 +40,15 @@ def suite():
     from i18n.tests.translation_tests import (
         TestTranslationFormat,
     )
+    from i18n.tests.aio_tests import (
+        TestAsyncLoading,
+    )
+    from i18n.tests.benchmark_tests import (
+        TestBenchmarks,
+    )
+    from i18n.tests.extract_tests import (
+        TestExtract,
+    )
 
     suite = unittest.TestSuite()
     loader = unittest.TestLoader()
@@ -55,6 +63,21 @@ def suite():
             TestTranslationFormat
         )
     )
+    suite.addTest(
+        loader.loadTestsFromTestCase(
+            TestAsyncLoading
+        )
+    )
+    suite.addTest(
+        loader.loadTestsFromTestCase(
+            TestBenchmarks
+        )
+    )
+    suite.addTest(
+        loader.loadTestsFromTestCase(
+            TestExtract
+        )
+    )
 
     return suite
 
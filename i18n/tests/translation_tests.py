@@ -5,14 +5,22 @@ from __future__ import unicode_literals
 import unittest
 import os
 import os.path
+import asyncio
+import threading
+import itertools
+from unittest import mock
 from importlib import reload
 
 from i18n import resource_loader
-from i18n.translator import t
+from i18n.loaders import Loader
+from i18n.translator import t, get_translator, compile_key
 from i18n import translations
 from i18n import config
 from i18n import custom_functions
 from i18n import formatters
+from i18n import profiler
+from i18n import call_timing
+from i18n.metrics import stats, reset_stats
 
 
 RESOURCE_FOLDER = os.path.dirname(__file__) + os.sep + 'resources' + os.sep
@@ -86,6 +94,255 @@ class TestTranslationFormat(unittest.TestCase):
         self.assertEqual(t('foo.hello', name='Bob'), 'Salut Bob !')
         self.assertEqual(t('foo.goodbye'), 'Au revoir!')
 
+    def test_locale_scope(self):
+        settings = dict(config.settings)
+        with config.locale_scope("fr"):
+            self.assertEqual(t("foo.hello", name="Bob"), "Salut Bob !")
+            self.assertEqual(config.current_locale(), "fr")
+            with config.locale_scope(None):
+                self.assertEqual(config.current_locale(), "en")
+            # should not affect settings
+            self.assertEqual(config.settings, settings)
+
+            results = []
+            thread = threading.Thread(target=lambda: results.append(config.current_locale()))
+            thread.start()
+            thread.join()
+            self.assertEqual(results, ["en"])
+        self.assertEqual(t("foo.hello", name="Bob"), "foo.hello")
+
+        token = config.bind_locale("fr")
+        try:
+            self.assertEqual(t("foo.hello", name="Bob"), "Salut Bob !")
+        finally:
+            config.reset_locale(token)
+        self.assertEqual(config.current_locale(), "en")
+
+    def test_locale_scope_tasks(self):
+        async def worker(locale):
+            with config.locale_scope(locale):
+                await asyncio.sleep(0)
+                return config.current_locale()
+
+        async def main():
+            return await asyncio.gather(*map(worker, ("fr", "en", "uk")))
+
+        self.assertEqual(asyncio.run(main()), ["fr", "en", "uk"])
+
+    def test_translator(self):
+        self.addCleanup(self.setUpClass)
+        self.addCleanup(resource_loader.unload_everything)
+        # translations of "ja" are searched on disk
+        translations.clear("ja")
+        Loader.loaded_files.clear()
+        config.set("locale", "ja")
+        config.set("fallback", "en")
+        config.set("enable_metrics", True)
+        reset_stats()
+        tr = get_translator("fr")
+        self.assertIs(get_translator("fr"), tr)
+        self.assertEqual(tr.t("foo.hello", name="Bob"), "Salut Bob !")
+        self.assertEqual(tr.t("foo.hi", name="Bob"), "Hello Bob !")
+        self.assertEqual(tr.t("foo.inexistent"), "foo.inexistent")
+        self.assertEqual(get_translator("ja").t("foo.normal_key"), "普通")
+        self.assertEqual(stats(), {
+            **stats(),
+            "hits": 2,
+            "fallback_hits": 1,
+            "misses": 1,
+        })
+
+        config.set("on_missing_translation", "error")
+        with self.assertRaises(KeyError):
+            tr.t("foo.inexistent")
+        with config.locale_scope("fr"):
+            self.assertIs(get_translator(), tr)
+
+        test_tr = get_translator("translator_test")
+        translations.add("a", "old", "translator_test")
+        self.assertEqual(test_tr.t("a"), "old")
+        translations.clear("translator_test")
+        translations.add("a", "new", "translator_test")
+        self.assertEqual(test_tr.t("a"), "new")
+
+        translations.add("translator_list", ("%{.foo.hello}",), "fr")
+        formatters.defer_static_refs(("translator_list",), "fr")
+        self.assertEqual(tr.t("translator_list", name="Bob")[0], "Salut Bob !")
+        translations.deferred.clear()
+
+    def test_translator_functions(self):
+        self.addCleanup(custom_functions.global_functions.pop, "translator_f", None)
+        translations.add("translator_func", "%{translator_f()}", "fr")
+        translations.add("translator_func_list", ("%{translator_f()}",), "fr")
+        tr = get_translator("fr")
+        self.assertEqual(tr.t("translator_func"), "%{translator_f()}")
+        custom_functions.add_function("translator_f", lambda **kw: "global")
+        self.assertEqual(tr.t("translator_func"), "global")
+        custom_functions.add_function("translator_f", lambda **kw: "fr", "fr")
+        # the function table is bound to the translator
+        with mock.patch("i18n.formatters.get_function", side_effect=AssertionError):
+            self.assertEqual(tr.t("translator_func"), "fr")
+            self.assertEqual(tr.t("translator_func_list")[0], "fr")
+
+    def test_translator_without_metrics(self):
+        self.addCleanup(self.setUpClass)
+        self.addCleanup(resource_loader.unload_everything)
+        config.set("locale", "ja")
+        config.set("fallback", "en")
+        tr = get_translator("fr")
+        self.assertEqual(tr.t("foo.hello", name="Bob"), "Salut Bob !")
+        self.assertEqual(tr.t("foo.hi", name="Bob"), "Hello Bob !")
+        self.assertEqual(get_translator("ja").t("foo.normal_key"), "普通")
+
+    def test_compile_key(self):
+        self.addCleanup(self.setUpClass)
+        self.addCleanup(resource_loader.unload_everything)
+        config.set("fallback", "fr")
+        translations.add("compiled", "Total: %{amount} %%{x}", "en")
+        f = compile_key("compiled")
+        self.assertEqual(f(amount=10), "Total: 10 %{x}")
+        self.assertEqual(f(amount=5), "Total: 5 %{x}")
+        self.assertEqual(f(), "Total: %{amount} %{x}")
+        translations.add("compiled", "New: %{amount}", "en")
+        self.assertEqual(f(amount=1), "New: 1")
+        config.set("enable_metrics", True)
+        reset_stats()
+        self.assertEqual(f(amount=1), "New: 1")
+        self.assertEqual(stats()["hits"], 1)
+        translations.clear("en")
+        self.assertEqual(f(amount=1), "compiled")
+
+    def test_compile_key_search(self):
+        self.addCleanup(self.setUpClass)
+        self.addCleanup(resource_loader.unload_everything)
+        # translations of "ja" are searched on disk
+        translations.clear("ja")
+        Loader.loaded_files.clear()
+        config.set("fallback", "fr")
+        self.assertEqual(compile_key("foo.normal_key", "ja")(), "普通")
+        self.assertEqual(compile_key("foo.hello")(name="Bob"), "Salut Bob !")
+        f = compile_key("compiled_fallback")
+        self.assertEqual(f(), "compiled_fallback")
+        translations.add("compiled_fallback", "fr", "fr")
+        config.set("enable_metrics", True)
+        reset_stats()
+        self.assertEqual(f(), "fr")
+        self.assertEqual(stats()["fallback_hits"], 1)
+        translations.add("compiled_fallback", "en", "en")
+        self.assertEqual(f(), "en")
+
+        translations.add("compiled_plural", {"one": "1 item", "many": "%{count} items"}, "en")
+        f = compile_key("compiled_plural")
+        self.assertEqual(f(count=2), "2 items")
+        translations.add("compiled_func", "%{no_such_func()}", "en")
+        self.assertEqual(compile_key("compiled_func")(), "%{no_such_func()}")
+        translations.add("compiled_invalid", "%(x)", "en")
+        with self.assertRaises(ValueError):
+            compile_key("compiled_invalid")()
+        translations.add("compiled_list", ("%{.compiled_fallback}", "%{x}"), "en")
+        formatters.defer_static_refs(("compiled_list",), "en")
+        result = compile_key("compiled_list")(x=1)
+        self.assertEqual((result[0], result[1]), ("en", "1"))
+        translations.deferred.clear()
+
+        config.set("fallback", "en")
+        with config.locale_scope("en"):
+            self.assertEqual(compile_key("compiled_missing")(), "compiled_missing")
+
+    def test_profiler(self):
+        config.set("enable_metrics", False)
+        reset_stats()
+        profiler.reset()
+        config.set("profiler_sample_rate", 1)
+        config.set("fallback", "fr")
+        translations.add("profiled_unused", "x")
+        for _ in range(3):
+            t("foo.hi", name="Bob")
+        t("foo.hello", name="Bob")
+        t("profiled_missing")
+        compile_key("foo.hi")(name="Bob")
+        get_translator().t("foo.hi", name="Bob")
+        self.assertEqual(stats(), {})
+
+        report = profiler.report(limit=2)
+        self.assertEqual(report.sample_rate, 1)
+        self.assertEqual(report.hot, [("foo.hi", "en", 5), ("foo.hello", "en", 1)])
+        self.assertEqual(report.fallbacks, [("foo.hello", "en", 1)])
+        self.assertEqual(report.missing, [("profiled_missing", "en", 1)])
+        self.assertIn("profiled_unused", report.unused)
+        self.assertNotIn("foo.hi", report.unused)
+        text = report.to_text()
+        self.assertIn("         5  foo.hi (en)", text)
+        self.assertIn("profiled_unused", text.splitlines())
+
+        profiler.reset()
+        config.set("profiler_sample_rate", 10)
+        for _ in range(100):
+            t("foo.hi", name="Bob")
+        # the call isn't sampled, but the key is accessed
+        with mock.patch.object(profiler, "_calls", itertools.count(1)):
+            t("foo.hello", name="Bob")
+        report = profiler.report()
+        self.assertEqual(report.hot, [("foo.hi", "en", 10)])
+        self.assertNotIn("foo.hello", report.unused)
+        self.assertIn("profiled_unused", report.unused)
+        config.set("profiler_sample_rate", None)
+        t("foo.hi", name="Bob")
+        self.assertEqual(profiler.report().hot, [("foo.hi", "en", 10)])
+        self.assertEqual(profiler.report().sample_rate, 1)
+        profiler.reset()
+
+    def test_timing_hook(self):
+        self.addCleanup(self.setUpClass)
+        self.addCleanup(resource_loader.unload_everything)
+        # the last call loads a file
+        config.set("load_path", [os.path.join(RESOURCE_FOLDER, "translations")])
+        config.set("filename_format", "{namespace}.{locale}.{format}")
+        config.set("skip_locale_root_data", False)
+        calls: list = []
+        config.set("timing_hook", calls.append)
+        self.addCleanup(config.set, "timing_hook", None)
+        config.set("fallback", "fr")
+        custom_functions.add_function("timed", lambda **kw: "1", "en")
+        translations.add("timed_func", "%{timed()}", "en")
+        self.assertEqual(t("foo.hi", name="Bob"), "Hello Bob !")
+        config.set("enable_metrics", True)
+        reset_stats()
+        self.assertEqual(t("foo.basic_plural", count=2), "2 elems")
+        self.assertEqual(stats()["hits"], 1)
+        config.set("enable_metrics", False)
+        # translator objects aren't timed
+        self.assertEqual(get_translator().t("foo.basic_plural", count=1), "1 elem")
+        self.assertEqual(t("timed_func"), "1")
+        self.assertEqual(t("foo.hello", name="Bob"), "Salut Bob !")
+        self.assertEqual(t("timed_missing"), "timed_missing")
+        resource_loader.unload_everything()
+        self.assertEqual(t("foo.normal_key", locale="ja"), "普通")
+        config.set("timing_hook", None)
+        t("foo.normal_key", locale="ja")
+        self.assertIs(call_timing.phase("lookup"), call_timing._nothing)
+
+        self.assertEqual(
+            [(call.key, call.locale, call.path) for call in calls],
+            [
+                ("foo.hi", "en", "hit"),
+                ("foo.basic_plural", "en", "hit"),
+                ("timed_func", "en", "hit"),
+                ("foo.hello", "en", "fallback"),
+                ("timed_missing", "en", "missing"),
+                ("foo.normal_key", "ja", "search"),
+            ],
+        )
+        self.assertGreater(calls[1].phases["pluralization"], 0)
+        self.assertGreater(calls[2].phases["functions"], 0)
+        self.assertGreater(calls[3].phases["fallback"], 0)
+        self.assertGreater(calls[5].phases["search"], 0)
+        for call in calls:
+            self.assertGreater(call.phases["lookup"], 0)
+            self.assertGreaterEqual(call.total, sum(call.phases.values()))
+        self.assertEqual(calls[4].phases["substitution"], 0)
+        self.assertIn("'timed_missing' 'en' missing", repr(calls[4]))
+
     def test_fallback(self):
         config.set('fallback', 'fr')
         self.assertEqual(t('foo.hello', name='Bob'), 'Salut Bob !')
@@ -209,6 +466,46 @@ class TestTranslationFormat(unittest.TestCase):
         with self.assertRaises(KeyError):
             config.set("asdafs", True)
 
+    def test_config_snapshot(self):
+        self.addCleanup(config.set, "plural_few", config.get("plural_few"))
+        snapshot = config.snapshot()
+        self.assertIs(config.snapshot(), snapshot)
+        self.assertEqual(set(snapshot._fields), {"generation", *config.settings})
+        self.assertEqual(snapshot.locale, config.get("locale"))
+        self.assertIsInstance(snapshot.load_path, tuple)
+        config.set("plural_few", 3)
+        self.assertIsNot(config.snapshot(), snapshot)
+        self.assertGreater(config.snapshot().generation, snapshot.generation)
+        self.assertEqual(config.snapshot().plural_few, 3)
+
+    def test_config_subscribe(self):
+        self.addCleanup(self.setUpClass)
+        changes: list = []
+        callback = config.subscribe(changes.append)
+        self.addCleanup(config.unsubscribe, callback)
+        config.set("fallback", "fr")
+        config.set("locale", "fr")
+        generation = config.generation
+        config.get("load_path").append("dir")
+        self.assertGreater(config.generation, generation)
+        config.get("load_path").pop()
+        config.set("load_path", ["b", "a"])
+        config.get("load_path").sort(key=str)
+        self.assertEqual(config.get("load_path"), ["a", "b"])
+        config.get("load_path").sort(reverse=True)
+        self.assertEqual(config.get("load_path"), ["b", "a"])
+        reload(config)
+        self.assertEqual(changes[:7], [
+            {"fallback"},
+            {"locale", "fallback"},
+            {"load_path"},
+            {"load_path"},
+            {"load_path"},
+            {"load_path"},
+            {"load_path"},
+        ])
+        self.assertEqual(changes[-1], set(config.settings))
+
     def test_custom_function(self):
         self.assertEqual(t('foo.custom_func', count=1), '1 day')
         self.assertEqual(t('foo.custom_func', count=2), '2 days')
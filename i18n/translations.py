@@ -1,11 +1,59 @@
-__all__ = ("add", "get", "has", "clear")
+__all__ = ("PluralForms", "add", "add_many", "get", "has", "clear", "mapping")
 
-from typing import Optional, Union, Tuple, Dict
+from typing import (
+    Callable, Optional, Union, Tuple, Dict, Set, Iterable, Mapping, FrozenSet, TYPE_CHECKING,
+)
 
 from . import config
+from .backends import CatalogBackend, DictBackend
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends.frozen_backend import FrozenBackend
 
 TranslationType = Union[str, Dict[str, str], Tuple[str, ...], Tuple[Dict[str, str], ...]]
-container: Dict[str, Dict[str, TranslationType]] = {}
+
+
+class PluralForms(Dict[str, str]):
+    """
+    Plural translation that chooses its form by calling a function with count, like gettext
+
+    Items are usual plural categories, but they can't express rules of some languages,
+    e.g. in Russian 22 takes the same form as 2, but 12 doesn't.
+    Backends which serialize translations keep only the categories
+    """
+
+    def __init__(
+        self,
+        categories: Mapping[str, str],
+        forms: Iterable[str],
+        rule: Callable[[int], int],
+    ):
+        """
+        :param categories: Plural categories
+        :param forms: All forms of the translation
+        :param rule: Function that gets index of the form by count
+        """
+
+        super().__init__(categories)
+        self.forms = tuple(forms)
+        self.rule = rule
+
+    def select(self, count: int) -> str:
+        return self.forms[min(self.rule(count), len(self.forms) - 1)]
+
+
+_default_backend = DictBackend()
+# mirrors `catalog_backend` setting, the default backend is used if it's `None`
+backend: CatalogBackend = config.get("catalog_backend") or _default_backend
+# set by `i18n.frozen.freeze()`, it's also the current backend then
+frozen: Optional["FrozenBackend"] = None
+# translations of the default backend
+container: Dict[str, Dict[str, TranslationType]] = _default_backend.container
+# keys with static references that will be expanded on first access
+deferred: Dict[str, Set[str]] = {}
+# incremented when locale dicts are removed from the container
+# or the backend is replaced
+generation = 0
 
 
 def add(
@@ -23,23 +71,81 @@ def add(
 
     if locale is None:
         locale = config.get('locale')
-    container.setdefault(locale, {})[key] = value
+    backend.add(key, value, locale)
+
+
+def add_many(
+    items: Iterable[Tuple[str, TranslationType]],
+    locale: Optional[str] = None,
+) -> None:
+    """
+    Adds translations to cache
+
+    :param items: Pairs of key and translation
+    :param locale: Locale (optional). Uses default if not provided
+    """
+
+    if locale is None:
+        locale = config.get('locale')
+    backend.add_many(items, locale)
 
 
 def has(key: str, locale: Optional[str] = None) -> bool:
     if locale is None:
         locale = config.get('locale')
-    return key in container.get(locale, {})
+    return backend.has(key, locale)
 
 
 def get(key: str, locale: Optional[str] = None) -> TranslationType:
     if locale is None:
         locale = config.get('locale')
-    return container[locale][key]
+    return backend.get(key, locale)
+
+
+def mapping(locale: str) -> Mapping[str, TranslationType]:
+    """
+    Gets read-only view of translations of the locale
+
+    :param locale: Locale
+    :return: Mapping that reflects further changes until `generation` changes
+    """
+
+    return backend.mapping(locale)
 
 
 def clear(locale: Optional[str] = None) -> None:
+    global generation
+
+    generation += 1
+    backend.clear(locale)
     if locale is None:
-        container.clear()
-    elif locale in container:
-        container[locale].clear()
+        deferred.clear()
+    else:
+        deferred.pop(locale, None)
+
+
+def unfreeze() -> None:
+    """Returns to the backend from settings, frozen translations are dropped"""
+
+    global backend, frozen, generation
+
+    if frozen is not None:
+        from .translator import _update_extras
+
+        frozen = None
+        backend = config.get("catalog_backend") or _default_backend
+        generation += 1
+        _update_extras()
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    global backend, frozen, generation
+
+    if "catalog_backend" in changed:
+        new_backend = config.get("catalog_backend") or _default_backend
+        if new_backend is not backend:
+            backend = new_backend
+            frozen = None
+            generation += 1
+            deferred.clear()
@@ -1,10 +1,22 @@
-__all__ = ("t",)
+__all__ = ("t", "Translator", "get_translator", "CompiledKey", "compile_key")
 
-from typing import Any, Dict, Union, Tuple, Optional, SupportsIndex, Literal, overload
+from typing import (
+    Any, Dict, FrozenSet, List, Mapping, Union, Tuple, Optional, SupportsIndex, Literal,
+    overload, TYPE_CHECKING,
+)
 
 from . import config
 from . import resource_loader
-from . import translations, formatters
+from . import translations, formatters, metrics, custom_functions
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends.frozen_backend import FrozenBackend
+    from .call_timing import CallTiming
+
+
+# whether `t()` needs anything besides lookup in the default backend:
+# eviction, timing hook, metrics or profiling, other or frozen backend
+_extras = True
 
 
 # _list=True indicates that a tuple of translations is expected
@@ -49,7 +61,8 @@ def t(
       - Returns result of calling it if it's set to a function
 
     :param key: Translation key
-    :param locale: Locale to translate to (optional)
+    :param locale: Locale to translate to (optional).
+    Defaults to locale bound with `locale_scope()` or `locale` setting
     :param **kwargs: Keyword arguments used to interpolate placeholders
     (including `count` for pluralization)
     :return: The translation, return value of `on_missing_translation` or the original key
@@ -57,19 +70,115 @@ def t(
     """
 
     if not locale:
-        locale = config.get("locale")
+        locale = config.context_locale.get() or config.get("locale")
+    if _extras:
+        return _extras_t(key, locale, kwargs)
     try:
-        return translate(key, locale, kwargs)
+        translation = translations.container[locale][key]
     except KeyError:
-        if resource_loader.search_translation(key, locale):
-            return translate(key, locale, kwargs)
-        fallback = config.get("fallback")
-        if fallback and (
-            translations.has(key, fallback)
-            or resource_loader.search_translation(key, fallback)
-        ):
-            return translate(key, fallback, kwargs)
-    on_missing = config.get('on_missing_translation')
+        return _t(key, locale, kwargs, None)
+    if translations.deferred:
+        return _render_loaded(key, locale, translation, kwargs)
+    return render(key, locale, translation, kwargs)
+
+
+def _extras_t(key: str, locale: str, kwargs: Dict[str, Any]) -> Any:
+    eviction = resource_loader._eviction
+    if eviction is not None and eviction.enabled:
+        eviction.touch(locale)
+    hook = config.get("timing_hook")
+    if hook is not None:
+        from .call_timing import CallTiming
+
+        # frozen catalog isn't used, so that all phases are measured
+        with CallTiming(key, locale, hook) as call:
+            return _t(key, locale, kwargs, call)
+    frozen = translations.frozen
+    if frozen is not None and frozen.config_generation == config.generation:
+        return _frozen_t(key, locale, kwargs, frozen)
+    return _t(key, locale, kwargs, None)
+
+
+def _t(
+    key: str,
+    locale: str,
+    kwargs: Dict[str, Any],
+    call: Optional["CallTiming"],
+) -> Any:
+    # phases are measured only if `call` is passed
+    source_locale = locale
+    outcome = "hits"
+    try:
+        translation = translations.get(key, locale)
+    except KeyError:
+        if call is not None:
+            call.lap("lookup")
+            call.path = "search"
+        found = resource_loader.search_translation(key, locale)
+        if call is not None:
+            call.lap("search")
+        if not found:
+            fallback = config.get("fallback")
+            found = bool(fallback) and (
+                translations.has(key, fallback)
+                or resource_loader.search_translation(key, fallback)
+            )
+            if call is not None:
+                call.lap("fallback")
+                call.path = "fallback" if found else "missing"
+            if not found:
+                return handle_missing(key, locale, kwargs)
+            source_locale = fallback
+            outcome = "fallback_hits"
+        translation = translations.get(key, source_locale)
+    else:
+        if call is not None:
+            call.lap("lookup")
+    result = _render_loaded(key, source_locale, translation, kwargs)
+    if call is not None:
+        call.lap("substitution")
+    if metrics.observing:
+        metrics.observe(outcome, key, locale)
+    return result
+
+
+def _frozen_t(
+    key: str,
+    locale: str,
+    kwargs: Dict[str, Any],
+    frozen: "FrozenBackend",
+) -> Any:
+    # same as `t()`, but there's nothing to search and plain templates are compiled
+    try:
+        translation, source_locale = frozen.resolve(key, locale)
+    except KeyError:
+        return handle_missing(key, locale, kwargs)
+    if metrics.observing:
+        metrics.observe("hits" if source_locale == locale else "fallback_hits", key, locale)
+    if isinstance(translation, str) and "count" not in kwargs:
+        compiled = frozen.templates.get(translation)
+        if compiled is not None:
+            result, parts = compiled
+            try:
+                for name, literal in parts:
+                    result += str(kwargs[name]) + literal
+            except KeyError:
+                # let the formatter handle missing placeholder
+                pass
+            else:
+                return result
+        elif formatters.TranslationFormatter.delimiter not in translation:
+            return translation
+    return render(key, source_locale, translation, kwargs)
+
+
+def handle_missing(key: str, locale: str, kwargs: Dict[str, Any]) -> Any:
+    return _handle_missing(key, locale, kwargs, config.get('on_missing_translation'))
+
+
+def _handle_missing(key: str, locale: str, kwargs: Dict[str, Any], on_missing: Any) -> Any:
+    if metrics.observing:
+        metrics.observe("misses", key, locale)
     if on_missing == "error":
         raise KeyError("key {!r} not found for {!r}".format(key, locale))
     elif on_missing:
@@ -82,6 +191,7 @@ class LazyTranslationTuple(tuple):
     translation_key: str
     locale: str
     kwargs: dict
+    functions: Optional[Dict[str, custom_functions.Function]]
 
     def __new__(
         cls,
@@ -89,11 +199,13 @@ class LazyTranslationTuple(tuple):
         locale: str,
         value: tuple,
         kwargs: dict,
+        functions: Optional[Dict[str, custom_functions.Function]] = None,
     ) -> "LazyTranslationTuple":
         obj = super().__new__(cls, value)
         obj.translation_key = translation_key
         obj.locale = locale
         obj.kwargs = kwargs
+        obj.functions = functions
         return obj
 
     @overload
@@ -108,20 +220,283 @@ class LazyTranslationTuple(tuple):
             self.locale,
             super().__getitem__(key),
             self.kwargs,
+            self.functions,
         ).format()
 
 
-def translate(key: str, locale: str, kwargs: Dict[str, Any]) -> Union[str, LazyTranslationTuple]:
-    translation = translations.get(key, locale)
+def translate(
+    key: str,
+    locale: str,
+    kwargs: Dict[str, Any],
+    functions: Optional[Dict[str, custom_functions.Function]] = None,
+) -> Union[str, LazyTranslationTuple]:
+    return _render_loaded(key, locale, translations.get(key, locale), kwargs, functions)
+
+
+def _render_loaded(
+    key: str,
+    locale: str,
+    translation: translations.TranslationType,
+    kwargs: Dict[str, Any],
+    functions: Optional[Dict[str, custom_functions.Function]] = None,
+) -> Union[str, LazyTranslationTuple]:
+    # same as `render()`, but expands deferred static references of the translation first
+    if translations.deferred and key in translations.deferred.get(locale, ()):
+        formatters.expand_static_refs((key,), locale)
+        translation = translations.get(key, locale)
+    return render(key, locale, translation, kwargs, functions)
+
+
+def render(
+    key: str,
+    locale: str,
+    translation: translations.TranslationType,
+    kwargs: Dict[str, Any],
+    functions: Optional[Dict[str, custom_functions.Function]] = None,
+) -> Union[str, LazyTranslationTuple]:
     if isinstance(translation, tuple):
-        return LazyTranslationTuple(key, locale, translation, kwargs)
+        return LazyTranslationTuple(key, locale, translation, kwargs, functions)
     else:
         return formatters.TranslationFormatter(
-            key, locale, translation, kwargs
+            key, locale, translation, kwargs, functions
         ).format()  # type: ignore[return-value]
 
 
+class Translator(object):
+    """
+    Translation function bound to one locale
+
+    Catalogs of the locale and its fallback, placeholder functions
+    and missing translation handler are resolved once
+    and resolved again only after settings, translations or functions change
+    """
+
+    def __init__(self, locale: str):
+        self.locale = locale
+        self._bind()
+
+    def _bind(self) -> None:
+        self._config_generation = config.generation
+        self._translations_generation = translations.generation
+        self._functions_generation = custom_functions.generation
+        self._functions = custom_functions.functions_for(self.locale)
+        fallback = config.get("fallback")
+        self._fallback = fallback if fallback != self.locale else None
+        self._catalog = translations.mapping(self.locale)
+        self._fallback_catalog = (
+            translations.mapping(self._fallback) if self._fallback else {}
+        )
+        self._on_missing = config.get("on_missing_translation")
+
+    def t(self, key: str, /, **kwargs: Any) -> Any:
+        """
+        Same as `t()`, but with bound locale
+
+        :param key: Translation key
+        :param **kwargs: Keyword arguments used to interpolate placeholders
+        :return: The translation, return value of `on_missing_translation` or the original key
+        """
+
+        if (
+            self._config_generation != config.generation
+            or self._translations_generation != translations.generation
+            or self._functions_generation != custom_functions.generation
+        ):
+            self._bind()
+        eviction = resource_loader._eviction
+        if eviction is not None and eviction.enabled:
+            eviction.touch(self.locale)
+        try:
+            translation = self._catalog[key]
+        except KeyError:
+            return self._translate_missing(key, kwargs)
+        if metrics.observing:
+            metrics.observe("hits", key, self.locale)
+        if translations.deferred:
+            return translate(key, self.locale, kwargs, self._functions)
+        return render(key, self.locale, translation, kwargs, self._functions)
+
+    def _translate_missing(self, key: str, kwargs: Dict[str, Any]) -> Any:
+        if resource_loader.search_translation(key, self.locale):
+            if metrics.observing:
+                metrics.observe("hits", key, self.locale)
+            return translate(key, self.locale, kwargs, self._functions)
+        fallback = self._fallback
+        if fallback and (
+            key in self._fallback_catalog
+            or resource_loader.search_translation(key, fallback)
+        ):
+            if metrics.observing:
+                metrics.observe("fallback_hits", key, self.locale)
+            return translate(key, fallback, kwargs)
+        return _handle_missing(key, self.locale, kwargs, self._on_missing)
+
+
+_translators: Dict[str, Translator] = {}
+
+
+def get_translator(locale: Optional[str] = None) -> Translator:
+    """
+    Gets translator bound to the locale
+
+    Useful when many translations are needed for the same locale, e.g. while handling a request
+
+    :param locale: Locale (optional). Defaults to the locale of current context
+    :return: Translator object with method `t`
+    """
+
+    if not locale:
+        locale = config.current_locale()
+    try:
+        return _translators[locale]
+    except KeyError:
+        return _translators.setdefault(locale, Translator(locale))
+
+
+def compile_template(template: str) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Splits translation into literal parts and placeholders
+
+    :param template: Translation
+    :return: Literal prefix and pairs of placeholder and literal that follows it,
+    or `None` if the translation contains invalid placeholders or function calls
+    """
+
+    pattern = formatters.TranslationFormatter.pattern
+    names: List[str] = []
+    literals = [""]
+    position = 0
+    for match in pattern.finditer(template):
+        literals[-1] += template[position:match.start()]
+        position = match.end()
+        name = match.group("named") or match.group("braced")
+        if match.group("escaped") is not None:
+            literals[-1] += formatters.TranslationFormatter.delimiter
+        elif name is None or "(" in name:
+            return None
+        else:
+            names.append(name)
+            literals.append("")
+    literals[-1] += template[position:]
+    return literals[0], list(zip(names, literals[1:]))
+
+
+class CompiledKey(object):
+    """
+    Translation function bound to one key and locale
+
+    Plain string translations are split into literal parts and placeholders once,
+    so a call only joins them with passed values.
+    Translations that need pluralization, functions or missing placeholder handling
+    are rendered by `t()`.
+    The template is compiled again when the translation or settings change
+    """
+
+    def __init__(self, key: str, locale: str):
+        self.key = key
+        self.locale = locale
+        self._bind()
+
+    def _bind(self) -> None:
+        self._config_generation = config.generation
+        self._translations_generation = translations.generation
+        self._functions_generation = custom_functions.generation
+        self._functions = custom_functions.functions_for(self.locale)
+        self._parts: Optional[List[Tuple[str, str]]] = None
+        self._prefix = ""
+        # the value is checked on every call, so that changes made by `translations.add()`
+        # are noticed. None means that the key wasn't found
+        self._catalog = translations.mapping(self.locale)
+        self._fallback_catalog: Optional[Mapping[str, translations.TranslationType]] = None
+        locale = self.locale
+        if not (
+            translations.has(self.key, locale)
+            or resource_loader.search_translation(self.key, locale)
+        ):
+            locale = config.get("fallback")
+            if not locale or locale == self.locale:
+                self._value = None
+                return
+            self._fallback_catalog = translations.mapping(locale)
+            if not (
+                translations.has(self.key, locale)
+                or resource_loader.search_translation(self.key, locale)
+            ):
+                self._value = self._fallback_value = None
+                return
+        if translations.deferred and self.key in translations.deferred.get(locale, ()):
+            formatters.expand_static_refs((self.key,), locale)
+        value = translations.get(self.key, locale)
+        if self._fallback_catalog is None:
+            self._value = value
+        else:
+            self._value = None
+            self._fallback_value = value
+        if isinstance(value, str):
+            self._compile(value)
+
+    def _compile(self, template: str) -> None:
+        compiled = compile_template(template)
+        if compiled is not None:
+            self._prefix, self._parts = compiled
+
+    def __call__(self, **kwargs: Any) -> Any:
+        """
+        Translates the key
+
+        :param **kwargs: Keyword arguments used to interpolate placeholders
+        :return: Same as `t()`
+        """
+
+        if (
+            self._config_generation != config.generation
+            or self._translations_generation != translations.generation
+            or self._catalog.get(self.key) is not self._value
+            or self._fallback_catalog is not None
+            and self._fallback_catalog.get(self.key) is not self._fallback_value
+        ):
+            self._bind()
+        eviction = resource_loader._eviction
+        if eviction is not None and eviction.enabled:
+            eviction.touch(self.locale)
+        parts = self._parts
+        if parts is None or "count" in kwargs:
+            return t(self.key, self.locale, **kwargs)
+        result = self._prefix
+        try:
+            for name, literal in parts:
+                result += str(kwargs[name]) + literal
+        except KeyError:
+            # let `t()` handle missing placeholder
+            return t(self.key, self.locale, **kwargs)
+        if metrics.observing:
+            metrics.observe(
+                "hits" if self._fallback_catalog is None else "fallback_hits",
+                self.key,
+                self.locale,
+            )
+        return result
+
+
+def compile_key(key: str, locale: Optional[str] = None) -> CompiledKey:
+    """
+    Prepares translation of the key for repeated use
+
+    Useful in tight loops, e.g. while rendering table cells
+
+    :param key: Translation key
+    :param locale: Locale (optional). Defaults to the locale of current context
+    :return: Function that accepts keyword arguments used to interpolate placeholders
+    """
+
+    if not locale:
+        locale = config.current_locale()
+    return CompiledKey(key, locale)
+
+
 def pluralize(key: str, locale: str, translation: Union[Dict[str, str], str], count: int) -> str:
+    if isinstance(translation, translations.PluralForms) and isinstance(count, int):
+        return translation.select(count)
     return_value = key
     try:
         if not isinstance(translation, dict):
@@ -148,3 +523,37 @@ def pluralize(key: str, locale: str, translation: Union[Dict[str, str], str], co
             return on_missing(key, locale, translation, count)
         else:
             return return_value
+
+
+# settings of features that are checked by `_extras_t()`
+_EXTRAS_SETTINGS = frozenset((
+    "locale_idle_timeout",
+    "max_loaded_locales",
+    "timing_hook",
+    "enable_metrics",
+    "profiler_sample_rate",
+    "catalog_backend",
+))
+
+
+def _update_extras() -> None:
+    # also called when translations are frozen or unfrozen
+    global _extras
+
+    _extras = (
+        config.get("locale_idle_timeout") is not None
+        or config.get("max_loaded_locales") is not None
+        or config.get("timing_hook") is not None
+        or config.get("enable_metrics")
+        or bool(config.get("profiler_sample_rate"))
+        or translations.backend is not translations._default_backend
+    )
+
+
+@config.subscribe
+def _update(changed: FrozenSet[str]) -> None:
+    if _EXTRAS_SETTINGS & changed:
+        _update_extras()
+
+
+_update_extras()
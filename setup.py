@@ -24,7 +24,7 @@ setup(
     url=GITHUB_URL,
     download_url=GITHUB_URL + "/archive/master.zip",
     license='MIT',
-    packages=['i18n', 'i18n.loaders'],
+    packages=['i18n', 'i18n.loaders', 'i18n.backends', 'i18n.benchmarks'],
     package_data={
         "": ["py.typed"],
     },